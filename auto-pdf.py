@@ -11,16 +11,45 @@
     python auto-pdf.py .  (현재 폴더의 모든 PDF 처리)
 """
 
+import io
+import json
 import os
+import platform
+import shutil
 import sys
+import zlib
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import BinaryIO, Dict, Iterator, List, Tuple, Union, Optional
 import argparse
+import contextlib
+import hashlib
+import multiprocessing
+import multiprocessing.connection
+import queue
+import signal
+import threading
+import time
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
 
 try:
-    from PyPDF2 import PdfReader, PdfWriter
-    import PIL.Image
-    from pdf2image import convert_from_path
+    from PyPDF2 import PdfReader
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+    # 렌더링/인코딩, PDF 엔진, 분할·압축 계획 등 두 스크립트의 공통 코드 (같은 폴더의 pdf_common.py)
+    from pdf_common import (
+        BACKENDS, BLANK_CONTENT_BYTES, COLOR_MODE_CHOICES, COLOR_MODE_NAMES,
+        _COST_SKIPPED_KEYS, IMAGE_PAGE_BYTES, IN_MEMORY_NAME, LAZY_RELEASE_PAGES,
+        _NO_PROFILER, _PART_BASE_BYTES, TEXT_CONTENT_BYTES, USER_CACHE_DIR, RunProfiler,
+        _StreamingPDFWriter, _as_source, _backend, _bilevel_png, _classify_page,
+        _extract_page_range, _iter_encoded_pages, _iter_page_texts, _iter_part_bytes,
+        _kept_pages_bytes, _open_reader, _page_cost_index, _page_structure,
+        _plan_size_split, _plan_target_compression, print_run_profile, _pruned_page_view,
+        _raster_page_bytes, _recompress_embedded_images, _release_parsed_objects,
+        _render_and_encode, select_backend, _shared_resource_bytes, _text_index,
+        _write_part, write_run_report, _write_text_index)
 except ImportError as e:
     print("=" * 60)
     print("필요한 패키지가 설치되어 있지 않습니다.")
@@ -30,25 +59,751 @@ except ImportError as e:
     print("\n" + "=" * 60)
     sys.exit(1)
 
+try:
+    import resource  # 메모리 한도(--max-memory) 설정용 (Windows에는 없음)
+except ImportError:
+    resource = None
+
+try:
+    import fcntl  # 캐시 매니페스트 잠금용 (Windows에는 없으므로 msvcrt 사용)
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def _raster_payload(page) -> Optional[bytes]:
+    """
+    _StreamingPDFWriter.add_raster로 쓴 래스터 페이지에서 넣었던 인코딩 결과(JPEG 또는
+    1비트 PNG)를 다시 꺼냄 (그런 형식의 이미지가 아니면 None)
+    """
+    try:
+        image = page['/Resources']['/XObject']['/Im0']
+    except (KeyError, TypeError):
+        return None
+    if image.get('/Filter') == '/DCTDecode':
+        return image._data
+    if image.get('/Filter') == '/FlateDecode' and image.get('/BitsPerComponent') == 1:
+        return _bilevel_png(image['/Width'], image['/Height'], image._data)
+    return None
+
+
+def _page_fingerprints(reader: 'PdfReader') -> List[Optional[str]]:
+    """
+    페이지별 내용 지문 (SHA-1 16진수, 내용이 같은 페이지는 같은 값)
+
+    페이지 사전과 거기서 닿는 객체(콘텐츠 스트림, 리소스, 주석 등)를 객체 번호가 아니라
+    내용으로 해시하므로, 앞에 페이지가 끼어들거나 다른 프로그램이 다시 저장해 객체 번호나
+    간접 객체 여부가 바뀌어도 지문은 그대로입니다.
+    스트림은 디코딩하지 않은 원본 바이트를 해시하고, 여러 페이지가 공유하는 객체는 한 번만
+    해시합니다. 다른 페이지를 가리키는 참조(링크 대상 등)는 그 페이지의 번호로만 반영합니다.
+    분할과 같게 쓰지 않는 리소스를 먼저 제외하며, 구조가 너무 깊어 해시하지 못한 페이지는
+    None입니다 (항상 바뀐 페이지로 취급).
+    """
+    page_numbers = {}
+    for page_num, page in enumerate(reader.pages):
+        reference = page.indirect_reference
+        if reference is not None:
+            page_numbers[(reference.idnum, reference.generation)] = page_num
+    # 간접 객체별 내용 해시 (None은 해시하는 중, 즉 순환 참조)
+    digests = {}
+
+    def digest(obj) -> bytes:
+        # 사전/배열/스트림은 간접 객체든 직접 값이든 같은 해시가 되도록 내용 해시로 반영
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            if key in page_numbers:
+                return b'P%d ' % page_numbers[key]
+            if key not in digests:
+                digests[key] = None
+                digests[key] = digest(obj.get_object())
+            return digests[key] or b'cycle'
+        if isinstance(obj, DictionaryObject):
+            hasher = hashlib.sha1(b'<<')
+            for key in sorted(obj):
+                if key not in _COST_SKIPPED_KEYS:
+                    hasher.update(digest(key))
+                    hasher.update(digest(dict.__getitem__(obj, key)))
+            if isinstance(obj, StreamObject):
+                hasher.update(b'stream')
+                hasher.update(obj._data or b'')
+            return hasher.digest()
+        if isinstance(obj, ArrayObject):
+            hasher = hashlib.sha1(b'[')
+            for item in obj:
+                hasher.update(digest(item))
+            return hasher.digest()
+        buffer = io.BytesIO()
+        obj.write_to_stream(buffer, None)
+        return buffer.getvalue() + b' '
+
+    fingerprints = []
+    for page_num, page in enumerate(reader.pages):
+        if page_num and page_num % LAZY_RELEASE_PAGES == 0:
+            _release_parsed_objects(reader)
+        try:
+            fingerprints.append(digest(_pruned_page_view(page)).hex())
+        except RecursionError:
+            # 해시하다 만 객체를 순환 참조로 남겨 두면 다른 페이지의 지문이 부정확해지므로 지움
+            for key in [key for key, value in digests.items() if value is None]:
+                del digests[key]
+            fingerprints.append(None)
+
+    _release_parsed_objects(reader)
+    return fingerprints
+
+
+class PDFDocumentSession:
+    """
+    한 번 파싱한 PDF 문서를 여러 처리 단계가 함께 쓰도록 보관하는 세션
+
+    PdfReader는 처음 필요할 때 한 번만 만들고, 페이지 객체와 페이지별 메타데이터,
+    분할용 페이지 비용 인덱스는 요청된 것만 계산해 캐시합니다.
+    """
+
+    def __init__(self, source: Union[str, Path, bytes], profiler: Optional[RunProfiler] = None):
+        self.source = _as_source(source)
+        self.profiler = profiler or _NO_PROFILER
+        self._reader = None
+        self._pages = {}
+        self._page_info = {}
+        self._cost_index = None
+
+    @property
+    def reader(self) -> 'PdfReader':
+        if self._reader is None:
+            size = (os.path.getsize(self.source) if isinstance(self.source, str)
+                    else len(self.source))
+            with self.profiler.stage('parse', bytes_in=size):
+                self._reader = _open_reader(self.source)
+                len(self._reader.pages)  # 페이지 트리 펼치기까지 파싱 시간에 포함
+        return self._reader
+
+    @property
+    def total_pages(self) -> int:
+        return len(self.reader.pages)
+
+    def page(self, page_num: int):
+        """페이지 객체 (0부터 시작)"""
+        if page_num not in self._pages:
+            self._pages[page_num] = self.reader.pages[page_num]
+        return self._pages[page_num]
+
+    def page_info(self, page_num: int) -> dict:
+        """
+        페이지 구조 정보: 크기, 콘텐츠 스트림 크기, 폰트 수, 이미지 수와 크기
+
+        텍스트 레이아웃 없이 페이지 사전만 읽으므로 빠르게 계산됩니다.
+        """
+        if page_num in self._page_info:
+            return self._page_info[page_num]
+
+        page = self.page(page_num)
+        info = {
+            'width_pt': float(page.mediabox.width),
+            'height_pt': float(page.mediabox.height),
+            **_page_structure(page),
+        }
+        self._page_info[page_num] = info
+        # 이미지 크기를 재려고 읽은 이미지 스트림을 계속 들고 있지 않도록
+        _release_parsed_objects(self.reader)
+        return info
+
+    def close(self) -> None:
+        """
+        리더의 스트림을 닫고 캐시한 페이지 객체를 버림 (메모리 매핑한 입력이면 매핑 해제)
+
+        페이지 메타데이터와 비용 인덱스는 남기며, 리더가 다시 필요하면 새로 엽니다.
+        """
+        if self._reader is not None:
+            self._reader.stream.close()
+            self._reader = None
+            self._pages.clear()
+
+    def cost_index(self) -> List[Tuple[int, Dict[Tuple[int, int], int]]]:
+        """크기별 분할에 쓰는 페이지 비용 인덱스 (한 번만 계산)"""
+        if self._cost_index is None:
+            reader = self.reader
+            with self.profiler.stage('plan'):
+                self._cost_index = _page_cost_index(reader)
+        return self._cost_index
+
+
+# 처리 결과의 형식이 바뀌면 올림 (이전 버전이 만든 캐시 항목은 키가 달라져 쓰지 않음)
+CACHE_VERSION = 3
+
+
+class ResultCache:
+    """
+    출력 폴더에 저장되는 처리 결과 캐시
+
+    입력 파일 내용의 SHA-256 해시와 전략, 처리 설정(PDF 엔진, 색 형식 포함),
+    CACHE_VERSION을 키로 이전 결과를 기록합니다.
+    크기와 수정 시각이 그대로인 파일은 다시 해시하지 않으며, 캐시된 출력 파일이
+    사라지거나 바뀌었으면 캐시를 사용하지 않습니다.
+    """
+
+    MANIFEST_NAME = ".auto-pdf-cache.json"
+    LOCK_NAME = ".auto-pdf-cache.lock"
+    VERSION = 1
+
+    def __init__(self, output_dir: Path, max_age_days: Optional[float] = None,
+                 max_size_mb: Optional[float] = None, delete_outputs: bool = False):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.output_dir / self.MANIFEST_NAME
+        self.lock_path = self.output_dir / self.LOCK_NAME
+        self.max_age_days = max_age_days
+        self.max_size_mb = max_size_mb
+        # 정리한 항목의 출력 파일까지 지울지 (기본값은 캐시 기록만 지우고 파일은 남김)
+        self.delete_outputs = delete_outputs
+
+    @staticmethod
+    def _sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == self.VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': self.VERSION, 'files': {}, 'entries': {}}
+
+    def _save(self, manifest: dict) -> None:
+        temp_path = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        여러 프로세스가 동시에 매니페스트를 고치지 않도록 잠금 파일에 운영체제 잠금을 걸음
+
+        잠금은 가진 프로세스가 끝나면(비정상 종료 포함) 운영체제가 풀어 주므로, 오래 걸리는
+        작업의 잠금을 다른 프로세스가 강제로 풀지 않습니다. 잠금 파일은 지우지 않고 남겨
+        둡니다 (지우면 다른 프로세스가 지워진 파일을 잠그는 경쟁이 생김).
+        """
+        with open(self.lock_path, 'a+b') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                while True:
+                    try:
+                        # LK_LOCK은 10초 동안 다시 시도한 뒤 OSError를 냄
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def file_hash(self, path: Path) -> str:
+        """파일 내용 해시 (크기와 수정 시각이 같으면 기록된 해시 재사용)"""
+        path = Path(path).resolve()
+        stat = path.stat()
+        record = self._load()['files'].get(str(path))
+        if record and record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+            return record['sha256']
+
+        content_hash = self._sha256(path)
+        with self._locked():
+            manifest = self._load()
+            manifest['files'][str(path)] = {
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': content_hash,
+            }
+            self._save(manifest)
+        return content_hash
+
+    @staticmethod
+    def make_key(content_hash: str, strategy: str, params: dict) -> str:
+        """입력 해시 + 전략 + 처리 설정 + CACHE_VERSION으로 캐시 키 생성"""
+        payload = json.dumps({'version': CACHE_VERSION, 'sha256': content_hash,
+                              'strategy': strategy, 'params': params}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _output_intact(self, output: dict) -> bool:
+        path = Path(output['path'])
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        if stat.st_size != output['bytes']:
+            return False
+        if stat.st_mtime_ns == output['mtime_ns']:
+            return True
+        return self._sha256(path) == output['sha256']
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """유효한 캐시 항목을 반환 (없거나 출력 파일이 손상되었으면 None)"""
+        entry = self._load()['entries'].get(key)
+        if entry is None or not all(self._output_intact(output) for output in entry['outputs']):
+            return None
+
+        with self._locked():
+            manifest = self._load()
+            if key in manifest['entries']:
+                manifest['entries'][key]['last_used'] = time.time()
+                self._save(manifest)
+        return entry
+
+    def store(self, key: str, source: Path, strategy: str, params: dict, outputs: List[Path]) -> None:
+        """처리 결과를 캐시에 기록하고 오래되었거나 넘치는 항목 정리"""
+        output_records = []
+        for output in outputs:
+            output = Path(output).resolve()
+            stat = output.stat()
+            output_records.append({
+                'path': str(output), 'bytes': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns, 'sha256': self._sha256(output),
+            })
+
+        now = time.time()
+        with self._locked():
+            manifest = self._load()
+            manifest['entries'][key] = {
+                'source': str(Path(source).resolve()),
+                'strategy': strategy,
+                'params': params,
+                'outputs': output_records,
+                'created_at': now,
+                'last_used': now,
+            }
+            self._evict(manifest)
+            self._save(manifest)
+
+    def _evict(self, manifest: dict) -> None:
+        """
+        max_age_days보다 오래 사용되지 않았거나, 캐시된 출력 합계가 max_size_mb를 넘으면
+        가장 오래 사용되지 않은 항목부터 제거합니다. 출력 파일은 사용자의 결과물이므로
+        delete_outputs일 때만, 출력 폴더 바로 안에 있고 다른 항목이 쓰지 않는 파일을
+        함께 삭제합니다.
+        """
+        entries = manifest['entries']
+        evicted = []
+
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            evicted += [key for key, entry in entries.items() if entry['last_used'] < cutoff]
+
+        if self.max_size_mb is not None:
+            max_bytes = self.max_size_mb * 1024 * 1024
+            live = sorted((key for key in entries if key not in evicted),
+                          key=lambda key: entries[key]['last_used'])
+            total = sum(output['bytes'] for key in live for output in entries[key]['outputs'])
+            for key in live[:-1]:  # 방금 기록한 가장 최근 항목은 남김
+                if total <= max_bytes:
+                    break
+                total -= sum(output['bytes'] for output in entries[key]['outputs'])
+                evicted.append(key)
+
+        removed = [entries.pop(key) for key in evicted]
+        if not self.delete_outputs:
+            return
+        in_use = {output['path'] for entry in entries.values() for output in entry['outputs']}
+        output_root = self.output_dir.resolve()
+        for entry in removed:
+            for output in entry['outputs']:
+                path = Path(output['path'])
+                if output['path'] not in in_use and output['path'] != entry['source'] \
+                        and path.parent == output_root:
+                    with contextlib.suppress(OSError):
+                        path.unlink()
+
+
+class CheckpointJournal:
+    """
+    큰 파일 처리의 진행 상황을 출력 폴더에 기록하는 체크포인트 저널
+
+    완성된 출력 파일(페이지 구간, 크기, SHA-256), 텍스트 추출 진행 위치(페이지 수,
+    바이트 위치, CRC-32)와 압축이 끝난 페이지의 JPEG를 기록합니다. 같은 입력과 설정으로
+    다시 실행하면 기록된 결과를 검증한 뒤 재사용하고 나머지부터 이어서 처리하며,
+    입력 파일이나 설정이 바뀌었으면 저널을 버리고 처음부터 처리합니다.
+    """
+
+    VERSION = 1
+    SAVE_INTERVAL = 2.0  # 진행 상황을 저장하는 최소 간격 (초, 완성된 파일은 바로 저장)
+
+    def __init__(self, output_dir: Path, stem: str, identity: dict):
+        self.path = Path(output_dir) / f".{stem}.checkpoint.json"
+        self.pages_dir = Path(output_dir) / f".{stem}.checkpoint"
+        # JSON으로 저장했다 읽은 값과 비교하므로 같은 형태로 맞춰 둠
+        self.identity = json.loads(json.dumps(identity))
+        self._saved_at = time.monotonic()
+        self.state = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == self.VERSION and state.get('identity') == self.identity:
+                return state
+        except (OSError, ValueError):
+            pass
+        # 다른 입력/설정으로 남은 저널이면 저장해 둔 페이지까지 버리고 처음부터 처리
+        shutil.rmtree(self.pages_dir, ignore_errors=True)
+        return {'version': self.VERSION, 'identity': self.identity, 'outputs': {},
+                'text': None, 'pages': {}, 'target': None}
+
+    @property
+    def has_progress(self) -> bool:
+        return bool(self.state['outputs'] or self.state['text'] or self.state['pages'])
+
+    def due(self) -> bool:
+        """마지막 저장 후 SAVE_INTERVAL이 지났는지"""
+        return time.monotonic() - self._saved_at >= self.SAVE_INTERVAL
+
+    def save(self) -> None:
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._saved_at = time.monotonic()
+
+    def completed_output(self, path: Path, pages: Optional[List[int]] = None) -> bool:
+        """기록된 완성 파일이 그대로 남아 있는지 확인 (페이지 구간, 크기, SHA-256 비교)"""
+        record = self.state['outputs'].get(path.name)
+        if record is None or record['pages'] != pages:
+            return False
+        try:
+            if path.stat().st_size != record['bytes']:
+                return False
+        except OSError:
+            return False
+        return ResultCache._sha256(path) == record['sha256']
+
+    def record_output(self, path: Path, pages: Optional[List[int]] = None) -> None:
+        self.state['outputs'][path.name] = {'pages': pages, 'bytes': path.stat().st_size,
+                                            'sha256': ResultCache._sha256(path)}
+        self.save()
+
+    def text_progress(self, partial_path: Path) -> Optional[dict]:
+        """이어서 쓸 수 있는 텍스트 추출 진행 상황 (부분 파일의 앞부분이 기록과 같을 때만)"""
+        progress = self.state['text']
+        if not progress:
+            return None
+        crc = 0
+        remaining = progress['bytes']
+        try:
+            with open(partial_path, 'rb') as f:
+                while remaining:
+                    chunk = f.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        return None
+                    crc = zlib.crc32(chunk, crc)
+                    remaining -= len(chunk)
+        except OSError:
+            return None
+        return progress if crc == progress['crc32'] else None
+
+    def record_text(self, pages: int, position: int, crc32: int, offsets: List[int]) -> None:
+        """텍스트 추출 진행 상황 저장 (부분 파일을 먼저 flush한 뒤 호출)"""
+        self.state['text'] = {'pages': pages, 'bytes': position, 'crc32': crc32,
+                              'offsets': offsets}
+        self.save()
+
+    def _page_path(self, page_num: int) -> Path:
+        return self.pages_dir / f"page{page_num:05d}.img"
+
+    def has_page(self, page_num: int, quality: int, dpi: int) -> bool:
+        record = self.state['pages'].get(str(page_num))
+        return (record is not None and record['quality'] == quality and record['dpi'] == dpi
+                and self._page_path(page_num).exists())
+
+    def load_page(self, page_num: int) -> Optional[bytes]:
+        """저장해 둔 압축 페이지 (CRC-32가 맞지 않으면 None)"""
+        try:
+            data = self._page_path(page_num).read_bytes()
+        except OSError:
+            return None
+        return data if zlib.crc32(data) == self.state['pages'][str(page_num)]['crc32'] else None
+
+    def record_page(self, page_num: int, image_bytes: bytes, quality: int, dpi: int) -> None:
+        """압축이 끝난 페이지 저장 (저널 자체는 SAVE_INTERVAL마다 저장)"""
+        self.pages_dir.mkdir(exist_ok=True)
+        page_path = self._page_path(page_num)
+        temp_path = page_path.with_suffix('.tmp')
+        temp_path.write_bytes(image_bytes)
+        os.replace(temp_path, page_path)
+        self.state['pages'][str(page_num)] = {'quality': quality, 'dpi': dpi,
+                                              'crc32': zlib.crc32(image_bytes)}
+        if self.due():
+            self.save()
+
+    def finish(self) -> None:
+        """모든 처리가 끝나면 저널과 저장해 둔 페이지 삭제"""
+        shutil.rmtree(self.pages_dir, ignore_errors=True)
+        with contextlib.suppress(OSError):
+            self.path.unlink()
+
+
+class PageManifest:
+    """
+    증분 처리(--incremental)를 위해 출력 폴더에 남기는 페이지 지문과 출력 파일 기록
+
+    처리가 끝날 때마다 페이지별 내용 지문(_page_fingerprints)과 만든 출력 파일(크기, 수정
+    시각, 분할 파일의 페이지 구간, 압축 파일의 래스터 페이지와 설정)을 기록합니다. 입력이
+    바뀐 뒤 다시 처리하면 지문이 같은 페이지를 찾아, 그 페이지로 만든 결과를 이전 출력에서
+    가져옵니다. 기록 후 크기나 수정 시각이 바뀐 출력 파일은 재사용하지 않습니다.
+    """
+
+    VERSION = 1
+
+    def __init__(self, output_dir: Path, stem: str, fingerprints: List[Optional[str]]):
+        self.path = Path(output_dir) / f".{stem}.pages.json"
+        self.fingerprints = fingerprints
+        self.previous = self._load()
+        self.outputs = {}
+        # 이번 페이지(0부터 시작) -> 내용이 같은 이전 페이지
+        first_previous = {}
+        for page_num, fingerprint in enumerate(self.previous['fingerprints']):
+            if fingerprint is not None:
+                first_previous.setdefault(fingerprint, page_num)
+        self.unchanged = {page_num: first_previous[fingerprint]
+                          for page_num, fingerprint in enumerate(fingerprints)
+                          if fingerprint in first_previous}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == self.VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {'version': self.VERSION, 'fingerprints': [], 'outputs': {}}
+
+    @property
+    def has_previous(self) -> bool:
+        return bool(self.previous['fingerprints'])
+
+    def same_pages(self, start: int, end: int, previous_start: int, previous_end: int) -> bool:
+        """이번 [start, end) 페이지가 이전 [previous_start, previous_end) 페이지와 내용이 같은지"""
+        current = self.fingerprints[start:end]
+        return (None not in current
+                and current == self.previous['fingerprints'][previous_start:previous_end])
+
+    def previous_output(self, path: Path) -> Optional[dict]:
+        """이전 실행이 기록한 출력 파일 정보 (파일이 그대로 남아 있을 때만)"""
+        record = self.previous['outputs'].get(path.name)
+        if record is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if stat.st_size != record['bytes'] or stat.st_mtime_ns != record['mtime_ns']:
+            return None
+        return record
+
+    def record_output(self, path: Path, **details) -> None:
+        stat = path.stat()
+        self.outputs[path.name] = {'bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns, **details}
+
+    def save(self) -> None:
+        """이번 실행의 지문과 출력 기록 저장 (처리가 모두 끝난 뒤 호출)"""
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'fingerprints': self.fingerprints,
+                       'outputs': self.outputs}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+# 샘플 페이지로 잰 처리 속도를 기록해 두는 사용자 파일 (같은 파일을 다시 계획할 때는 측정하지 않음)
+THROUGHPUT_FILE = USER_CACHE_DIR / 'throughput.json'
+THROUGHPUT_CACHE_ENTRIES = 256
+
+
+def _load_throughput(key: str) -> Optional[dict]:
+    """이전에 측정해 둔 처리 속도 (없으면 None)"""
+    try:
+        with open(THROUGHPUT_FILE, encoding='utf-8') as f:
+            entry = json.load(f).get(key)
+    except (OSError, ValueError, AttributeError):
+        return None
+    return entry['throughput'] if isinstance(entry, dict) and 'throughput' in entry else None
+
+
+def _store_throughput(key: str, throughput: dict) -> None:
+    """측정한 처리 속도를 기록 (가장 오래된 항목부터 THROUGHPUT_CACHE_ENTRIES개만 남김)"""
+    try:
+        with open(THROUGHPUT_FILE, encoding='utf-8') as f:
+            entries = json.load(f)
+        if not isinstance(entries, dict):
+            entries = {}
+    except (OSError, ValueError):
+        entries = {}
+    entries[key] = {'measured_at': time.time(), 'throughput': throughput}
+    if len(entries) > THROUGHPUT_CACHE_ENTRIES:
+        newest = sorted(entries, key=lambda name: entries[name].get('measured_at', 0))
+        entries = {name: entries[name] for name in newest[-THROUGHPUT_CACHE_ENTRIES:]}
+    try:
+        THROUGHPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # 여러 프로세스가 동시에 기록해도 파일이 깨지지 않도록 임시 파일을 바꿔 넣음
+        temp_path = THROUGHPUT_FILE.with_name(f"{THROUGHPUT_FILE.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(temp_path, THROUGHPUT_FILE)
+    except OSError:
+        pass
+
 
 class AutoPDFProcessor:
     """자동으로 PDF를 분석하고 최적의 방법으로 처리"""
 
-    # 파일 크기 임계값 (MB)
-    SMALL_FILE = 10      # 10MB 이하: 그대로 사용 가능
-    MEDIUM_FILE = 30     # 30MB 이하: 텍스트 추출 시도
-    LARGE_FILE = 100     # 100MB 이하: 압축 또는 분할
-    # 100MB 이상: 무조건 분할
-
-    def __init__(self, file_path: str, output_dir: Optional[str] = None):
-        self.file_path = Path(file_path)
-        self.output_dir = Path(output_dir) if output_dir else self.file_path.parent / "processed"
-        self.output_dir.mkdir(exist_ok=True)
+    # 출력 조건: 이 조건을 모두 만족하는 전략 중 예상 처리 시간이 가장 짧은 것을 선택
+    MAX_OUTPUT_MB = 10        # 출력 파일 하나의 최대 크기
+    MAX_OUTPUT_FILES = None   # 최대 출력 파일 수 (None이면 제한 없음)
+
+    # 전략 계획 설정
+    STRATEGIES = ('none', 'extract_text', 'compress', 'extract_text_and_split',
+                  'compress_and_split', 'split_aggressive')
+    PLAN_SAMPLE_PAGES = 3     # 처리 속도를 잴 때 실제로 텍스트 추출/렌더링해 볼 페이지 수
+
+    # 사전 분석 설정
+    PRESCAN_SAMPLES = 24            # 문서 전체에서 고르게 뽑을 페이지 수
+    # 페이지 분류 기준값은 pdf_common의 값을 그대로 사용 (pdf-processor와 같게 분류)
+    TEXT_CONTENT_BYTES = TEXT_CONTENT_BYTES
+    IMAGE_PAGE_BYTES = IMAGE_PAGE_BYTES
+    BLANK_CONTENT_BYTES = BLANK_CONTENT_BYTES
+
+    # 압축 설정
+    COMPRESS_QUALITY = 40
+    COMPRESS_DPI = 150
+    COMPRESS_MODE = 'hybrid'  # raster: 모든 페이지 래스터화, hybrid: 이미지 페이지만 래스터화,
+                              # images: 렌더링 없이 내장 이미지만 COMPRESS_DPI로 재압축
+    COMPRESS_BATCH_SIZE = 10  # 한 번에 렌더링할 페이지 수
+
+    # 분할 설정 (MB)
+    SPLIT_SIZE = 10              # 기본 분할 크기
+    AGGRESSIVE_SPLIT_SIZE = 8    # split_aggressive 전략의 분할 크기
+    COMPRESSED_SPLIT_LIMIT = 15  # 압축 후에도 이보다 크면 분할
+
+    # 예상 처리 시간(초)이 이보다 긴 작업은 진행 상황을 체크포인트 저널에 기록해, 중단되어도 이어서 처리
+    CHECKPOINT_MIN_SECONDS = 30
+
+    def __init__(self, file_path: Union[str, Path, bytes, BinaryIO], output_dir: Optional[str] = None,
+                 batch_size: Optional[int] = None, workers: int = 1,
+                 cache: Optional['ResultCache'] = None,
+                 session: Optional[PDFDocumentSession] = None,
+                 compress_mode: Optional[str] = None,
+                 profiler: Optional[RunProfiler] = None,
+                 target_mb: Optional[float] = None,
+                 name: Optional[str] = None,
+                 max_output_mb: Optional[float] = None,
+                 max_output_files: Optional[int] = None,
+                 incremental: bool = False,
+                 color_mode: str = 'auto',
+                 near_duplicates: bool = False):
+        # file_path에는 PDF 바이트나 바이너리 파일 객체도 줄 수 있습니다. 이때 output_dir을
+        # 주지 않으면 결과를 디스크에 쓰지 않고 self.buffers에 보관합니다 (process_bytes 참고).
+        self.source = _as_source(file_path)
+        in_memory = not isinstance(self.source, str)
+        self.file_path = Path(name or IN_MEMORY_NAME) if in_memory else Path(self.source)
+        self.compress_mode = compress_mode or self.COMPRESS_MODE
+        # 래스터 페이지 인코딩: auto는 페이지마다 흑백/회색조/컬러 판정, gray/color는 그 형식으로 고정
+        self.color_mode = color_mode or 'auto'
+        # 스캔 잡음 정도만 다른 페이지도 이미지를 공유 (기본값은 픽셀이 완전히 같은 페이지만)
+        self.near_duplicates = near_duplicates
+        # images 모드는 품질/DPI를 예측하지 않으므로 목표 크기를 맞출 수 없음
+        if target_mb and self.compress_mode == 'images':
+            raise ValueError("target_mb는 raster/hybrid 압축 모드에서만 쓸 수 있습니다")
+        self.target_mb = target_mb
+        self.max_output_mb = max_output_mb or self.MAX_OUTPUT_MB
+        self.max_output_files = max_output_files or self.MAX_OUTPUT_FILES
+        self.profiler = profiler or _NO_PROFILER
+        # 넘겨받은 세션은 만든 쪽이 닫음
+        self.owns_session = session is None
+        self.session = session or PDFDocumentSession(self.source, self.profiler)
+        self.batch_size = max(1, batch_size or self.COMPRESS_BATCH_SIZE)
+        self.workers = max(1, workers)
+        # 결과 캐시는 입력 파일의 해시로 찾으므로 경로 입력에만 사용
+        self.cache = cache if not in_memory else None
+        self.strategy = None
+        self.plan = None
+        self.buffers = {}
+        # 메모리 출력 대신 결과를 바로 넘길 스트림 (write()/tell()만 있으면 됨, 서비스 모드의 압축 응답)
+        self.output_sink = None
+        self.journal = None
+        # 입력이 바뀌었을 때 바뀐 페이지만 다시 처리 (디스크 출력에서만, PageManifest 참고)
+        self.incremental = incremental
+        self.manifest = None
+
+        # 출력 폴더는 실제로 처리할 때 만듦 (분석/계획만 할 때는 만들지 않음)
+        if output_dir:
+            self.output_dir = Path(output_dir)
+        elif in_memory:
+            self.output_dir = None
+        else:
+            self.output_dir = self.file_path.parent / "processed"
 
-        if not self.file_path.exists():
+        if not in_memory and not self.file_path.exists():
             raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
 
-        self.file_size_mb = self.file_path.stat().st_size / (1024 * 1024)
+        self.input_bytes = len(self.source) if in_memory else self.file_path.stat().st_size
+        self.file_size_mb = self.input_bytes / (1024 * 1024)
+
+    def classify_page(self, info: dict) -> str:
+        """페이지 구조 정보로 text / image / mixed / blank 분류 (예: mixed는 OCR 텍스트가 포함된 스캔 페이지)"""
+        return _classify_page(info, self.TEXT_CONTENT_BYTES, self.IMAGE_PAGE_BYTES,
+                              self.BLANK_CONTENT_BYTES)
+
+    def prescan(self, sample_size: Optional[int] = None) -> dict:
+        """
+        문서 전체에서 고르게 뽑은 페이지를 구조 정보만으로 빠르게 분류
+
+        텍스트 레이아웃을 하지 않고 콘텐츠 스트림 크기, 이미지 데이터 크기,
+        폰트 유무만 보므로 1,000페이지 문서도 1초 안에 끝납니다.
+
+        Returns:
+            샘플 페이지별 분류와 text/image 비율을 담은 프로필
+        """
+        started = time.perf_counter()
+        sample_size = sample_size or self.PRESCAN_SAMPLES
+        total_pages = self.session.total_pages
+        sampling_started = time.perf_counter()
+
+        count = min(sample_size, total_pages)
+        if count <= 1:
+            sampled = list(range(count))
+        else:
+            sampled = sorted({round(i * (total_pages - 1) / (count - 1)) for i in range(count)})
+
+        pages = []
+        counts = {'text': 0, 'image': 0, 'mixed': 0, 'blank': 0}
+        for page_num in sampled:
+            info = self.session.page_info(page_num)
+            kind = self.classify_page(info)
+            counts[kind] += 1
+            pages.append({'page': page_num + 1, 'kind': kind, **info})
+
+        self.profiler.add('prescan', time.perf_counter() - sampling_started)
+
+        non_blank = max(1, len(pages) - counts['blank'])
+        return {
+            'total_pages': total_pages,
+            'sampled_pages': len(pages),
+            'counts': counts,
+            'text_ratio': (counts['text'] + counts['mixed']) / non_blank,
+            'image_ratio': (counts['image'] + counts['mixed']) / non_blank,
+            'pages': pages,
+            'elapsed_s': round(time.perf_counter() - started, 4),
+        }
 
     def analyze(self) -> dict:
         """PDF 파일 분석"""
@@ -57,24 +812,28 @@ class AutoPDFProcessor:
         print(f"{'='*60}")
 
         try:
-            reader = PdfReader(str(self.file_path))
-            total_pages = len(reader.pages)
+            profile = self.prescan()
+            total_pages = profile['total_pages']
 
-            # 첫 페이지에서 텍스트 비율 체크
-            first_page_text = reader.pages[0].extract_text()
-            has_text = len(first_page_text.strip()) > 100
+            # 샘플 페이지 중 텍스트가 있는 페이지가 절반 이상이면 텍스트 문서로 판단
+            has_text = profile['text_ratio'] >= 0.5
 
             analysis = {
                 'total_pages': total_pages,
                 'file_size_mb': self.file_size_mb,
                 'has_text': has_text,
-                'text_length': len(first_page_text),
+                'text_ratio': profile['text_ratio'],
+                'image_ratio': profile['image_ratio'],
+                'page_profile': profile,
                 'avg_page_size_mb': self.file_size_mb / total_pages if total_pages > 0 else 0
             }
 
             print(f"\n파일 크기: {self.file_size_mb:.2f}MB")
             print(f"총 페이지: {total_pages}")
             print(f"페이지당 평균 크기: {analysis['avg_page_size_mb']:.2f}MB")
+            print(f"샘플 {profile['sampled_pages']}페이지: 텍스트 {profile['counts']['text']}, "
+                  f"이미지 {profile['counts']['image']}, 혼합 {profile['counts']['mixed']}, "
+                  f"빈 페이지 {profile['counts']['blank']}")
             print(f"텍스트 포함 여부: {'예' if has_text else '아니오 (이미지 중심)'}")
 
             return analysis
@@ -83,63 +842,428 @@ class AutoPDFProcessor:
             print(f"오류: PDF 파일을 읽을 수 없습니다 - {e}")
             raise
 
-    def recommend_strategy(self, analysis: dict) -> str:
-        """최적의 처리 전략 추천"""
-        size = self.file_size_mb
-        pages = analysis['total_pages']
-        has_text = analysis['has_text']
+    def _plan_sample(self, profile: dict, kinds: Tuple[str, ...]) -> List[int]:
+        """prescan 샘플 중 kinds로 분류된 페이지(1부터 시작)를 고르게 최대 PLAN_SAMPLE_PAGES개 선택"""
+        pages = [page['page'] for page in profile['pages'] if page['kind'] in kinds]
+        if len(pages) <= self.PLAN_SAMPLE_PAGES:
+            return pages
+        step = (len(pages) - 1) / (self.PLAN_SAMPLE_PAGES - 1)
+        return [pages[round(i * step)] for i in range(self.PLAN_SAMPLE_PAGES)]
 
-        print(f"\n{'='*60}")
-        print("처리 전략 결정")
-        print(f"{'='*60}")
+    def measure_throughput(self, profile: dict) -> dict:
+        """
+        prescan 샘플 페이지 몇 장을 실제로 처리해 이 컴퓨터의 처리 속도와 출력 크기 측정
 
-        # 전략 결정
-        if size <= self.SMALL_FILE:
-            strategy = "none"
-            reason = f"파일이 충분히 작습니다 ({size:.1f}MB). 그대로 사용 가능합니다."
+        텍스트 추출과 래스터 압축은 샘플 페이지마다, 분할은 샘플 페이지부터 이어지는 몇
+        페이지로 분할 파일 하나를 만들어 잽니다. 렌더링할 수 없는 환경이면 래스터 항목은 None입니다.
 
-        elif size <= self.MEDIUM_FILE:
-            if has_text:
-                strategy = "extract_text"
-                reason = f"텍스트 중심 문서입니다. 텍스트만 추출하면 가장 효율적입니다."
+        Returns:
+            text_s_per_page, text_bytes_per_page, split_s_per_byte,
+            raster_s_per_page(렌더링+인코딩), raster_write_s_per_page(래스터 페이지를 PDF에 쓰기),
+            raster_bytes_per_page, elapsed_s
+        """
+        started = time.perf_counter()
+        total_pages = profile['total_pages']
+        every_kind = ('text', 'image', 'mixed', 'blank')
+
+        text_pages = self._plan_sample(profile, ('text', 'mixed')) or self._plan_sample(profile, every_kind)
+        text_started = time.perf_counter()
+        text_bytes = 0
+        for page_num in text_pages:
+            if _backend().name == 'pypdf2':
+                text = self.session.page(page_num - 1).extract_text()
             else:
-                strategy = "compress"
-                reason = f"이미지 중심 문서입니다. 압축을 시도합니다."
+                text = _extract_page_range(self.source, page_num - 1, page_num)[0]
+            text_bytes += len(self._page_block(page_num - 1, text))
+        text_s = time.perf_counter() - text_started
+
+        split_start = profile['pages'][len(profile['pages']) // 2]['page'] - 1 if profile['pages'] else 0
+        split_end = min(split_start + self.PLAN_SAMPLE_PAGES, total_pages)
+        split_started = time.perf_counter()
+        data = _write_part(self.source, split_start, split_end, 'pypdf2', self.session.reader)[0]
+        split_s_per_byte = (time.perf_counter() - split_started) / max(len(data), 1)
+
+        raster_kinds = every_kind if self.compress_mode == 'raster' else ('image', 'mixed')
+        raster_pages = self._plan_sample(profile, raster_kinds)
+        raster_s_per_page = raster_write_s_per_page = raster_bytes_per_page = None
+        if not raster_pages:
+            raster_s_per_page = raster_write_s_per_page = raster_bytes_per_page = 0.0
+        else:
+            try:
+                raster_started = time.perf_counter()
+                encoded_pages = [_render_and_encode(self.source, page_num, page_num,
+                                                    self.COMPRESS_QUALITY, self.COMPRESS_DPI,
+                                                    color_mode=self.color_mode)[0][0]
+                                 for page_num in raster_pages]
+                raster_s_per_page = (time.perf_counter() - raster_started) / len(raster_pages)
+                raster_bytes_per_page = (sum(_raster_page_bytes(image_bytes) for image_bytes in encoded_pages)
+                                         / len(raster_pages))
+                write_started = time.perf_counter()
+                writer = _StreamingPDFWriter(io.BytesIO())
+                for page_num, image_bytes in zip(raster_pages, encoded_pages):
+                    writer.add_raster(image_bytes, self.session.page(page_num - 1))
+                writer.close()
+                raster_write_s_per_page = (time.perf_counter() - write_started) / len(raster_pages)
+            except Exception as e:
+                print(f"  [WARNING] 압축 속도를 측정할 수 없습니다: {e}")
+
+        return {
+            'text_s_per_page': text_s / len(text_pages) if text_pages else 0.0,
+            'text_bytes_per_page': text_bytes / len(text_pages) if text_pages else 0.0,
+            'split_s_per_byte': split_s_per_byte,
+            'raster_s_per_page': raster_s_per_page,
+            'raster_write_s_per_page': raster_write_s_per_page,
+            'raster_bytes_per_page': raster_bytes_per_page,
+            'elapsed_s': round(time.perf_counter() - started, 3),
+        }
+
+    def throughput(self, profile: dict) -> dict:
+        """
+        measure_throughput() 결과 (같은 컴퓨터에서 같은 파일을 같은 설정으로 잰 적이 있으면 재사용)
 
-        elif size <= self.LARGE_FILE:
-            if has_text:
-                strategy = "extract_text_and_split"
-                reason = f"큰 파일입니다 ({size:.1f}MB). 텍스트 추출과 분할을 모두 수행합니다."
+        파일은 경로, 크기, 수정 시각으로 구분하며 메모리 입력은 매번 측정합니다. 렌더링할 수
+        없었던 측정은 기록하지 않습니다. 재사용한 결과에는 cached가 True로 들어갑니다.
+        """
+        key = None
+        if isinstance(self.source, str):
+            stat = self.file_path.stat()
+            key = json.dumps([platform.node(), _backend().name, str(self.file_path.resolve()),
+                              stat.st_size, stat.st_mtime_ns, self.compress_mode, self.color_mode,
+                              self.COMPRESS_QUALITY, self.COMPRESS_DPI, self.PLAN_SAMPLE_PAGES])
+            cached = _load_throughput(key)
+            if cached is not None:
+                return dict(cached, cached=True)
+        throughput = self.measure_throughput(profile)
+        if key is not None and throughput['raster_s_per_page'] is not None:
+            _store_throughput(key, throughput)
+        return dict(throughput, cached=False)
+
+    def plan_strategies(self, analysis: dict, full: bool = False) -> dict:
+        """
+        전략별 예상 처리 시간과 출력 크기를 추정하고, 출력 조건을 만족하는 가장 빠른 전략 선택
+
+        출력 조건은 파일 하나의 최대 크기(max_output_mb)와 최대 파일 수(max_output_files)이며,
+        텍스트 중심 문서가 아니면 텍스트만 남기는 전략은 내용이 빠지므로 후보에서 제외합니다.
+        분할 파일 크기는 페이지 비용 인덱스로 계산하고, 시간과 텍스트/압축 결과 크기는
+        measure_throughput()으로 잰 속도로 추정합니다. 원본이 이미 조건을 만족하면 full이
+        아닌 한 측정하지 않고 'none'을 고릅니다. 조건을 만족하는 전략이 없으면 조건을 넘는
+        비율(최대 파일 크기 / 한도, 파일 수 / 한도 중 큰 값)이 가장 작은 전략을 고릅니다.
+
+        Returns:
+            strategy, fits, candidates(전략별 seconds/outputs/largest_bytes/total_bytes/excess/fits/note),
+            throughput
+        """
+        max_bytes = self.max_output_mb * 1024 * 1024
+        profile = analysis['page_profile']
+        total_pages = analysis['total_pages']
+        candidates = []
+
+        def add(strategy: str, seconds: float, outputs: List[float], note: Optional[str] = None) -> None:
+            excess = max(outputs) / max_bytes
+            if self.max_output_files is not None:
+                excess = max(excess, len(outputs) / self.max_output_files)
+            candidates.append({'strategy': strategy, 'seconds': round(seconds, 2),
+                               'outputs': len(outputs), 'largest_bytes': int(max(outputs)),
+                               'total_bytes': int(sum(outputs)), 'excess': round(excess, 3),
+                               'fits': note is None and excess <= 1, 'note': note})
+
+        add('none', 0.0, [self.input_bytes])
+        throughput = None
+        if full or not candidates[0]['fits']:
+            with self.profiler.stage('plan'):
+                throughput = self.throughput(profile)
+            cost_index = self.session.cost_index()
+            per_byte = throughput['split_s_per_byte']
+
+            def split(max_mb: float) -> Tuple[float, List[int]]:
+                sizes = [predicted for _, _, predicted in
+                         _plan_size_split(cost_index, int(max_mb * 1024 * 1024))] or [_PART_BASE_BYTES]
+                return sum(sizes) * per_byte / min(self.workers, len(sizes)), sizes
+
+            text_seconds = throughput['text_s_per_page'] * total_pages / self.workers
+            text_bytes = throughput['text_bytes_per_page'] * total_pages
+            text_note = None if analysis['has_text'] else "이미지 중심 문서라 텍스트만으로는 내용이 빠짐"
+
+            add('extract_text', text_seconds, [text_bytes], text_note)
+
+            if throughput['raster_s_per_page'] is None:
+                compress_note = "렌더링할 수 없음"
+                compress_seconds, compressed = 0.0, self.input_bytes
             else:
-                strategy = "compress_and_split"
-                reason = f"큰 이미지 중심 문서입니다. 압축 후 분할합니다."
+                compress_note = None
+                counts = profile['counts']
+                raster_fraction = (1.0 if self.compress_mode == 'raster' else
+                                   (counts['image'] + counts['mixed']) / max(1, profile['sampled_pages']))
+                raster_count = round(raster_fraction * total_pages)
+                compressed = (self.input_bytes * (1 - raster_fraction)
+                              + raster_count * throughput['raster_bytes_per_page'])
+                if self.target_mb:
+                    compressed = min(compressed, self.target_mb * 1024 * 1024)
+                # 래스터 페이지는 잰 렌더링/인코딩/쓰기 속도로, 그대로 옮기는 페이지는 분할과 같은 복사 속도로
+                compress_seconds = (raster_count * (throughput['raster_s_per_page'] / self.workers
+                                                    + throughput['raster_write_s_per_page'])
+                                    + self.input_bytes * (1 - raster_fraction) * per_byte)
+            add('compress', compress_seconds, [compressed], compress_note)
+
+            split_seconds, split_sizes = split(self.SPLIT_SIZE)
+            add('extract_text_and_split', text_seconds + split_seconds, [text_bytes] + split_sizes,
+                text_note)
+
+            # compress_and_split은 압축 결과가 분할 기준보다 클 때만 다시 나눔 (process() 참고)
+            split_limit = self.target_mb or self.COMPRESSED_SPLIT_LIMIT
+            compressed_outputs = [compressed]
+            seconds = compress_seconds
+            if compressed > split_limit * 1024 * 1024:
+                part_count = -(-int(compressed) // int(min(self.SPLIT_SIZE, split_limit) * 1024 * 1024))
+                compressed_outputs = [compressed / part_count] * part_count
+                seconds += compressed * per_byte / min(self.workers, part_count)
+            add('compress_and_split', seconds, compressed_outputs, compress_note)
+
+            split_seconds, split_sizes = split(self.AGGRESSIVE_SPLIT_SIZE)
+            if analysis['has_text']:
+                add('split_aggressive', split_seconds + text_seconds, split_sizes + [text_bytes])
+            else:
+                add('split_aggressive', split_seconds, split_sizes)
+
+        fitting = [candidate for candidate in candidates if candidate['fits']]
+        if fitting:
+            chosen = min(fitting, key=lambda candidate: candidate['seconds'])
+        else:
+            chosen = min((candidate for candidate in candidates if candidate['note'] is None),
+                         key=lambda candidate: (candidate['excess'], candidate['seconds']))
+
+        return {
+            'strategy': chosen['strategy'],
+            'fits': chosen['fits'],
+            'max_output_mb': self.max_output_mb,
+            'max_output_files': self.max_output_files,
+            'candidates': candidates,
+            'throughput': throughput,
+        }
+
+    def recommend_strategy(self, analysis: dict, full: bool = False) -> str:
+        """
+        최적의 처리 전략 추천 (plan_strategies 결과를 self.plan에 보관)
+
+        full이면 원본이 이미 조건을 만족해도 모든 전략의 예상치를 계산해 출력합니다 (--plan).
+        """
+        print(f"\n{'='*60}")
+        print("처리 전략 결정")
+        print(f"{'='*60}")
 
-        else:  # Very large file
-            strategy = "split_aggressive"
-            reason = f"매우 큰 파일입니다 ({size:.1f}MB). 작은 단위로 분할합니다."
+        plan = self.plan = self.plan_strategies(analysis, full)
+        strategy = plan['strategy']
+        limits = f"파일당 {self.max_output_mb:g}MB 이하"
+        if self.max_output_files is not None:
+            limits += f", 최대 {self.max_output_files}개"
+
+        print(f"출력 조건: {limits}")
+        if plan['throughput'] is not None and plan['throughput']['cached']:
+            print("측정 시간: 0초 (이전에 이 파일로 잰 처리 속도 재사용)")
+        elif plan['throughput'] is not None:
+            print(f"측정 시간: {plan['throughput']['elapsed_s']:.1f}초 (샘플 페이지로 처리 속도 측정)")
+        print(f"\n  {'전략':<22} {'예상 시간':>6} {'파일':>3} {'최대 파일':>6} {'합계':>8}")
+        for candidate in plan['candidates']:
+            status = candidate['note'] or ('조건 만족' if candidate['fits'] else '조건 초과')
+            marker = '*' if candidate['strategy'] == strategy else ' '
+            print(f"{marker} {candidate['strategy']:<24} {candidate['seconds']:>8.1f}초 "
+                  f"{candidate['outputs']:>5} {candidate['largest_bytes'] / (1024 * 1024):>8.1f}MB "
+                  f"{candidate['total_bytes'] / (1024 * 1024):>8.1f}MB  {status}")
+
+        chosen = next(candidate for candidate in plan['candidates'] if candidate['strategy'] == strategy)
+        if strategy == 'none':
+            reason = f"파일이 이미 출력 조건({limits})을 만족합니다. 그대로 사용 가능합니다."
+        elif plan['fits']:
+            reason = (f"출력 조건({limits})을 만족하는 전략 중 가장 빠릅니다 "
+                      f"(예상 {chosen['seconds']:.1f}초, 파일 {chosen['outputs']}개).")
+        else:
+            reason = (f"출력 조건({limits})을 만족하는 전략이 없어, 조건에 가장 가까운 전략을 "
+                      f"선택합니다 (파일 {chosen['outputs']}개, 최대 "
+                      f"{chosen['largest_bytes'] / (1024 * 1024):.1f}MB).")
 
         print(f"\n권장 전략: {strategy}")
         print(f"이유: {reason}")
 
         return strategy
 
+    def cache_params(self) -> dict:
+        """처리 결과에 영향을 주는 설정 (캐시 키에 포함)"""
+        return {
+            'max_output_mb': self.max_output_mb,
+            'max_output_files': self.max_output_files,
+            'quality': self.COMPRESS_QUALITY,
+            'dpi': self.COMPRESS_DPI,
+            'compress_mode': self.compress_mode,
+            'color_mode': self.color_mode,
+            'near_duplicates': self.near_duplicates,
+            'backend': _backend().name,
+            'target_mb': self.target_mb,
+            'split_mb': self.SPLIT_SIZE,
+            'aggressive_split_mb': self.AGGRESSIVE_SPLIT_SIZE,
+            'compressed_split_limit_mb': self.COMPRESSED_SPLIT_LIMIT,
+        }
+
+    @contextlib.contextmanager
+    def _open_output(self, name: str, resume_at: Optional[int] = None, keep_partial: bool = False):
+        """
+        출력 파일을 쓰기용으로 열기 (메모리 출력이면 BytesIO에 받아 self.buffers에 보관)
+
+        파일은 '<이름>.partial'에 쓴 뒤 다 쓰면 원래 이름으로 바꾸므로, 중단되어도 덜 쓴
+        파일이 완성된 것처럼 남지 않습니다. resume_at을 주면 기존 부분 파일을 그 위치까지
+        잘라 이어서 쓰고, keep_partial이면 실패해도 부분 파일을 지우지 않습니다.
+        """
+        if self.output_dir is None and self.output_sink is not None:
+            yield self.output_sink
+            return
+        if self.output_dir is None:
+            buffer = io.BytesIO()
+            yield buffer
+            self.buffers[name] = buffer.getvalue()
+            return
+
+        output_file = self.output_dir / name
+        partial_file = self._partial_path(output_file)
+        try:
+            with open(partial_file, 'r+b' if resume_at is not None else 'wb') as f:
+                if resume_at is not None:
+                    f.truncate(resume_at)
+                    f.seek(resume_at)
+                yield f
+        except BaseException:
+            if not keep_partial:
+                with contextlib.suppress(OSError):
+                    partial_file.unlink()
+            raise
+        os.replace(partial_file, output_file)
+
+    @staticmethod
+    def _partial_path(output_file: Path) -> Path:
+        return output_file.with_name(output_file.name + '.partial')
+
+    def _expected_seconds(self, strategy: str, analysis: dict) -> float:
+        """plan_strategies로 추정한 strategy의 처리 시간 (전략을 직접 지정했으면 이때 추정)"""
+        if strategy == 'none':
+            return 0.0
+        plan = self.plan
+        if plan is None or all(candidate['strategy'] != strategy for candidate in plan['candidates']):
+            plan = self.plan_strategies(analysis, full=True)
+        return next(candidate['seconds'] for candidate in plan['candidates']
+                    if candidate['strategy'] == strategy)
+
+    def _open_journal(self, strategy: str, analysis: dict) -> Optional[CheckpointJournal]:
+        """
+        오래 걸리는 작업을 디스크에 처리할 때 쓸 체크포인트 저널 (입력/전략/설정이 같을 때만 이어서 처리)
+
+        예상 처리 시간이 CHECKPOINT_MIN_SECONDS보다 짧으면 기록하는 비용이 다시 처리하는
+        비용보다 커서 저널을 쓰지 않습니다.
+        """
+        if (self.output_dir is None
+                or self._expected_seconds(strategy, analysis) < self.CHECKPOINT_MIN_SECONDS):
+            return None
+        stat = self.file_path.stat()
+        identity = {'source': str(self.file_path.resolve()), 'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns, 'strategy': strategy,
+                    'params': self.cache_params()}
+        journal = CheckpointJournal(self.output_dir, self.file_path.stem, identity)
+        if journal.has_progress:
+            state = journal.state
+            print(f"[RESUME] 중단된 작업을 이어서 처리합니다 (완성된 파일 {len(state['outputs'])}개, "
+                  f"텍스트 {state['text']['pages'] if state['text'] else 0}페이지, "
+                  f"압축 페이지 {len(state['pages'])}개)")
+        return journal
+
+    def _open_manifest(self) -> Optional[PageManifest]:
+        """증분 처리에 쓸 페이지 매니페스트 (페이지 지문을 계산해 이전 실행과 비교)"""
+        if not self.incremental or self.output_dir is None:
+            return None
+        with self.profiler.stage('fingerprint'):
+            fingerprints = _page_fingerprints(self.session.reader)
+        manifest = PageManifest(self.output_dir, self.file_path.stem, fingerprints)
+        if manifest.has_previous:
+            print(f"[INCREMENTAL] 이전 실행과 비교: 바뀐 페이지 "
+                  f"{len(fingerprints) - len(manifest.unchanged)}개, "
+                  f"그대로인 페이지 {len(manifest.unchanged)}개 (전체 {len(fingerprints)}페이지)")
+        else:
+            print("[INCREMENTAL] 이전 실행 기록이 없어 전체를 처리하고 페이지 지문을 기록합니다.")
+        self.profiler.metric('unchanged_pages', len(manifest.unchanged))
+        return manifest
+
+    def close(self) -> None:
+        """이 처리기가 만든 문서 세션을 닫음 (메모리 매핑한 입력의 매핑 해제)"""
+        if self.owns_session:
+            self.session.close()
+
+    def _save_journal(self) -> None:
+        """중단되거나 실패했을 때 진행 상황 저장 (저장에 실패해도 원래 오류를 가리지 않음)"""
+        if self.journal is None:
+            return
+        try:
+            self.journal.save()
+        except OSError as e:
+            print(f"[WARNING] 진행 상황을 저장하지 못했습니다: {e}")
+            return
+        print(f"\n[RESUME] 진행 상황을 저장했습니다. 같은 명령으로 다시 실행하면 이어서 처리합니다.")
+
+    def _output_path(self, name: str) -> Path:
+        """출력 경로 (메모리 출력이면 self.buffers의 키가 되는 파일 이름)"""
+        return Path(name) if self.output_dir is None else self.output_dir / name
+
+    def _output_size(self, output: Path) -> int:
+        if self.output_dir is None:
+            return len(self.buffers[output.name])
+        return output.stat().st_size
+
+    def _keep_original(self) -> Path:
+        """원본을 그대로 결과로 사용 (메모리 출력이면 입력 바이트를 보관)"""
+        if self.output_dir is None:
+            self.buffers[self.file_path.name] = self.source
+        return self.file_path
+
+    def process_bytes(self, strategy: Optional[str] = None) -> List[Tuple[str, bytes]]:
+        """
+        process()와 같지만 디스크를 거치지 않고 결과를 (파일 이름, 바이트) 목록으로 반환
+
+        PDF 바이트나 파일 객체로 만들고 output_dir을 주지 않은 경우에만 사용할 수 있습니다.
+        """
+        if self.output_dir is not None:
+            raise ValueError("메모리 출력 모드가 아닙니다 (output_dir 없이 PDF 바이트로 생성하세요)")
+        return [(result.name, self.buffers[result.name]) for result in self.process(strategy)]
+
     def process(self, strategy: Optional[str] = None) -> List[Path]:
         """자동으로 PDF 처리"""
+        cache_key = None
+        if self.cache is not None:
+            with self.profiler.stage('cache'):
+                cache_key = self.cache.make_key(self.cache.file_hash(self.file_path),
+                                                strategy or 'auto', self.cache_params())
+                cached = self.cache.lookup(cache_key)
+            if cached is not None:
+                self.strategy = cached['strategy']
+                outputs = [Path(output['path']) for output in cached['outputs']]
+                print(f"\n[CACHE] 이전 처리 결과를 재사용합니다: {self.file_path.name} "
+                      f"({self.strategy}, {len(outputs)}개 파일)")
+                return outputs
+
         analysis = self.analyze()
 
         if strategy is None:
             strategy = self.recommend_strategy(analysis)
+        self.strategy = strategy
 
         print(f"\n{'='*60}")
         print("처리 시작")
         print(f"{'='*60}\n")
 
         results = []
+        if self.output_dir is not None:
+            self.output_dir.mkdir(exist_ok=True)
+        self.journal = self._open_journal(strategy, analysis)
+        self.manifest = self._open_manifest() if strategy != 'none' else None
 
         try:
             if strategy == "none":
                 print(f"[OK] 파일이 이미 적절한 크기입니다: {self.file_path}")
-                results.append(self.file_path)
+                results.append(self._keep_original())
 
             elif strategy == "extract_text":
                 results.append(self._extract_text())
@@ -149,20 +1273,44 @@ class AutoPDFProcessor:
 
             elif strategy == "extract_text_and_split":
                 results.append(self._extract_text())
-                results.extend(self._split_by_size(10))
+                results.extend(self._split_by_size(self.SPLIT_SIZE))
 
             elif strategy == "compress_and_split":
                 compressed = self._compress()
-                # 압축된 파일을 다시 분석
-                compressed_processor = AutoPDFProcessor(str(compressed), str(self.output_dir))
-                compressed_analysis = compressed_processor.analyze()
-                if compressed_processor.file_size_mb > 15:
-                    results.extend(compressed_processor._split_by_size(10))
+                # 압축된 파일을 다시 분석 (압축에 실패해 원본이 돌아오면 현재 세션 재사용)
+                compressed_session = self.session if compressed == self.file_path else None
+                if self.output_dir is None:
+                    compressed_input, output_dir = self.buffers[compressed.name], None
                 else:
-                    results.append(compressed)
+                    compressed_input, output_dir = str(compressed), str(self.output_dir)
+                compressed_processor = AutoPDFProcessor(compressed_input, output_dir,
+                                                       self.batch_size, self.workers,
+                                                       session=compressed_session,
+                                                       compress_mode=self.compress_mode,
+                                                       profiler=self.profiler,
+                                                       name=compressed.name,
+                                                       incremental=self.incremental,
+                                                       color_mode=self.color_mode,
+                                                       near_duplicates=self.near_duplicates)
+                try:
+                    compressed_analysis = compressed_processor.analyze()
+                    split_limit = self.target_mb or self.COMPRESSED_SPLIT_LIMIT
+                    if compressed_processor.file_size_mb > split_limit:
+                        compressed_processor.journal = self.journal
+                        # 압축 파일의 페이지도 지문으로 비교해, 바뀌지 않은 분할 파일은 그대로 둠
+                        compressed_processor.manifest = compressed_processor._open_manifest()
+                        results.extend(compressed_processor._split_by_size(min(self.SPLIT_SIZE,
+                                                                               split_limit)))
+                        if compressed_processor.manifest is not None:
+                            compressed_processor.manifest.save()
+                        self.buffers.update(compressed_processor.buffers)
+                    else:
+                        results.append(compressed)
+                finally:
+                    compressed_processor.close()
 
             elif strategy == "split_aggressive":
-                results.extend(self._split_by_size(8))
+                results.extend(self._split_by_size(self.AGGRESSIVE_SPLIT_SIZE))
                 # 텍스트 추출도 시도
                 if analysis['has_text']:
                     results.append(self._extract_text())
@@ -171,127 +1319,471 @@ class AutoPDFProcessor:
             print(f"\n오류 발생: {e}")
             import traceback
             traceback.print_exc()
+            self._save_journal()
             return []
+        except BaseException:
+            # Ctrl+C, 시간/메모리 한도 등으로 중단되어도 다음 실행이 이어서 처리할 수 있게 저장
+            self._save_journal()
+            raise
+        finally:
+            self.close()
+
+        if self.journal is not None:
+            self.journal.finish()
+        if self.manifest is not None:
+            self.manifest.save()
 
         print(f"\n{'='*60}")
         print("처리 완료!")
         print(f"{'='*60}")
         print(f"\n생성된 파일 ({len(results)}개):")
         for i, result in enumerate(results, 1):
-            size = result.stat().st_size / (1024 * 1024)
+            size = self._output_size(result) / (1024 * 1024)
             print(f"  {i}. {result.name} ({size:.2f}MB)")
 
-        print(f"\n저장 위치: {self.output_dir}")
+        print(f"\n저장 위치: {self.output_dir or '메모리'}")
+
+        if cache_key is not None and results:
+            with self.profiler.stage('cache'):
+                self.cache.store(cache_key, self.file_path, strategy, self.cache_params(), results)
 
         return results
 
     def _extract_text(self) -> Path:
-        """텍스트 추출"""
+        """텍스트 추출 (페이지 순서대로 바로 기록하고 페이지 오프셋 인덱스 생성)"""
         print("[TEXT] 텍스트 추출 중...")
 
-        output_file = self.output_dir / f"{self.file_path.stem}_text.txt"
-        reader = PdfReader(str(self.file_path))
-
-        text_content = []
-        for page_num, page in enumerate(reader.pages):
-            text = page.extract_text()
-            text_content.append(f"{'='*60}\n페이지 {page_num + 1}\n{'='*60}\n\n{text}\n\n")
-
-            if (page_num + 1) % 10 == 0:
-                print(f"  진행: {page_num + 1}/{len(reader.pages)} 페이지")
+        output_file = self._output_path(f"{self.file_path.stem}_text.txt")
+        index_file = self._output_path(f"{self.file_path.stem}_text.idx.json")
+        total_pages = self.session.total_pages
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(text_content))
+        journal = self.journal
+        if journal is not None and journal.completed_output(output_file) and index_file.exists():
+            print(f"[OK] 이전에 추출한 텍스트를 확인했습니다: {output_file.name}")
+            return output_file
 
-        size_kb = output_file.stat().st_size / 1024
+        progress = journal.text_progress(self._partial_path(output_file)) if journal else None
+        if progress is not None:
+            start_page, position, crc = progress['pages'], progress['bytes'], progress['crc32']
+            offsets = list(progress['offsets'])
+            print(f"  [RESUME] {start_page + 1}페이지부터 이어서 추출합니다.")
+        else:
+            start_page, position, crc = 0, 0, 0
+            offsets = []
+
+        previous_blocks = self._previous_text_blocks(output_file, index_file)
+        if previous_blocks:
+            print(f"  [INCREMENTAL] 바뀌지 않은 {len(previous_blocks)}페이지는 이전 텍스트를 재사용합니다.")
+
+        with self.profiler.stage('extract') as record, \
+                self._open_output(output_file.name, resume_at=position if progress else None,
+                                  keep_partial=journal is not None) as f:
+            page_started = time.perf_counter()
+            for page_num, page_block in enumerate(self._iter_text_pages(start_page, previous_blocks),
+                                                  start_page):
+                if page_num > 0:
+                    position += f.write(b'\n')
+                    crc = zlib.crc32(b'\n', crc)
+                offsets.append(position)
+                written = f.write(page_block)
+                position += written
+                crc = zlib.crc32(page_block, crc)
+                if journal is not None and journal.due():
+                    # 기록한 위치까지는 디스크에 있어야 하므로 먼저 flush
+                    f.flush()
+                    os.fsync(f.fileno())
+                    journal.record_text(page_num + 1, position, crc, offsets)
+
+                if (page_num + 1) % 10 == 0:
+                    print(f"  진행: {page_num + 1}/{total_pages} 페이지")
+                if self.profiler.enabled:
+                    now = time.perf_counter()
+                    self.profiler.page(page_num + 1, 'extract', now - page_started, written)
+                    page_started = now
+            record['bytes_out'] = position
+
+        index = _text_index(self.file_path.name, offsets, position)
+        if self.output_dir is None:
+            self.buffers[index_file.name] = json.dumps(index, ensure_ascii=False).encode('utf-8')
+        else:
+            _write_text_index(index_file, index)
+        if journal is not None:
+            journal.record_output(output_file)
+        if self.manifest is not None:
+            self.manifest.record_output(output_file)
+            self.manifest.record_output(index_file)
+
+        size_kb = position / 1024
         print(f"[OK] 텍스트 추출 완료: {output_file.name} ({size_kb:.1f}KB)")
 
         return output_file
 
-    def _compress(self, quality: int = 40) -> Path:
-        """이미지 압축"""
-        print(f"[COMPRESS] 이미지 압축 중 (품질: {quality}%)...")
+    def _previous_text_blocks(self, output_file: Path,
+                              index_file: Path) -> Dict[int, Tuple[int, int, int]]:
+        """
+        이전 텍스트 파일에서 가져올 수 있는 페이지 블록
+        {페이지(0부터 시작): (이전 페이지 번호, 시작 바이트, 끝 바이트)}
+
+        증분 처리에서 이전 텍스트 파일과 인덱스가 기록한 그대로 남아 있을 때만 찾습니다.
+        """
+        manifest = self.manifest
+        if (manifest is None or not manifest.unchanged
+                or manifest.previous_output(output_file) is None
+                or manifest.previous_output(index_file) is None):
+            return {}
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            offsets = index['offsets']
+            # 다음 페이지와의 사이에 있는 구분 줄바꿈은 블록에서 제외
+            ends = [offset - 1 for offset in offsets[1:]] + [index['total_bytes']]
+        except (OSError, ValueError, KeyError):
+            return {}
+        return {page_num: (previous, offsets[previous], ends[previous])
+                for page_num, previous in manifest.unchanged.items() if previous < len(offsets)}
+
+    def _iter_text_pages(self, start_page: int = 0,
+                         previous_blocks: Optional[Dict[int, Tuple[int, int, int]]] = None
+                         ) -> Iterator[bytes]:
+        """
+        start_page(0부터 시작)부터 페이지 순서대로 텍스트 블록(UTF-8)을 돌려줌
+        (페이지 사이의 구분 줄바꿈은 제외)
+
+        previous_blocks에 있는 페이지는 추출하지 않고 이전 텍스트 파일에서 블록을 읽어
+        머리글의 페이지 번호만 고칩니다 (_previous_text_blocks 참고).
+        """
+        previous_blocks = previous_blocks or {}
+        total_pages = self.session.total_pages
+        page_texts = _iter_page_texts(self.session.reader, self.source, self.workers,
+                                      pages=[page_num for page_num in range(start_page, total_pages)
+                                             if page_num not in previous_blocks])
+        text_file = self._output_path(f"{self.file_path.stem}_text.txt")
+        # 출력 파일을 바꿔 넣기 전에 닫히도록 마지막 페이지를 돌려준 뒤 바로 닫음
+        with (open(text_file, 'rb') if previous_blocks else contextlib.nullcontext()) as previous:
+            for page_num in range(start_page, total_pages):
+                if page_num not in previous_blocks:
+                    yield self._page_block(page_num, next(page_texts))
+                    continue
+                previous_page, start, end = previous_blocks[page_num]
+                previous.seek(start)
+                block = previous.read(end - start)
+                yield self._page_header(page_num) + block[len(self._page_header(previous_page)):]
+
+    @staticmethod
+    def _page_header(page_num: int) -> bytes:
+        """페이지(0부터 시작) 텍스트 블록의 머리글"""
+        return f"{'='*60}\n페이지 {page_num + 1}\n{'='*60}\n\n".encode('utf-8')
+
+    @classmethod
+    def _page_block(cls, page_num: int, text: str) -> bytes:
+        """페이지(0부터 시작) 텍스트 블록 (텍스트 파일에 쓰는 형식)"""
+        return cls._page_header(page_num) + f"{text}\n\n".encode('utf-8')
+
+    def _compress(self, quality: Optional[int] = None, dpi: Optional[int] = None,
+                  fallback: bool = True) -> Path:
+        """
+        이미지 압축 (target_mb가 있으면 샘플 페이지로 품질/DPI를 예측해 한 번만 압축)
+
+        압축에 실패하면 원본을 그대로 돌려줍니다 (fallback=False이면 예외를 그대로 올림).
+        """
+        auto_settings = self.target_mb is not None and quality is None and dpi is None
+        quality = quality or self.COMPRESS_QUALITY
+        dpi = dpi or self.COMPRESS_DPI
+        print(f"[COMPRESS] 이미지 압축 중 (품질: {'자동' if auto_settings else f'{quality}%'})...")
         print("  [INFO] 시간이 걸릴 수 있습니다. 잠시만 기다려주세요...")
+        if self.workers > 1:
+            print(f"  [INFO] {self.workers}개 프로세스로 병렬 압축합니다.")
 
-        output_file = self.output_dir / f"{self.file_path.stem}_compressed.pdf"
+        output_file = self._output_path(f"{self.file_path.stem}_compressed.pdf")
+        journal = self.journal
+        if journal is not None and journal.completed_output(output_file):
+            print(f"[OK] 이전에 압축한 파일을 확인했습니다: {output_file.name}")
+            return output_file
 
         try:
-            images = convert_from_path(str(self.file_path), dpi=150)
-
-            temp_images = []
-            for i, image in enumerate(images):
-                temp_path = self.output_dir / f"temp_page_{i}.jpg"
-                image.save(str(temp_path), 'JPEG', quality=quality, optimize=True)
-                temp_images.append(temp_path)
-
-                if (i + 1) % 5 == 0:
-                    print(f"  진행: {i + 1}/{len(images)} 페이지")
-
-            if temp_images:
-                first_image = PIL.Image.open(temp_images[0])
-                first_image.save(
-                    str(output_file),
-                    'PDF',
-                    resolution=100.0,
-                    save_all=True,
-                    append_images=[PIL.Image.open(img) for img in temp_images[1:]]
-                )
-
-            # 임시 파일 삭제
-            for temp_file in temp_images:
-                temp_file.unlink()
+            total_pages = self.session.total_pages
+
+            if self.compress_mode == 'images':
+                self._recompress_images(quality, dpi, output_file)
+                if journal is not None:
+                    journal.record_output(output_file)
+                return output_file
+
+            if self.compress_mode == 'hybrid':
+                with self.profiler.stage('classify'):
+                    raster_pages = [page_num for page_num in range(1, total_pages + 1)
+                                    if self.classify_page(self.session.page_info(page_num - 1))
+                                    in ('image', 'mixed')]
+                print(f"  [INFO] 이미지 중심 페이지 {len(raster_pages)}/{total_pages}개만 "
+                      f"래스터화하고 나머지는 원본을 유지합니다.")
+            else:
+                raster_pages = list(range(1, total_pages + 1))
+
+            raster_set = set(raster_pages)
+            previous = (self.manifest.previous_output(output_file)
+                        if self.manifest is not None else None)
+            if auto_settings and raster_pages:
+                if journal is not None and journal.state['target']:
+                    quality, dpi = journal.state['target']
+                    print(f"  [RESUME] 이전에 고른 설정을 사용합니다: 품질 {quality}%, {dpi}DPI")
+                elif (previous is not None and previous.get('target_mb') == self.target_mb
+                      and previous.get('color_mode', 'auto') == self.color_mode):
+                    quality, dpi = previous['quality'], previous['dpi']
+                    print(f"  [INCREMENTAL] 이전에 고른 설정을 사용합니다: 품질 {quality}%, {dpi}DPI")
+                else:
+                    quality, dpi = self._plan_target_settings(raster_pages, raster_set)
+                    if journal is not None:
+                        journal.state['target'] = [quality, dpi]
+                        journal.save()
+
+            # 이전 실행에서 압축해 둔 페이지는 다시 렌더링하지 않음
+            resumed = {page_num for page_num in raster_pages
+                       if journal is not None and journal.has_page(page_num, quality, dpi)}
+            if resumed:
+                print(f"  [RESUME] 이전에 압축한 {len(resumed)}페이지를 재사용합니다.")
+
+            # 증분 처리: 바뀌지 않은 페이지는 이전 압축 파일의 이미지를 그대로 가져옴
+            # {페이지: 이전 압축 파일의 페이지(0부터 시작)}
+            reused = {}
+            if (previous is not None and previous.get('color_mode', 'auto') == self.color_mode
+                    and previous.get('near_duplicates', False) == self.near_duplicates
+                    and [previous.get('quality'), previous.get('dpi')] == [quality, dpi]):
+                previous_raster = set(previous.get('raster', []))
+                for page_num in raster_pages:
+                    previous_page = self.manifest.unchanged.get(page_num - 1)
+                    if (page_num not in resumed and previous_page is not None
+                            and previous_page + 1 in previous_raster):
+                        reused[page_num] = previous_page
+            previous_reader = _open_reader(str(output_file)) if reused else None
+            if reused:
+                print(f"  [INCREMENTAL] 바뀌지 않은 {len(reused)}페이지는 이전 압축 결과를 재사용합니다.")
+
+            # batch_size 페이지씩만 렌더링하여 메모리 사용량을 일정하게 유지
+            # (workers > 1이면 구간별로 여러 프로세스에서 병렬 처리)
+            encoded_pages = _iter_encoded_pages(self.source,
+                                                [page_num for page_num in raster_pages
+                                                 if page_num not in resumed
+                                                 and page_num not in reused],
+                                                quality, self.batch_size, self.workers, dpi,
+                                                self.profiler, self.color_mode,
+                                                self.near_duplicates)
+
+            # 페이지가 준비되는 대로 출력 파일에 바로 씀 (JPEG는 다시 인코딩하지 않음)
+            try:
+                with self._open_output(output_file.name) as f:
+                    writer = _StreamingPDFWriter(f)
+                    for page_num in range(1, total_pages + 1):
+                        if page_num in resumed:
+                            image_bytes = journal.load_page(page_num)
+                            if image_bytes is None:
+                                # 저장해 둔 페이지가 손상되었으면 그 페이지만 다시 렌더링
+                                image_bytes = _render_and_encode(self.source, page_num, page_num,
+                                                                 quality, dpi,
+                                                                 color_mode=self.color_mode)[0][0]
+                        elif page_num in reused:
+                            image_bytes = _raster_payload(previous_reader.pages[reused[page_num]])
+                            if image_bytes is None:
+                                image_bytes = _render_and_encode(self.source, page_num, page_num,
+                                                                 quality, dpi,
+                                                                 color_mode=self.color_mode)[0][0]
+                        elif page_num in raster_set:
+                            _, image_bytes = next(encoded_pages)
+                            if journal is not None:
+                                journal.record_page(page_num, image_bytes, quality, dpi)
+                        if page_num in raster_set:
+                            with self.profiler.stage('assemble', bytes_in=len(image_bytes)):
+                                writer.add_raster(image_bytes, self.session.page(page_num - 1))
+                        else:
+                            with self.profiler.stage('assemble'):
+                                writer.add_page(self.session.page(page_num - 1), prune=True)
+                        if page_num % LAZY_RELEASE_PAGES == 0:
+                            _release_parsed_objects(self.session.reader)
+                            if previous_reader is not None:
+                                _release_parsed_objects(previous_reader)
+
+                        if page_num % 5 == 0:
+                            print(f"  진행: {page_num}/{total_pages} 페이지")
+
+                    # 이전 압축 파일을 새 파일로 바꿔 넣기 전에 닫음
+                    if previous_reader is not None:
+                        previous_reader.stream.close()
+                    with self.profiler.stage('write') as record:
+                        output_bytes = record['bytes_out'] = writer.close()
+            finally:
+                # 중간에 실패해도 이전 압축 파일을 닫음 (이미 닫혔으면 아무 일도 하지 않음)
+                if previous_reader is not None:
+                    previous_reader.stream.close()
+            if journal is not None:
+                journal.record_output(output_file)
+            if self.manifest is not None:
+                self.manifest.record_output(output_file, quality=quality, dpi=dpi,
+                                            color_mode=self.color_mode,
+                                            near_duplicates=self.near_duplicates,
+                                            target_mb=self.target_mb, raster=raster_pages)
 
             original_size = self.file_size_mb
-            compressed_size = output_file.stat().st_size / (1024 * 1024)
+            compressed_size = output_bytes / (1024 * 1024)
             reduction = ((original_size - compressed_size) / original_size) * 100
 
             print(f"[OK] 압축 완료: {output_file.name}")
             print(f"  원본: {original_size:.1f}MB -> 압축: {compressed_size:.1f}MB (감소율: {reduction:.0f}%)")
+            if writer.duplicate_pages:
+                print(f"  [INFO] 중복 페이지 {writer.duplicate_pages}개는 이미지를 공유했습니다 "
+                      f"(이미지 {writer.unique_images}/{writer.raster_pages}개, "
+                      f"중복률 {writer.duplicate_pages / writer.raster_pages:.0%})")
+            self.profiler.metric('dedup_ratio', round(writer.duplicate_pages / writer.raster_pages, 4)
+                                 if writer.raster_pages else 0.0)
+            if writer.raster_pages:
+                print("  [INFO] 색상 모드: " + ", ".join(
+                    f"{COLOR_MODE_NAMES[mode]} {stats['pages']}페이지 ({stats['bytes'] / 1024:.0f}KB)"
+                    for mode, stats in writer.color_modes.items()))
+                if 'color_mode_savings' in self.profiler.metrics:
+                    print(f"  [INFO] 모두 컬러 JPEG로 인코딩했을 때보다 "
+                          f"{self.profiler.metrics['color_mode_savings']:.0%} 작습니다.")
+                self.profiler.metric('color_modes', {mode: stats['pages']
+                                                     for mode, stats in writer.color_modes.items()})
 
             return output_file
 
         except Exception as e:
+            if not fallback:
+                raise
             print(f"  [WARNING] 압축 실패: {e}")
             print(f"  -> 분할 방식으로 진행합니다.")
-            return self.file_path
-
-    def _split_by_size(self, max_size_mb: float) -> List[Path]:
-        """크기별로 PDF 분할"""
-        print(f"[SPLIT] PDF 분할 중 (목표 크기: {max_size_mb}MB)...")
-
-        reader = PdfReader(str(self.file_path))
-        total_pages = len(reader.pages)
+            return self._keep_original()
+
+    def _plan_target_settings(self, raster_pages: List[int], raster_set: set) -> Tuple[int, int]:
+        """target_mb 안에 드는 가장 좋은 품질/DPI 예측"""
+        print(f"  [TARGET] 목표 {self.target_mb}MB에 맞는 품질/DPI를 샘플 페이지로 예측합니다...")
+        with self.profiler.stage('target'):
+            kept_pages = [page_num - 1 for page_num in range(1, self.session.total_pages + 1)
+                          if page_num not in raster_set]
+            kept_bytes = (_kept_pages_bytes(self.session.cost_index(), kept_pages)
+                          if kept_pages else _PART_BASE_BYTES)
+            plan = _plan_target_compression(self.source, raster_pages, kept_bytes,
+                                            int(self.target_mb * 1024 * 1024), self.workers,
+                                            self.color_mode)
+
+        print(f"  [TARGET] 품질 {plan['quality']}%, {plan['dpi']}DPI 선택 "
+              f"(예상 {plan['predicted_bytes'] / (1024 * 1024):.1f}MB, "
+              f"샘플 {len(plan['sampled_pages'])}페이지, {plan['elapsed_s']:.1f}초)")
+        if not plan['fits']:
+            print(f"  [WARNING] 어떤 설정으로도 {self.target_mb}MB 안에 들지 않을 것으로 예상되어 "
+                  f"가장 작은 설정을 사용합니다.")
+        return plan['quality'], plan['dpi']
+
+    def _recompress_images(self, quality: int, dpi: int, output_file: Path) -> Path:
+        """페이지를 렌더링하지 않고 내장 이미지 스트림만 재압축"""
+        # 세션의 리더는 다른 단계와 공유하므로 별도의 리더에서 스트림을 교체
+        with self.profiler.stage('parse', bytes_in=self.input_bytes):
+            reader = _open_reader(self.source)
+        with self.profiler.stage('recompress') as record:
+            report = _recompress_embedded_images(reader, dpi, quality, workers=self.workers)
+            record['bytes_out'] = sum(item['after_bytes'] for item in report)
+
+        for item in report:
+            if item['action'] == 'recompressed':
+                print(f"  이미지 (페이지 {item['page']}): {item['before_bytes'] / 1024:.0f}KB -> "
+                      f"{item['after_bytes'] / 1024:.0f}KB")
+
+        # 재압축한 이미지 스트림은 리더에만 있으므로 쓸 때까지 메모리에 남음 (출력 크기 정도)
+        with self._open_output(output_file.name) as f:
+            writer = _StreamingPDFWriter(f)
+            with self.profiler.stage('assemble'):
+                for page in reader.pages:
+                    writer.add_page(page)
+            with self.profiler.stage('write') as record:
+                output_bytes = record['bytes_out'] = writer.close()
+        reader.stream.close()
+
+        recompressed = sum(1 for item in report if item['action'] == 'recompressed')
+        original_size = self.file_size_mb
+        compressed_size = output_bytes / (1024 * 1024)
+        reduction = ((original_size - compressed_size) / original_size) * 100
+
+        print(f"[OK] 압축 완료: {output_file.name} (이미지 {recompressed}/{len(report)}개 재압축)")
+        print(f"  원본: {original_size:.1f}MB -> 압축: {compressed_size:.1f}MB (감소율: {reduction:.0f}%)")
 
-        # 페이지 수 계산
-        avg_page_size = self.file_size_mb / total_pages
-        pages_per_file = max(1, int(max_size_mb / avg_page_size))
-
-        print(f"  파일당 약 {pages_per_file} 페이지로 분할")
-
-        output_files = []
-        file_count = 0
-
-        for start_page in range(0, total_pages, pages_per_file):
-            writer = PdfWriter()
-            end_page = min(start_page + pages_per_file, total_pages)
-
-            for page_num in range(start_page, end_page):
-                writer.add_page(reader.pages[page_num])
-
-            file_count += 1
-            output_file = self.output_dir / f"{self.file_path.stem}_part{file_count:03d}.pdf"
-
-            with open(output_file, 'wb') as f:
-                writer.write(f)
+        return output_file
 
-            size = output_file.stat().st_size / (1024 * 1024)
-            output_files.append(output_file)
-            print(f"  생성: {output_file.name} (페이지 {start_page+1}-{end_page}, {size:.1f}MB)")
+    def _unchanged_part(self, output_file: Path, page_range: Tuple[int, int]) -> bool:
+        """이전 실행이 남긴 분할 파일이 page_range와 내용이 같은 페이지들로 되어 있는지"""
+        record = self.manifest.previous_output(output_file) if self.manifest is not None else None
+        if record is None or 'pages' not in record:
+            return False
+        previous_start, previous_end = record['pages']
+        return self.manifest.same_pages(page_range[0], page_range[1], previous_start, previous_end)
 
+    def _split_by_size(self, max_size_mb: float) -> List[Path]:
+        """크기별로 PDF 분할 (페이지별 실제 크기를 측정하여 한 번에 분할)"""
+        output_files = list(self._iter_split(max_size_mb))
         print(f"[OK] 분할 완료: {len(output_files)}개 파일")
 
         return output_files
 
+    def _iter_split(self, max_size_mb: float) -> Iterator[Path]:
+        """크기별로 분할하면서 분할 파일이 하나 완성될 때마다 그 경로를 돌려줌"""
+        print(f"[SPLIT] PDF 분할 중 (목표 크기: {max_size_mb}MB)...")
+
+        cost_index = self.session.cost_index()
+        plan = _plan_size_split(cost_index, int(max_size_mb * 1024 * 1024))
+        page_ranges = [(start_page, end_page) for start_page, end_page, _ in plan]
+
+        print(f"  페이지별 크기 분석 완료: {len(plan)}개 파일로 분할")
+        shared_bytes = _shared_resource_bytes(cost_index, page_ranges)
+        if shared_bytes >= 1024:
+            print(f"  [INFO] 여러 분할 파일에 함께 들어가는 공유 리소스: {shared_bytes / 1024:.0f}KB")
+
+        output_files = [self._output_path(f"{self.file_path.stem}_part{file_count:03d}.pdf")
+                        for file_count in range(1, len(plan) + 1)]
+        completed = {file_count for file_count, (output_file, page_range)
+                     in enumerate(zip(output_files, page_ranges), 1)
+                     if self.journal is not None
+                     and self.journal.completed_output(output_file, list(page_range))}
+        # 증분 처리: 이전 실행의 같은 이름 분할 파일이 내용이 같은 페이지들로 되어 있으면 그대로 둠
+        unchanged = {file_count for file_count, (output_file, page_range)
+                     in enumerate(zip(output_files, page_ranges), 1)
+                     if file_count not in completed and self._unchanged_part(output_file, page_range)}
+        if unchanged:
+            print(f"  [INCREMENTAL] 바뀐 페이지가 없는 분할 파일 {len(unchanged)}개는 그대로 둡니다.")
+        # 남은 분할 파일은 workers개 프로세스에서 동시에 만들고 순서대로 기록
+        parts = _iter_part_bytes(self.session.reader, self.source,
+                                 [page_range for file_count, page_range in enumerate(page_ranges, 1)
+                                  if file_count not in completed and file_count not in unchanged],
+                                 self.workers)
+
+        total_bytes = 0
+        for file_count, (start_page, end_page, predicted) in enumerate(plan, 1):
+            output_file = output_files[file_count - 1]
+            if file_count in completed or file_count in unchanged:
+                reason = "이전에 완성됨" if file_count in completed else "바뀌지 않음"
+                print(f"  확인: {output_file.name} (페이지 {start_page+1}-{end_page}, {reason})")
+                total_bytes += self._output_size(output_file)
+                if self.manifest is not None:
+                    self.manifest.record_output(output_file, pages=[start_page, end_page])
+                yield output_file
+                continue
+
+            data, assemble_s, write_s, _ = next(parts)
+            self.profiler.add('assemble', assemble_s)
+            with self.profiler.stage('write') as record, self._open_output(output_file.name) as f:
+                f.write(data)
+                record['bytes_out'] = len(data)
+            self.profiler.add('write', write_s)
+            if self.journal is not None:
+                self.journal.record_output(output_file, [start_page, end_page])
+            if self.manifest is not None:
+                self.manifest.record_output(output_file, pages=[start_page, end_page])
+
+            total_bytes += len(data)
+            print(f"  생성: {output_file.name} (페이지 {start_page+1}-{end_page}, "
+                  f"예상 {predicted / (1024 * 1024):.1f}MB / 실제 {len(data) / (1024 * 1024):.1f}MB)")
+            yield output_file
+
+        overhead = total_bytes / self.input_bytes if self.input_bytes else 0.0
+        print(f"  [INFO] 분할 파일 합계 {total_bytes / (1024 * 1024):.1f}MB (원본 대비 {overhead:.2f}배)")
+        self.profiler.metric('split_overhead', round(overhead, 4))
+
 
 def find_pdf_files(path: Path) -> List[Path]:
     """경로에서 PDF 파일 찾기"""
@@ -321,6 +1813,979 @@ def find_pdf_files(path: Path) -> List[Path]:
         return []
 
 
+# 배치 모드에서 파일 하나를 처리할 때 필요한 기본 메모리 (MB, PDF 크기와 별도)
+BATCH_JOB_BASE_MB = 256
+
+
+def print_page_profile(pdf_file: Path, profile: dict) -> None:
+    """prescan() 결과를 페이지별 표로 출력"""
+    print(f"\n{'='*60}")
+    print(f"페이지 분석: {pdf_file.name}")
+    print(f"{'='*60}")
+    print(f"총 {profile['total_pages']}페이지 중 {profile['sampled_pages']}페이지 샘플 "
+          f"({profile['elapsed_s'] * 1000:.0f}ms)")
+    print(f"텍스트 비율: {profile['text_ratio']:.0%}, 이미지 비율: {profile['image_ratio']:.0%}")
+    print(f"\n  {'페이지':>6}  {'분류':<6} {'콘텐츠':>10} {'이미지':>12} {'폰트':>4}")
+    for page in profile['pages']:
+        print(f"  {page['page']:>6}  {page['kind']:<6} {page['content_bytes'] / 1024:>8.1f}KB "
+              f"{page['image_bytes'] / 1024:>10.1f}KB {page['font_count']:>4}")
+
+
+def _physical_memory_mb() -> Optional[float]:
+    """시스템 물리 메모리 크기 (MB). 확인할 수 없으면 None"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _batch_pool_size(pdf_files: List[Path], memory_budget_mb: float, workers: int = 1) -> int:
+    """
+    CPU 수와 메모리 예산으로 동시에 처리할 파일 수 결정
+
+    파일마다 workers개 프로세스가 각자 문서를 열어 렌더링하므로, CPU 수와 메모리 예산을
+    workers로 나눈 뒤 파일 수를 정합니다.
+    """
+    workers = max(1, workers)
+    largest_mb = max(pdf.stat().st_size for pdf in pdf_files) / (1024 * 1024)
+    # PdfReader가 파일 전체를 메모리에 올리고, 쓰기 시 비슷한 크기가 더 필요하므로 2배로 추정
+    per_job_mb = BATCH_JOB_BASE_MB + 2 * largest_mb
+    by_memory = max(1, int(memory_budget_mb / workers // per_job_mb))
+    by_cpu = max(1, (os.cpu_count() or 1) // workers)
+    return max(1, min(by_cpu, by_memory, len(pdf_files)))
+
+
+def _make_cache(pdf_file: Path, output_dir: Optional[str],
+                cache_options: Optional[dict]) -> Optional[ResultCache]:
+    """파일의 출력 폴더에 해당하는 결과 캐시 생성 (cache_options가 None이면 캐시 사용 안 함)"""
+    if cache_options is None:
+        return None
+    cache_dir = Path(output_dir) if output_dir else pdf_file.parent / "processed"
+    return ResultCache(cache_dir, **cache_options)
+
+
+def _profile_record(profiler: RunProfiler, pdf_file: Path,
+                    processor: Optional[AutoPDFProcessor], results: List[Path]) -> dict:
+    """파일 하나의 리포트 항목 (캐시 재사용으로 파싱하지 않았으면 페이지 수는 None)"""
+    parsed = processor is not None and processor.session._reader is not None
+    return profiler.run_record(pdf_file, results,
+                               processor.session.total_pages if parsed else None,
+                               processor.strategy if processor is not None else None)
+
+
+def _process_batch_file(pdf_file: str, output_dir: Optional[str],
+                        processor_options: Optional[dict] = None,
+                        cache_options: Optional[dict] = None, profile: bool = False) -> dict:
+    """배치 워커: 파일 하나를 처리하고 결과 요약을 반환 (출력은 로그로 수집)"""
+    pdf_path = Path(pdf_file)
+    log = io.StringIO()
+    started = time.perf_counter()
+    profiler = RunProfiler(enabled=profile)
+    processor = None
+    strategy = None
+    results = []
+    error = None
+
+    with contextlib.redirect_stdout(log):
+        try:
+            cache = _make_cache(pdf_path, output_dir, cache_options)
+            processor = AutoPDFProcessor(pdf_file, output_dir, cache=cache, profiler=profiler,
+                                         **(processor_options or {}))
+            results = processor.process()
+            strategy = processor.strategy
+        except Exception as e:
+            error = str(e)
+
+    if error is None and not results:
+        error = "처리 결과가 없습니다 (로그 참고)"
+
+    input_bytes = pdf_path.stat().st_size
+    outputs = [{'path': str(result), 'bytes': result.stat().st_size} for result in results]
+    output_bytes = sum(output['bytes'] for output in outputs)
+
+    return {
+        'file': str(pdf_path),
+        'status': 'failed' if error else 'ok',
+        'strategy': strategy,
+        'outputs': outputs,
+        'duration_s': round(time.perf_counter() - started, 3),
+        'input_bytes': input_bytes,
+        'output_bytes': output_bytes,
+        'bytes_saved': input_bytes - output_bytes if outputs else 0,
+        'error': error,
+        'log': log.getvalue(),
+        'profile': _profile_record(profiler, pdf_path, processor, results) if profile else None,
+    }
+
+
+def run_batch(pdf_files: List[Path], output_dir: Optional[str] = None, jobs: int = 0,
+              memory_budget_mb: Optional[float] = None, processor_options: Optional[dict] = None,
+              cache_options: Optional[dict] = None, profile: bool = False) -> dict:
+    """
+    여러 PDF를 프로세스 풀에서 병렬로 처리하고 집계 요약을 반환
+
+    큰 파일부터 먼저 시작해 마지막에 큰 파일 하나만 남아 오래 기다리는 일을 줄입니다.
+    각 파일의 출력은 섞이지 않도록 수집되어 요약의 'log' 항목에 들어갑니다.
+
+    Args:
+        pdf_files: 처리할 PDF 파일 목록
+        output_dir: 출력 폴더 (기본값: 각 파일 옆의 processed 폴더)
+        jobs: 동시에 처리할 파일 수 (0이면 CPU 수와 메모리 예산으로 자동 결정)
+        memory_budget_mb: 배치 전체가 사용할 메모리 예산 (기본값: 물리 메모리의 절반)
+        processor_options: 파일마다 AutoPDFProcessor에 넘길 설정 (batch_size, workers 등)
+        cache_options: ResultCache 설정 (None이면 캐시 사용 안 함)
+        profile: True이면 파일별 단계 측정 결과를 'profile' 항목에 포함
+    """
+    if memory_budget_mb is None:
+        physical_mb = _physical_memory_mb()
+        memory_budget_mb = physical_mb / 2 if physical_mb else 4096
+
+    scheduled = sorted(pdf_files, key=lambda pdf: pdf.stat().st_size, reverse=True)
+    workers = (processor_options or {}).get('workers') or 1
+    pool_size = jobs if jobs > 0 else _batch_pool_size(scheduled, memory_budget_mb, workers)
+
+    print(f"\n[BATCH] {len(scheduled)}개 파일을 {pool_size}개 프로세스로 처리합니다 "
+          f"(메모리 예산: {memory_budget_mb:.0f}MB)")
+
+    started_at = datetime.now()
+    started = time.perf_counter()
+    file_results = {}
+
+    with ProcessPoolExecutor(max_workers=pool_size) as executor:
+        futures = {
+            executor.submit(_process_batch_file, str(pdf), output_dir,
+                            processor_options, cache_options, profile): pdf
+            for pdf in scheduled
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            pdf = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'file': str(pdf), 'status': 'failed', 'strategy': None, 'outputs': [],
+                          'duration_s': None, 'input_bytes': pdf.stat().st_size,
+                          'output_bytes': 0, 'bytes_saved': 0, 'error': str(e), 'log': '',
+                          'profile': None}
+            file_results[pdf] = result
+
+            status = '[OK]' if result['status'] == 'ok' else '[FAILED]'
+            print(f"  {status} ({done}/{len(scheduled)}) {pdf.name} - "
+                  f"{result['strategy'] or '-'}, {result['duration_s'] or 0:.1f}초")
+
+    files = [file_results[pdf] for pdf in scheduled]
+    return {
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'duration_s': round(time.perf_counter() - started, 3),
+        'jobs': pool_size,
+        'memory_budget_mb': round(memory_budget_mb),
+        'total_files': len(files),
+        'succeeded': sum(1 for result in files if result['status'] == 'ok'),
+        'failed': sum(1 for result in files if result['status'] != 'ok'),
+        'input_bytes': sum(result['input_bytes'] for result in files),
+        'output_bytes': sum(result['output_bytes'] for result in files),
+        'bytes_saved': sum(result['bytes_saved'] for result in files),
+        'files': files,
+    }
+
+
+def _watch_worker_init() -> None:
+    """감시 모드 워커: Ctrl+C/SIGTERM은 메인 프로세스만 받고, 진행 중인 작업은 끝까지 처리"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+class FolderWatcher:
+    """
+    폴더를 주기적으로 확인하여 새로 생기거나 바뀐 PDF를 계속 처리하는 데몬
+
+    파일 크기/수정 시각이 settle_seconds 동안 바뀌지 않아야 다 쓰인 것으로 보고 큐에
+    넣습니다. 작업은 계속 살아 있는 프로세스 풀에서 실행되므로 파일마다 인터프리터
+    시작과 PyPDF2/PIL/pdf2image import 비용을 다시 내지 않습니다. 실패한 작업은
+    max_retries번까지 점점 늦게 다시 시도하며, 처리량/대기열 상태는 status_file에
+    계속 기록됩니다.
+    """
+
+    STATUS_FILE = ".auto-pdf-watch.json"
+    RETRY_DELAY = 5.0  # 재시도 대기 시간 (초, 시도할 때마다 2배)
+
+    def __init__(self, watch_dir: Path, output_dir: Optional[str] = None, jobs: int = 0,
+                 processor_options: Optional[dict] = None, cache_options: Optional[dict] = None,
+                 poll_interval: float = 2.0, settle_seconds: float = 2.0, max_retries: int = 2,
+                 status_file: Optional[Path] = None):
+        self.watch_dir = Path(watch_dir)
+        self.output_dir = output_dir
+        self.jobs = jobs if jobs > 0 else max(1, os.cpu_count() or 1)
+        self.processor_options = processor_options
+        self.cache_options = cache_options
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.max_retries = max_retries
+
+        output_root = Path(output_dir) if output_dir else self.watch_dir / "processed"
+        # 감시 폴더 자체에 결과를 쓰면 출력 PDF가 다시 새 파일로 잡혀 끝없이 처리됨
+        # (하위 폴더는 감시하지 않으므로 기본값인 processed 폴더는 괜찮음)
+        if output_root.resolve() == self.watch_dir.resolve():
+            raise ValueError(f"출력 폴더가 감시 폴더와 같습니다: {output_root} "
+                             f"(--output에 다른 폴더를 지정하세요)")
+        self.status_file = Path(status_file) if status_file else output_root / self.STATUS_FILE
+
+        self._processed = {}   # 경로 -> 마지막으로 큐에 넣은 (크기, mtime_ns)
+        self._settling = {}    # 경로 -> ((크기, mtime_ns), 처음 본 시각)
+        self._queue = deque()  # (경로, 시도 횟수, 실행 가능 시각)
+        self._running = {}     # future -> (경로, 시도 횟수, 시작 시각)
+        self._executor = None
+        self._started = None
+
+        self.started_at = None
+        self.counters = {'queued': 0, 'succeeded': 0, 'failed': 0, 'retried': 0,
+                         'input_bytes': 0, 'output_bytes': 0, 'busy_s': 0.0}
+        self.recent = deque(maxlen=20)
+
+    @staticmethod
+    def _signature(pdf: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = pdf.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _scan(self) -> None:
+        """새로 생기거나 바뀐 PDF 중 쓰기가 끝난 파일을 큐에 추가"""
+        now = time.monotonic()
+        current = set()
+
+        for pdf in sorted(self.watch_dir.glob("*.pdf")) + sorted(self.watch_dir.glob("*.PDF")):
+            current.add(pdf)
+            signature = self._signature(pdf)
+            if signature is None or signature[0] == 0 or self._processed.get(pdf) == signature:
+                continue
+
+            settling = self._settling.get(pdf)
+            if settling is None or settling[0] != signature:
+                # 처음 봤거나 아직 쓰는 중: 크기/수정 시각이 바뀌지 않는지 지켜봄
+                self._settling[pdf] = (signature, now)
+                continue
+            if now - settling[1] < self.settle_seconds:
+                continue
+
+            del self._settling[pdf]
+            self._processed[pdf] = signature
+            if not any(queued == pdf for queued, _, _ in self._queue):
+                self._queue.append((pdf, 1, now))
+                self.counters['queued'] += 1
+                print(f"[QUEUE] {pdf.name} ({signature[0] / (1024 * 1024):.1f}MB)")
+
+        # 삭제된 파일은 다시 생기면 새 파일로 처리
+        for pdf in list(self._processed):
+            if pdf not in current:
+                del self._processed[pdf]
+        for pdf in list(self._settling):
+            if pdf not in current:
+                del self._settling[pdf]
+
+    def _submit_ready(self) -> None:
+        """실행 가능한 작업을 풀의 빈 자리만큼 제출"""
+        now = time.monotonic()
+        for _ in range(len(self._queue)):
+            if len(self._running) >= self.jobs:
+                return
+            pdf, attempt, ready_at = self._queue.popleft()
+            if ready_at > now:
+                self._queue.append((pdf, attempt, ready_at))
+                continue
+            future = self._executor.submit(_process_batch_file, str(pdf), self.output_dir,
+                                           self.processor_options, self.cache_options)
+            self._running[future] = (pdf, attempt, now)
+
+    def _collect_done(self) -> None:
+        """끝난 작업의 결과를 집계하고 실패한 작업은 재시도 큐에 넣음"""
+        pool_broken = False
+
+        for future in [future for future in self._running if future.done()]:
+            pdf, attempt, started = self._running.pop(future)
+            self.counters['busy_s'] += time.monotonic() - started
+            try:
+                result = future.result()
+            except Exception as e:
+                # 워커 프로세스가 죽으면 풀 전체를 다시 만들어야 함
+                pool_broken = True
+                result = {'file': str(pdf), 'status': 'failed', 'strategy': None,
+                          'outputs': [], 'duration_s': None, 'input_bytes': 0,
+                          'output_bytes': 0, 'bytes_saved': 0, 'error': str(e), 'log': '',
+                          'profile': None}
+
+            if result['status'] == 'ok':
+                self.counters['succeeded'] += 1
+                self.counters['input_bytes'] += result['input_bytes']
+                self.counters['output_bytes'] += result['output_bytes']
+                print(f"  [OK] {pdf.name} - {result['strategy']}, {result['duration_s']:.1f}초")
+            elif attempt <= self.max_retries:
+                delay = self.RETRY_DELAY * 2 ** (attempt - 1)
+                self._queue.append((pdf, attempt + 1, time.monotonic() + delay))
+                self.counters['retried'] += 1
+                print(f"  [RETRY] {pdf.name} - {result['error']} ({delay:.0f}초 후 "
+                      f"{attempt + 1}번째 시도)")
+                continue
+            else:
+                self.counters['failed'] += 1
+                print(f"  [FAILED] {pdf.name} - {result['error']}")
+
+            self.recent.append({key: result[key] for key in
+                                ('file', 'status', 'strategy', 'duration_s', 'error')})
+
+        if pool_broken:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            for pdf, attempt, _ in self._running.values():
+                self._queue.append((pdf, attempt, time.monotonic()))
+            self._running.clear()
+            self._executor = ProcessPoolExecutor(max_workers=self.jobs,
+                                                 initializer=_watch_worker_init)
+
+    def status(self) -> dict:
+        """현재 처리량/대기열 상태"""
+        uptime = time.monotonic() - self._started if self._started is not None else 0.0
+        done = self.counters['succeeded'] + self.counters['failed']
+        return {
+            'watch_dir': str(self.watch_dir),
+            'pid': os.getpid(),
+            'started_at': self.started_at,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'uptime_s': round(uptime, 1),
+            'jobs': self.jobs,
+            'queue_depth': len(self._queue),
+            'in_progress': len(self._running),
+            'settling': len(self._settling),
+            **{key: value for key, value in self.counters.items() if key != 'busy_s'},
+            'files_per_min': round(done / uptime * 60, 2) if uptime else 0.0,
+            'mb_per_min': round(self.counters['input_bytes'] / (1024 * 1024) / uptime * 60, 2)
+                          if uptime else 0.0,
+            'utilization': round(self.counters['busy_s'] / (uptime * self.jobs), 3)
+                           if uptime else 0.0,
+            'recent': list(self.recent),
+        }
+
+    def _write_status(self) -> None:
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.status_file.with_name(self.status_file.name + ".tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.status(), f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.status_file)
+
+    def run(self) -> None:
+        """Ctrl+C로 중단할 때까지 폴더를 감시하며 처리"""
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._started = time.monotonic()
+        self._executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=_watch_worker_init)
+
+        # 서비스 관리자가 보내는 SIGTERM도 Ctrl+C와 같이 정상 종료
+        def stop(signum, frame):
+            raise KeyboardInterrupt
+        signal.signal(signal.SIGTERM, stop)
+
+        print(f"\n[WATCH] {self.watch_dir.absolute()} 폴더를 감시합니다 "
+              f"({self.poll_interval:g}초 간격, {self.jobs}개 프로세스)")
+        print(f"  상태 파일: {self.status_file.absolute()}")
+        print("  종료하려면 Ctrl+C를 누르세요.")
+
+        try:
+            while True:
+                self._scan()
+                self._collect_done()
+                self._submit_ready()
+                self._write_status()
+                time.sleep(self.poll_interval)
+        finally:
+            print(f"\n[WATCH] 종료 중... (진행 중인 작업 {len(self._running)}개 대기)")
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._collect_done()
+            self._write_status()
+            print(f"  처리: {self.counters['succeeded']}개, 실패: {self.counters['failed']}개, "
+                  f"재시도: {self.counters['retried']}회")
+
+
+# HTTP 서비스 모드에서 제공하는 작업 (POST /<작업>, 요청 본문은 PDF 바이트)
+SERVICE_OPERATIONS = ('analyze', 'extract-text', 'split', 'compress')
+# 압축 응답을 워커에서 보낼 때 한 번에 모아 보내는 크기 (바이트)
+SERVICE_CHUNK_BYTES = 256 * 1024
+# 서비스 워커는 요청 처리 스레드가 도는 중에도 새로 띄우므로 fork 대신 spawn 사용
+_SERVICE_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def _vm_size_bytes() -> Optional[int]:
+    """현재 프로세스의 가상 메모리 크기 (바이트). 확인할 수 없으면 None"""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmSize:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+@contextlib.contextmanager
+def _memory_limit(memory_mb: Optional[float]):
+    """with 블록 동안 프로세스가 지금보다 memory_mb 넘게 메모리를 더 쓰면 MemoryError 발생"""
+    current = _vm_size_bytes() if memory_mb and resource is not None else None
+    if current is None:
+        yield
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + int(memory_mb * 1024 * 1024)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+class _ChunkSink:
+    """write()로 받은 바이트를 SERVICE_CHUNK_BYTES씩 모아 send('chunk', ...)로 보내는 출력 스트림"""
+
+    def __init__(self, send):
+        self.send = send
+        self.position = 0
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self.position += len(data)
+        if len(self._buffer) >= SERVICE_CHUNK_BYTES:
+            self.flush()
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.send('chunk', bytes(self._buffer))
+            self._buffer = bytearray()
+
+
+def _run_service_job(operation: str, pdf_bytes: bytes, params: dict, send) -> None:
+    """
+    서비스 작업 하나를 실행하고 결과를 만들어지는 대로 send(kind, payload)로 보냄
+
+    kind는 'json' (분석 결과), 'chunk' (텍스트 페이지 또는 압축 PDF 조각), 'part' ((파일 이름,
+    분할 PDF)), 'file' (압축 PDF 파일 이름, 이어서 'chunk'로 내용을 보냄) 중 하나입니다.
+    """
+    processor = AutoPDFProcessor(pdf_bytes, name=params['name'], batch_size=params['batch_size'],
+                                 compress_mode=params['compress_mode'],
+                                 target_mb=params['target_mb'],
+                                 max_output_mb=params.get('max_output_mb'),
+                                 max_output_files=params.get('max_output_files'),
+                                 color_mode=params.get('color_mode') or 'auto',
+                                 near_duplicates=params.get('near_duplicates', False))
+
+    if operation == 'analyze':
+        analysis = processor.analyze()
+        strategy = processor.recommend_strategy(analysis)
+        send('json', {**analysis, 'strategy': strategy, 'plan': processor.plan})
+
+    elif operation == 'extract-text':
+        for page_num, page_block in enumerate(processor._iter_text_pages()):
+            send('chunk', page_block if page_num == 0 else b'\n' + page_block)
+
+    elif operation == 'split':
+        for output_file in processor._iter_split(params['max_mb'] or processor.SPLIT_SIZE):
+            send('part', (output_file.name, processor.buffers.pop(output_file.name)))
+
+    elif operation == 'compress':
+        # 압축 PDF는 페이지가 조립되는 대로 조각으로 보내므로 워커가 결과 전체를 들고 있지 않음
+        send('file', f"{processor.file_path.stem}_compressed.pdf")
+        processor.output_sink = _ChunkSink(send)
+        processor._compress(params['quality'], fallback=False)
+        processor.output_sink.flush()
+
+
+def _service_worker(task_conn, result_conn, memory_mb: Optional[float]) -> None:
+    """
+    서비스 워커 프로세스: 작업을 하나씩 받아 처리하고 결과를 result_conn으로 보냄
+
+    메시지는 (작업 ID, kind, payload)이며 작업마다 'done' 또는 'error'로 끝납니다. 메모리 한도를 넘기면 상태가 불확실하므로 프로세스를 끝내고
+    메인 프로세스가 새 워커로 교체합니다.
+    """
+    _watch_worker_init()
+    while True:
+        try:
+            task = task_conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        job_id, operation, pdf_bytes, params = task
+        started = time.perf_counter()
+
+        def send(kind, payload):
+            result_conn.send((job_id, kind, payload))
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()), _memory_limit(memory_mb):
+                _run_service_job(operation, pdf_bytes, params, send)
+        except MemoryError:
+            send('error', (413, f"요청당 메모리 한도({memory_mb:g}MB)를 넘었습니다"))
+            return
+        except Exception as e:
+            message = f"처리할 수 없는 PDF입니다: {e}"
+            if memory_mb and isinstance(e, OSError):
+                # 이미지 코덱 안의 메모리 할당 실패는 MemoryError가 아닌 OSError로 올라옴
+                message += f" (요청당 메모리 한도 {memory_mb:g}MB를 넘었을 수 있습니다)"
+            send('error', (422, message))
+        else:
+            send('done', round(time.perf_counter() - started, 3))
+
+
+class _ServiceJob:
+    """서비스 요청 하나 (메시지는 디스패처 스레드가 messages에 넣음)"""
+
+    def __init__(self, job_id: int, operation: str, pdf_bytes: bytes, params: dict,
+                 deadline: float):
+        self.job_id = job_id
+        self.operation = operation
+        self.pdf_bytes = pdf_bytes
+        self.params = params
+        self.deadline = deadline
+        self.started = None
+        self.cancelled = False
+        self.messages = queue.Queue()
+
+    def cancel(self) -> None:
+        """클라이언트가 연결을 끊었거나 응답을 보내지 못한 작업: 다음 확인 때 워커를 멈춤"""
+        self.cancelled = True
+
+    def expired(self, now: float, timeout: float) -> Optional[Tuple[int, str]]:
+        """취소되었거나 시간 한도를 넘었으면 (상태 코드, 메시지)"""
+        if self.cancelled:
+            return 499, "클라이언트가 연결을 끊었습니다"
+        if now > self.deadline:
+            return 504, f"요청 시간 한도({timeout:g}초)를 넘었습니다"
+        return None
+
+
+class _ServiceWorker:
+    """미리 띄워 둔 워커 프로세스 하나와 그 작업/결과 파이프"""
+
+    def __init__(self, memory_mb: Optional[float]):
+        task_reader, self.task_conn = _SERVICE_CONTEXT.Pipe(duplex=False)
+        self.result_conn, result_writer = _SERVICE_CONTEXT.Pipe(duplex=False)
+        self.process = _SERVICE_CONTEXT.Process(target=_service_worker,
+                                               args=(task_reader, result_writer, memory_mb),
+                                               daemon=True)
+        self.process.start()
+        task_reader.close()
+        result_writer.close()
+        self.job = None
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            with contextlib.suppress(OSError):
+                self.task_conn.send(None)
+        self.process.join(timeout=None if kill else 5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.task_conn.close()
+        self.result_conn.close()
+
+
+class ProcessingService:
+    """
+    PDF 분석/텍스트 추출/분할/압축을 제공하는 로컬 HTTP 서비스
+
+    워커 프로세스를 미리 띄워 두고 계속 재사용하므로 요청마다 인터프리터 시작과
+    PyPDF2/PIL/pdf2image import 비용이 들지 않습니다. 처리 중이거나 대기 중인 요청이
+    workers + queue_size개를 넘으면 새 요청은 바로 503으로 거절합니다. 요청마다 시간
+    한도(request_timeout)와 메모리 한도(request_memory_mb)가 있어, 넘기면 해당 워커를
+    멈추고 새 워커로 교체합니다. 텍스트는 페이지마다, 분할 파일은 하나씩 완성될 때마다
+    응답으로 바로 보냅니다.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, workers: int = 0,
+                 queue_size: Optional[int] = None, max_upload_mb: float = 200,
+                 request_timeout: float = 300, request_memory_mb: Optional[float] = None,
+                 processor_options: Optional[dict] = None):
+        self.host = host
+        self.port = port
+        self.workers = workers if workers > 0 else max(1, os.cpu_count() or 1)
+        self.queue_size = queue_size if queue_size is not None else 2 * self.workers
+        self.max_upload_bytes = int(max_upload_mb * 1024 * 1024)
+        self.request_timeout = request_timeout
+        self.request_memory_mb = request_memory_mb
+        self.processor_options = processor_options or {}
+
+        self._lock = threading.Lock()
+        self._pending = deque()  # 워커를 기다리는 작업
+        self._active = 0         # 대기 중 + 처리 중인 작업 수
+        self._next_id = 1
+        self._pool = []
+        self._wake_reader, self._wake_writer = multiprocessing.Pipe(duplex=False)
+        self._stopping = False
+        self._dispatcher = None
+        self._started = None
+
+        self.started_at = None
+        self.counters = {'requests': 0, 'succeeded': 0, 'failed': 0, 'rejected': 0,
+                         'timed_out': 0, 'input_bytes': 0, 'busy_s': 0.0}
+
+    def submit(self, operation: str, pdf_bytes: bytes, params: dict) -> Optional[_ServiceJob]:
+        """작업을 대기열에 넣음 (대기열이 가득 찼으면 None)"""
+        with self._lock:
+            self.counters['requests'] += 1
+            if self._active >= self.workers + self.queue_size:
+                self.counters['rejected'] += 1
+                return None
+            self._active += 1
+            job = _ServiceJob(self._next_id, operation, pdf_bytes, params,
+                              time.monotonic() + self.request_timeout)
+            self._next_id += 1
+            self._pending.append(job)
+            self.counters['input_bytes'] += len(pdf_bytes)
+            self._wake_writer.send(None)
+        return job
+
+    def _finish(self, job: _ServiceJob, kind: str, payload) -> None:
+        job.messages.put((kind, payload))
+        with self._lock:
+            self._active -= 1
+            if kind == 'done':
+                self.counters['succeeded'] += 1
+            else:
+                self.counters['failed'] += 1
+                if payload[0] == 504:
+                    self.counters['timed_out'] += 1
+
+    def _replace(self, worker: _ServiceWorker, kill: bool) -> None:
+        self._pool.remove(worker)
+        worker.stop(kill=kill)
+        if not self._stopping:
+            self._pool.append(_ServiceWorker(self.request_memory_mb))
+
+    def _dispatch(self) -> None:
+        """디스패처 스레드: 워커 결과 전달, 시간 초과/죽은 워커 처리, 대기 작업 배정"""
+        while not self._stopping:
+            connections = {worker.result_conn: worker for worker in self._pool}
+            ready = multiprocessing.connection.wait([self._wake_reader, *connections], timeout=0.5)
+
+            for conn in ready:
+                if conn is self._wake_reader:
+                    while self._wake_reader.poll():
+                        self._wake_reader.recv()
+                    continue
+                worker = connections[conn]
+                try:
+                    job_id, kind, payload = conn.recv()
+                except (EOFError, OSError):
+                    if worker.job is not None:
+                        self._finish(worker.job, 'error', (500, "워커 프로세스가 비정상 종료되었습니다"))
+                    self._replace(worker, kill=True)
+                    continue
+                job = worker.job
+                if job is None or job.job_id != job_id:
+                    continue
+                if kind in ('done', 'error'):
+                    worker.job = None
+                    self.counters['busy_s'] += time.monotonic() - job.started
+                    self._finish(job, kind, payload)
+                else:
+                    job.messages.put((kind, payload))
+
+            now = time.monotonic()
+            for worker in list(self._pool):
+                error = worker.job.expired(now, self.request_timeout) if worker.job else None
+                if error is not None:
+                    # 작업 중간에 멈출 방법이 없으므로 워커를 종료하고 새로 띄움
+                    self.counters['busy_s'] += now - worker.job.started
+                    self._finish(worker.job, 'error', error)
+                    self._replace(worker, kill=True)
+
+            assigned = []
+            with self._lock:
+                expired = [(job, job.expired(now, self.request_timeout)) for job in self._pending]
+                expired = [(job, error) for job, error in expired if error is not None]
+                for job, _ in expired:
+                    self._pending.remove(job)
+                idle = [worker for worker in self._pool if worker.job is None]
+                while self._pending and idle:
+                    assigned.append((idle.pop(), self._pending.popleft()))
+
+            for job, error in expired:
+                self._finish(job, 'error', error)
+            for worker, job in assigned:
+                worker.job = job
+                job.started = time.monotonic()
+                worker.task_conn.send((job.job_id, job.operation, job.pdf_bytes, job.params))
+                job.pdf_bytes = None
+
+    def status(self) -> dict:
+        """현재 처리량/대기열 상태"""
+        uptime = time.monotonic() - self._started if self._started is not None else 0.0
+        with self._lock:
+            pending = len(self._pending)
+            active = self._active
+            counters = dict(self.counters)
+        return {
+            'address': f"http://{self.host}:{self.port}",
+            'pid': os.getpid(),
+            'started_at': self.started_at,
+            'uptime_s': round(uptime, 1),
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'queue_depth': pending,
+            'in_progress': active - pending,
+            **{key: value for key, value in counters.items() if key != 'busy_s'},
+            'utilization': round(counters['busy_s'] / (uptime * self.workers), 3) if uptime else 0.0,
+        }
+
+    def parse_params(self, query: str) -> dict:
+        """쿼리 문자열(name, mode, color_mode, quality, target_mb, max_mb)을 작업 설정으로 변환 (잘못된 값은 ValueError)"""
+        values = {key: items[-1] for key, items in parse_qs(query).items()}
+        name = values.get('name') or IN_MEMORY_NAME
+        # 이름은 응답 헤더(Content-Disposition)에 들어가므로 줄바꿈 등 제어 문자는 거절
+        if any(ord(char) < 32 or ord(char) == 127 for char in name):
+            raise ValueError("name에 제어 문자를 쓸 수 없습니다")
+        params = {
+            'name': Path(name).name or IN_MEMORY_NAME,
+            'batch_size': self.processor_options.get('batch_size'),
+            'compress_mode': values.get('mode') or self.processor_options.get('compress_mode'),
+            'target_mb': self.processor_options.get('target_mb'),
+            'max_output_mb': self.processor_options.get('max_output_mb'),
+            'max_output_files': self.processor_options.get('max_output_files'),
+            'color_mode': values.get('color_mode') or self.processor_options.get('color_mode'),
+            'near_duplicates': self.processor_options.get('near_duplicates', False),
+            'quality': None,
+            'max_mb': None,
+        }
+        if params['compress_mode'] not in (None, 'raster', 'hybrid', 'images'):
+            raise ValueError("mode는 raster, hybrid, images 중 하나여야 합니다")
+        if params['color_mode'] not in (None, *COLOR_MODE_CHOICES):
+            raise ValueError(f"color_mode는 {', '.join(COLOR_MODE_CHOICES)} 중 하나여야 합니다")
+        for key, cast in (('quality', int), ('target_mb', float), ('max_mb', float)):
+            if key not in values:
+                continue
+            try:
+                value = cast(values[key])
+            except ValueError:
+                raise ValueError(f"{key} 값이 올바르지 않습니다: {values[key]}") from None
+            if value <= 0 or (key == 'quality' and value > 100):
+                raise ValueError(f"{key} 값이 범위를 벗어났습니다: {values[key]}")
+            params[key] = value
+        if params['target_mb'] and params['compress_mode'] == 'images':
+            raise ValueError("target_mb는 raster/hybrid 모드에서만 쓸 수 있습니다")
+        return params
+
+    def run(self) -> None:
+        """Ctrl+C로 중단할 때까지 요청을 처리"""
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._started = time.monotonic()
+        self._pool = [_ServiceWorker(self.request_memory_mb) for _ in range(self.workers)]
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+        handler = type('ServiceRequestHandler', (_ServiceRequestHandler,), {'service': self})
+        server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = server.server_address[1]
+
+        # 서비스 관리자가 보내는 SIGTERM도 Ctrl+C와 같이 정상 종료
+        def stop(signum, frame):
+            raise KeyboardInterrupt
+        signal.signal(signal.SIGTERM, stop)
+
+        print(f"\n[SERVE] http://{self.host}:{self.port} 에서 요청을 받습니다 "
+              f"({self.workers}개 워커, 대기열 {self.queue_size}개)")
+        print(f"  작업: {', '.join('POST /' + operation for operation in SERVICE_OPERATIONS)}, "
+              f"GET /status")
+        print("  종료하려면 Ctrl+C를 누르세요.")
+
+        try:
+            server.serve_forever(poll_interval=0.5)
+        finally:
+            print(f"\n[SERVE] 종료 중...")
+            server.server_close()
+            self._stopping = True
+            with self._lock:
+                self._wake_writer.send(None)
+            self._dispatcher.join()
+            for worker in self._pool:
+                worker.stop(kill=worker.job is not None)
+            print(f"  처리: {self.counters['succeeded']}건, 실패: {self.counters['failed']}건, "
+                  f"거절: {self.counters['rejected']}건")
+
+
+def _content_disposition(filename: str) -> str:
+    """
+    첨부 파일 Content-Disposition 값 (헤더에 그대로 쓸 수 있는 ASCII 문자열)
+
+    ASCII가 아니거나 따옴표/역슬래시인 문자는 filename에서 '_'로 바꾸고, 원래 이름은
+    RFC 5987 형식(filename*=UTF-8''...)으로 함께 보냅니다. 이를 지원하는 클라이언트는
+    filename*를 씁니다.
+    """
+    fallback = ''.join(char if 32 <= ord(char) < 127 and char not in '"\\' else '_'
+                       for char in filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+class _ServiceRequestHandler(BaseHTTPRequestHandler):
+    """ProcessingService의 HTTP 요청 처리 (결과는 청크 단위로 바로 전송)"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'auto-pdf/2.0'
+    service = None  # ProcessingService.run에서 설정
+
+    # 작업별 응답 Content-Type
+    CONTENT_TYPES = {
+        'analyze': 'application/json; charset=utf-8',
+        'extract-text': 'text/plain; charset=utf-8',
+        'split': 'multipart/mixed; boundary={boundary}',
+        'compress': 'application/pdf',
+    }
+    BOUNDARY = 'auto-pdf-part'
+
+    def log_message(self, format, *args):
+        pass  # 요청 결과는 _log에서 한 줄로 출력
+
+    def _log(self, status: int, started: float, detail: str = '') -> None:
+        print(f"  [HTTP] {self.command} {self.path} {status} "
+              f"({time.perf_counter() - started:.2f}초){' - ' + detail if detail else ''}")
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', self.CONTENT_TYPES['analyze'])
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, started: float,
+                    headers: Optional[dict] = None) -> None:
+        self._send_json(status, {'error': message}, headers)
+        self._log(status, started, message)
+
+    def _write_chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.flush()
+
+    def do_GET(self):
+        started = time.perf_counter()
+        if urlsplit(self.path).path.rstrip('/') == '/status':
+            self._send_json(200, self.service.status())
+        else:
+            self._send_error(404, "알 수 없는 경로입니다", started)
+
+    def do_POST(self):
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        operation = url.path.strip('/')
+        if operation not in SERVICE_OPERATIONS:
+            self.close_connection = True
+            self._send_error(404, f"알 수 없는 작업입니다 (가능: {', '.join(SERVICE_OPERATIONS)})",
+                             started)
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self.close_connection = True
+            self._send_error(411, "Content-Length가 필요합니다", started)
+            return
+        if length > self.service.max_upload_bytes:
+            self.close_connection = True
+            self._send_error(413, f"업로드 한도({self.service.max_upload_bytes // (1024 * 1024)}MB)를 "
+                                  f"넘었습니다", started)
+            return
+
+        try:
+            params = self.service.parse_params(url.query)
+        except ValueError as e:
+            self.close_connection = True
+            self._send_error(400, str(e), started)
+            return
+
+        pdf_bytes = self.rfile.read(length)
+        job = self.service.submit(operation, pdf_bytes, params)
+        if job is None:
+            self._send_error(503, "처리 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요", started,
+                             {'Retry-After': '5'})
+            return
+
+        try:
+            self._stream(job, operation, started)
+        except (BrokenPipeError, ConnectionResetError):
+            job.cancel()
+            self.close_connection = True
+            self._log(499, started, "클라이언트가 연결을 끊었습니다")
+        except BaseException:
+            # 응답을 쓰다 실패하면 워커가 결과를 받을 곳 없는 작업을 계속하지 않도록 취소
+            job.cancel()
+            self.close_connection = True
+            raise
+
+    def _stream(self, job: _ServiceJob, operation: str, started: float) -> None:
+        """워커가 보내는 결과를 받는 대로 응답에 씀 (첫 결과가 나올 때 헤더 전송)"""
+        headers_sent = False
+        parts = 0
+
+        while True:
+            kind, payload = job.messages.get()
+
+            if kind == 'error':
+                status, message = payload
+                if not headers_sent:
+                    self._send_error(status, message, started)
+                else:
+                    # 이미 200을 보냈으므로 마지막 청크 없이 연결을 끊어 불완전한 응답임을 알림
+                    self.close_connection = True
+                    self._log(status, started, message)
+                return
+
+            if kind == 'json':
+                self._send_json(200, payload)
+                headers_sent = True
+                continue
+
+            if kind == 'file':
+                self.send_response(200)
+                self.send_header('Content-Type', self.CONTENT_TYPES[operation])
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.send_header('Content-Disposition', _content_disposition(payload))
+                self.end_headers()
+                headers_sent = True
+                continue
+
+            if not headers_sent and kind in ('chunk', 'part', 'done'):
+                self.send_response(200)
+                self.send_header('Content-Type',
+                                 self.CONTENT_TYPES[operation].format(boundary=self.BOUNDARY))
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                headers_sent = True
+
+            if kind == 'chunk':
+                self._write_chunk(payload)
+            elif kind == 'part':
+                name, data = payload
+                parts += 1
+                self._write_chunk(f"--{self.BOUNDARY}\r\nContent-Type: application/pdf\r\n"
+                                  f"Content-Disposition: {_content_disposition(name)}\r\n"
+                                  f"Content-Length: {len(data)}\r\n\r\n".encode('ascii')
+                                  + data + b"\r\n")
+            elif kind == 'done':
+                if operation == 'split':
+                    self._write_chunk(f"--{self.BOUNDARY}--\r\n".encode('ascii'))
+                if operation in ('extract-text', 'split', 'compress'):
+                    self.wfile.write(b"0\r\n\r\n")
+                self._log(200, started, f"분할 파일 {parts}개" if operation == 'split' else '')
+                return
+
+
 def main():
     print("=" * 60)
     print("           자동 PDF 처리 도구 v2.0")
@@ -336,6 +2801,12 @@ def main():
   python auto-pdf.py ./pdfs                # 폴더 내 모든 PDF 처리
   python auto-pdf.py .                     # 현재 폴더의 모든 PDF 처리
   python auto-pdf.py file.pdf --output ./output  # 출력 폴더 지정
+  python auto-pdf.py ./pdfs -y --jobs 0    # 폴더 내 PDF를 병렬 처리 (프로세스 수 자동)
+  python auto-pdf.py file.pdf --analyze-only     # 페이지 구성만 빠르게 분석
+  python auto-pdf.py file.pdf --plan       # 전략별 예상 시간/크기만 출력 (처리 안 함)
+  python auto-pdf.py --watch ./inbox -y    # 폴더를 계속 감시하며 들어오는 PDF 처리
+  python auto-pdf.py file.pdf --incremental  # 수정된 파일은 바뀐 페이지의 결과만 다시 생성
+  python auto-pdf.py --serve 8765 --jobs 4 # 로컬 HTTP 서비스로 실행
         """
     )
 
@@ -345,8 +2816,132 @@ def main():
                         help='출력 폴더 지정 (기본값: ./processed)')
     parser.add_argument('--yes', '-y', action='store_true',
                         help='모든 확인 질문에 자동으로 예')
+    parser.add_argument('--compress-mode', choices=['raster', 'hybrid', 'images'],
+                        default=AutoPDFProcessor.COMPRESS_MODE,
+                        help='raster: 모든 페이지 래스터화, hybrid: 이미지 페이지만 래스터화, '
+                             'images: 내장 이미지만 재압축 '
+                             f'(기본값: {AutoPDFProcessor.COMPRESS_MODE})')
+    parser.add_argument('--color-mode', choices=COLOR_MODE_CHOICES, default='auto',
+                        help='래스터화한 페이지의 인코딩 형식. auto: 페이지마다 흑백(1비트)/회색조/컬러 판정, '
+                             'gray: 모두 회색조 JPEG, color: 모두 컬러 JPEG (기본값: auto)')
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help='스캔 잡음 정도만 다른 페이지도 같은 렌더링 구간 안에 있으면 이미지를 공유 '
+                             '(원본 해상도로 확인, 기본값: 픽셀이 완전히 같은 페이지만 공유)')
+    parser.add_argument('--target-mb', type=float, metavar='MB',
+                        help='압축 결과가 MB 안에 들도록 품질/DPI를 샘플 페이지로 예측해 자동 선택 '
+                             '(raster/hybrid 모드)')
+    parser.add_argument('--batch-size', type=int, metavar='N',
+                        help=f'압축 시 한 번에 렌더링할 페이지 수 '
+                             f'(기본값: {AutoPDFProcessor.COMPRESS_BATCH_SIZE})')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help='분할/압축/텍스트 추출에 사용할 프로세스 수 (기본값: 1)')
+    parser.add_argument('--backend', choices=['auto'] + list(BACKENDS), default='auto',
+                        help='렌더링/텍스트 추출에 사용할 PDF 엔진 (기본값: auto, '
+                             'pdf-processor.py --calibrate로 측정한 권장 엔진, 측정 전에는 pypdf2)')
+    parser.add_argument('--jobs', type=int, metavar='N',
+                        help='여러 파일을 N개씩 병렬 처리 (0이면 CPU 수와 메모리로 자동 결정)')
+    parser.add_argument('--memory-budget', type=float, metavar='MB',
+                        help='병렬 처리 시 사용할 메모리 예산 (기본값: 물리 메모리의 절반)')
+    parser.add_argument('--summary', type=str, metavar='FILE',
+                        help='병렬 처리 요약 JSON 경로 (기본값: 출력 폴더/batch_summary.json)')
+    parser.add_argument('--analyze-only', action='store_true',
+                        help='처리하지 않고 페이지 샘플 분석 결과만 출력')
+    parser.add_argument('--plan', action='store_true',
+                        help='처리하지 않고 전략별 예상 처리 시간/출력 크기와 선택될 전략만 출력')
+    parser.add_argument('--max-output-mb', type=float, metavar='MB',
+                        help=f'출력 파일 하나의 최대 크기, 이 조건을 만족하는 가장 빠른 전략을 선택 '
+                             f'(기본값: {AutoPDFProcessor.MAX_OUTPUT_MB}MB)')
+    parser.add_argument('--max-files', type=int, metavar='N',
+                        help='파일 하나에서 만들 최대 출력 파일 수 (기본값: 제한 없음)')
+    parser.add_argument('--watch', type=str, metavar='DIR',
+                        help='DIR 폴더를 계속 감시하며 새로 들어오거나 바뀐 PDF를 처리 (Ctrl+C로 종료)')
+    parser.add_argument('--poll-interval', type=float, default=2.0, metavar='SEC',
+                        help='감시 모드에서 폴더를 확인하는 간격 (기본값: 2초)')
+    parser.add_argument('--retries', type=int, default=2, metavar='N',
+                        help='감시 모드에서 실패한 파일을 다시 시도할 횟수 (기본값: 2)')
+    parser.add_argument('--serve', type=str, metavar='[HOST:]PORT',
+                        help='로컬 HTTP 서비스로 실행 (POST /analyze, /extract-text, /split, /compress; '
+                             '워커 수는 --jobs, 기본 HOST는 127.0.0.1)')
+    parser.add_argument('--queue-size', type=int, metavar='N',
+                        help='서비스 모드에서 워커를 기다릴 수 있는 요청 수, 넘으면 503 (기본값: 워커 수의 2배)')
+    parser.add_argument('--max-upload-mb', type=float, default=200, metavar='MB',
+                        help='서비스 모드의 요청당 최대 업로드 크기 (기본값: 200MB)')
+    parser.add_argument('--request-timeout', type=float, default=300, metavar='SEC',
+                        help='서비스 모드의 요청당 시간 한도, 대기 시간 포함 (기본값: 300초)')
+    parser.add_argument('--request-memory-mb', type=float, metavar='MB',
+                        help='서비스 모드의 요청당 추가 메모리 한도 (Linux/macOS)')
+    parser.add_argument('--profile', action='store_true',
+                        help='단계별 소요 시간/메모리를 측정하여 파일마다 표로 출력')
+    parser.add_argument('--report', type=str, metavar='FILE',
+                        help='단계별/페이지별 측정 결과를 JSON 리포트로 저장 (--profile 포함)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='이전 처리 결과 캐시를 사용하지 않고 항상 다시 처리')
+    parser.add_argument('--cache-max-age', type=float, metavar='DAYS',
+                        help='DAYS일 이상 사용되지 않은 캐시 항목과 그 출력 파일 정리')
+    parser.add_argument('--cache-max-mb', type=float, metavar='MB',
+                        help='캐시된 출력 파일 합계가 MB를 넘으면 오래된 항목부터 정리')
+    parser.add_argument('--cache-delete-outputs', action='store_true',
+                        help='캐시를 정리할 때 정리된 항목의 출력 파일도 삭제 '
+                             '(기본값: 캐시 기록만 지우고 출력 파일은 남김)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='페이지 지문을 기록해 두고, 파일이 바뀌면 바뀐 페이지가 든 출력만 다시 생성 '
+                             '(바뀌지 않은 분할 파일, 텍스트 페이지, 압축 페이지는 이전 결과 재사용)')
 
     args = parser.parse_args()
+    try:
+        backend = select_backend(args.backend)
+    except ValueError as e:
+        print(f"[WARNING] {e}")
+        sys.exit(1)
+    print(f"[INFO] PDF 엔진: {backend}")
+    if args.target_mb and args.compress_mode == 'images':
+        print("[WARNING] --target-mb는 raster/hybrid 압축 모드에서만 쓸 수 있습니다")
+        sys.exit(1)
+    processor_options = {
+        'batch_size': args.batch_size,
+        'workers': args.workers,
+        'compress_mode': args.compress_mode,
+        'color_mode': args.color_mode,
+        'near_duplicates': args.near_duplicates,
+        'target_mb': args.target_mb,
+        'max_output_mb': args.max_output_mb,
+        'max_output_files': args.max_files,
+        'incremental': args.incremental,
+    }
+    cache_options = None if args.no_cache else {
+        'max_age_days': args.cache_max_age,
+        'max_size_mb': args.cache_max_mb,
+        'delete_outputs': args.cache_delete_outputs,
+    }
+    profile = args.profile or bool(args.report)
+
+    # 폴더 감시 모드
+    if args.watch:
+        watch_dir = Path(args.watch)
+        if not watch_dir.is_dir():
+            print(f"[WARNING] 유효하지 않은 폴더입니다: {watch_dir}")
+            sys.exit(1)
+        try:
+            watcher = FolderWatcher(watch_dir, args.output, args.jobs or 0, processor_options,
+                                    cache_options, poll_interval=args.poll_interval,
+                                    settle_seconds=args.poll_interval, max_retries=args.retries)
+        except ValueError as e:
+            print(f"[WARNING] {e}")
+            sys.exit(1)
+        watcher.run()
+        return
+
+    # HTTP 서비스 모드
+    if args.serve:
+        host, _, port = args.serve.rpartition(':')
+        if not port.isdigit():
+            print(f"[WARNING] 유효하지 않은 포트입니다: {args.serve}")
+            sys.exit(1)
+        service = ProcessingService(host or '127.0.0.1', int(port), args.jobs or 0,
+                                    args.queue_size, args.max_upload_mb, args.request_timeout,
+                                    args.request_memory_mb, processor_options)
+        service.run()
+        return
 
     # PDF 파일 찾기
     input_path = Path(args.path)
@@ -356,6 +2951,26 @@ def main():
         print("\n처리할 PDF 파일이 없습니다.")
         sys.exit(0)
 
+    # 분석만 수행
+    if args.analyze_only:
+        for pdf_file in pdf_files:
+            processor = AutoPDFProcessor(str(pdf_file), args.output)
+            try:
+                print_page_profile(pdf_file, processor.prescan())
+            finally:
+                processor.close()
+        return
+
+    # 전략 계획만 출력 (dry run)
+    if args.plan:
+        for pdf_file in pdf_files:
+            processor = AutoPDFProcessor(str(pdf_file), args.output, **processor_options)
+            try:
+                processor.recommend_strategy(processor.analyze(), full=True)
+            finally:
+                processor.close()
+        return
+
     # 사용자 확인
     if not args.yes and len(pdf_files) > 1:
         response = input(f"\n{len(pdf_files)}개의 파일을 처리하시겠습니까? (y/n): ")
@@ -363,8 +2978,38 @@ def main():
             print("취소되었습니다.")
             sys.exit(0)
 
+    # 병렬 배치 처리
+    if args.jobs is not None and len(pdf_files) > 1:
+        summary = run_batch(pdf_files, args.output, args.jobs, args.memory_budget,
+                            processor_options, cache_options, profile)
+
+        if args.summary:
+            summary_file = Path(args.summary)
+        else:
+            summary_dir = Path(args.output) if args.output else pdf_files[0].parent / "processed"
+            summary_dir.mkdir(parents=True, exist_ok=True)
+            summary_file = summary_dir / "batch_summary.json"
+
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        print(f"\n\n{'='*60}")
+        print("전체 작업 완료!")
+        print(f"{'='*60}")
+        print(f"처리된 PDF: {summary['succeeded']}개 (실패: {summary['failed']}개)")
+        print(f"소요 시간: {summary['duration_s']:.1f}초")
+        print(f"절약된 용량: {summary['bytes_saved'] / (1024 * 1024):.1f}MB")
+        print(f"\n[INFO] 요약 파일: {summary_file.absolute()}")
+
+        if args.report:
+            write_run_report(Path(args.report), 'auto-pdf',
+                             [result['profile'] for result in summary['files'] if result['profile']])
+            print(f"[INFO] 실행 리포트: {Path(args.report).absolute()}")
+        return
+
     # 각 파일 처리
     total_results = []
+    profile_runs = []
     for i, pdf_file in enumerate(pdf_files, 1):
         if len(pdf_files) > 1:
             print(f"\n\n{'#'*60}")
@@ -372,13 +3017,21 @@ def main():
             print(f"{'#'*60}")
 
         try:
+            profiler = RunProfiler(enabled=profile)
             processor = AutoPDFProcessor(
                 str(pdf_file),
-                args.output
+                args.output,
+                cache=_make_cache(pdf_file, args.output, cache_options),
+                profiler=profiler,
+                **processor_options
             )
             results = processor.process()
             total_results.extend(results)
 
+            if profile:
+                profile_runs.append(_profile_record(profiler, pdf_file, processor, results))
+                print_run_profile(profile_runs[-1])
+
         except Exception as e:
             print(f"\n오류 발생: {pdf_file.name}")
             print(f"  {e}")
@@ -401,6 +3054,10 @@ def main():
         print(f"   2. _text.txt 파일이 있으면 우선적으로 사용하세요 (가장 작음)")
         print(f"   3. 분할된 PDF는 순서대로 Claude에 업로드하세요")
 
+    if args.report:
+        write_run_report(Path(args.report), 'auto-pdf', profile_runs)
+        print(f"\n[INFO] 실행 리포트: {Path(args.report).absolute()}")
+
 
 if __name__ == '__main__':
     try:
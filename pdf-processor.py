@@ -6,18 +6,46 @@ PDF 처리 도구
 pip install PyPDF2 Pillow reportlab pdf2image
 """
 
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import multiprocessing
 import os
+import platform
+import random
+import shutil
 import sys
+import tempfile
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 
 try:
-    from PyPDF2 import PdfReader, PdfWriter
+    import PyPDF2
+    import PIL
     import PIL.Image
+    import PIL.ImageDraw
+    import reportlab
     from reportlab.pdfgen import canvas
     from reportlab.lib.pagesizes import letter
-    from pdf2image import convert_from_path
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    # 렌더링/인코딩, PDF 엔진, 분할·압축 계획 등 두 스크립트의 공통 코드 (같은 폴더의 pdf_common.py)
+    from pdf_common import (
+        BACKENDS, COLOR_MODE_CHOICES, COLOR_MODE_NAMES, IN_MEMORY_NAME, LAZY_RELEASE_PAGES,
+        _NO_PROFILER, _PART_BASE_BYTES, RunProfiler, _StreamingPDFWriter, _as_source,
+        available_backends, _backend, _classify_page, _close_worker_document,
+        _iter_encoded_pages, _iter_page_texts, _iter_part_bytes, _kept_pages_bytes,
+        _open_reader, _page_cost_index, _page_structure, _peak_rss_mb, _plan_size_split,
+        _plan_target_compression, print_run_profile, _recompress_embedded_images,
+        _release_parsed_objects, save_calibration, select_backend, _shared_resource_bytes,
+        _text_index, write_run_report, _write_text_index)
 except ImportError as e:
     print(f"필요한 패키지가 설치되어 있지 않습니다: {e}")
     print("다음 명령어로 설치하세요:")
@@ -26,168 +54,818 @@ except ImportError as e:
 
 
 class PDFProcessor:
-    """PDF 파일 처리 클래스"""
+    """
+    PDF 파일 처리 클래스
 
-    def __init__(self, input_file: str):
-        self.input_file = Path(input_file)
-        if not self.input_file.exists():
-            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_file}")
+    입력은 파일 경로, PDF 바이트 또는 바이너리 파일 객체를 받습니다. iter_split_by_pages,
+    iter_split_by_size, compress_images_bytes, extract_text_bytes는 결과를 디스크에 쓰지
+    않고 메모리로 돌려주며, 경로를 받는 메서드들은 이를 파일에 기록하는 얇은 래퍼입니다.
+    """
 
-        self.reader = PdfReader(str(self.input_file))
-        self.total_pages = len(self.reader.pages)
-        print(f"PDF 로드 완료: {self.input_file.name}")
+    def __init__(self, input_file: Union[str, Path, bytes, BinaryIO],
+                 profiler: Optional[RunProfiler] = None, name: Optional[str] = None):
+        self.source = _as_source(input_file)
+        if isinstance(self.source, str):
+            self.input_file = Path(self.source)
+            if not self.input_file.exists():
+                raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_file}")
+            self.input_size = self.input_file.stat().st_size
+            self.name = self.input_file.name
+        else:
+            self.input_file = None
+            self.input_size = len(self.source)
+            self.name = name or IN_MEMORY_NAME
+        self.stem = Path(self.name).stem
+
+        self.profiler = profiler or _NO_PROFILER
+        with self.profiler.stage('parse', bytes_in=self.input_size):
+            self.reader = _open_reader(self.source)
+            self.total_pages = len(self.reader.pages)
+        print(f"PDF 로드 완료: {self.name}")
         print(f"총 페이지 수: {self.total_pages}")
 
-    def split_by_pages(self, pages_per_file: int = 10, output_dir: Optional[str] = None) -> List[Path]:
+    def close(self) -> None:
+        """입력 리더의 스트림을 닫음 (메모리 매핑한 입력이면 매핑 해제)"""
+        self.reader.stream.close()
+
+    def _output_path(self, suffix: str) -> Path:
+        """기본 출력 경로 (원본 파일 디렉토리, 메모리 입력이면 현재 디렉토리)"""
+        parent = self.input_file.parent if self.input_file is not None else Path.cwd()
+        return parent / f"{self.stem}{suffix}"
+
+    def split_by_pages(self, pages_per_file: int = 10, output_dir: Optional[str] = None,
+                       workers: int = 1) -> List[Path]:
         """
         PDF를 여러 개의 작은 PDF로 분할
 
         Args:
             pages_per_file: 파일당 페이지 수
             output_dir: 출력 디렉토리 (기본값: 원본 파일 디렉토리)
+            workers: 분할 파일을 동시에 만들 프로세스 수 (1이면 직렬 처리)
 
         Returns:
             생성된 파일 경로 리스트
         """
-        if output_dir is None:
-            output_dir = self.input_file.parent / f"{self.input_file.stem}_split"
-        else:
-            output_dir = Path(output_dir)
+        return self._write_parts(self.iter_split_by_pages(pages_per_file, workers), output_dir)
 
-        output_dir.mkdir(exist_ok=True)
+    def iter_split_by_pages(self, pages_per_file: int = 10, workers: int = 1) -> Iterator[Tuple[str, bytes]]:
+        """split_by_pages와 같지만 분할 파일을 (파일 이름, PDF 바이트)로 하나씩 돌려줌"""
+        page_ranges = [(start_page, min(start_page + pages_per_file, self.total_pages))
+                       for start_page in range(0, self.total_pages, pages_per_file)]
+        return self._iter_parts(page_ranges, workers=workers)
 
-        output_files = []
-        file_count = 0
+    def split_by_size(self, max_size_mb: float = 10, output_dir: Optional[str] = None,
+                      workers: int = 1) -> List[Path]:
+        """
+        PDF를 크기별로 분할
 
-        for start_page in range(0, self.total_pages, pages_per_file):
-            writer = PdfWriter()
-            end_page = min(start_page + pages_per_file, self.total_pages)
+        각 페이지가 실제로 참조하는 콘텐츠 스트림, 이미지, 폰트의 직렬화 크기를 측정한 뒤,
+        분할 파일 안에서 공유되는 객체는 한 번만 계산하여 연속된 페이지를 max_size_mb
+        이하로 묶습니다. 시험 저장이나 재분할 없이 한 번에 기록합니다.
 
-            for page_num in range(start_page, end_page):
-                writer.add_page(self.reader.pages[page_num])
+        Args:
+            max_size_mb: 파일당 최대 크기 (MB)
+            output_dir: 출력 디렉토리
+            workers: 분할 파일을 동시에 만들 프로세스 수 (1이면 직렬 처리)
 
-            file_count += 1
-            output_file = output_dir / f"{self.input_file.stem}_part{file_count:03d}.pdf"
+        Returns:
+            생성된 파일 경로 리스트
+        """
+        return self._write_parts(self.iter_split_by_size(max_size_mb, workers), output_dir)
 
-            with open(output_file, 'wb') as f:
-                writer.write(f)
+    def iter_split_by_size(self, max_size_mb: float = 10, workers: int = 1) -> Iterator[Tuple[str, bytes]]:
+        """split_by_size와 같지만 분할 파일을 (파일 이름, PDF 바이트)로 하나씩 돌려줌"""
+        print(f"파일 크기: {self.input_size / (1024 * 1024):.2f}MB")
+        print(f"페이지별 크기 분석 중...")
 
-            output_files.append(output_file)
-            print(f"생성됨: {output_file.name} (페이지 {start_page+1}-{end_page})")
+        with self.profiler.stage('plan'):
+            cost_index = _page_cost_index(self.reader)
+            plan = _plan_size_split(cost_index, int(max_size_mb * 1024 * 1024))
 
-        print(f"\n총 {len(output_files)}개 파일 생성 완료")
-        print(f"저장 위치: {output_dir}")
-        return output_files
+        print(f"예상 분할 파일 수: {len(plan)}")
 
-    def split_by_size(self, max_size_mb: float = 10, output_dir: Optional[str] = None) -> List[Path]:
-        """
-        PDF를 크기별로 분할 (근사치)
+        page_ranges = [(start, end) for start, end, _ in plan]
+        predicted_sizes = [predicted for _, _, predicted in plan]
+        shared_bytes = _shared_resource_bytes(cost_index, page_ranges)
+        if shared_bytes >= 1024:
+            print(f"여러 분할 파일에 함께 들어가는 공유 리소스(글꼴, 이미지 등): "
+                  f"{shared_bytes / 1024:.1f}KB")
+        return self._iter_parts(page_ranges, predicted_sizes, workers)
 
-        Args:
-            max_size_mb: 파일당 최대 크기 (MB)
-            output_dir: 출력 디렉토리
+    def _iter_parts(self, page_ranges: List[Tuple[int, int]],
+                    predicted_sizes: Optional[List[int]] = None,
+                    workers: int = 1) -> Iterator[Tuple[str, bytes]]:
+        """
+        페이지 구간 [start, end) 목록대로 분할 파일을 만들어 (파일 이름, PDF 바이트)로 돌려줌
 
-        Returns:
-            생성된 파일 경로 리스트
+        페이지 수 기준 분할은 현재 PDF 엔진으로 페이지를 복사하고, 크기 기준 분할은
+        예상 크기 모델이 PyPDF2 출력 기준이므로 항상 PyPDF2로 만듭니다. 모두 만든 뒤
+        분할 파일 합계가 원본의 몇 배인지 출력합니다.
         """
-        # 평균 페이지 크기 계산
-        total_size_mb = self.input_file.stat().st_size / (1024 * 1024)
-        avg_page_size = total_size_mb / self.total_pages
-        pages_per_file = max(1, int(max_size_mb / avg_page_size))
+        backend_name = _backend().name if predicted_sizes is None else 'pypdf2'
+        parts = _iter_part_bytes(self.reader, self.source, page_ranges, max(1, workers), backend_name)
+        total_bytes = 0
+        deduped_total = 0
+        for file_count, ((start_page, end_page), part) in enumerate(zip(page_ranges, parts), 1):
+            data, assemble_s, write_s, deduped = part
+            self.profiler.add('assemble', assemble_s)
+            self.profiler.add('write', write_s, bytes_out=len(data))
+            total_bytes += len(data)
+            deduped_total += deduped
+
+            part_name = f"{self.stem}_part{file_count:03d}.pdf"
+            if predicted_sizes is None:
+                print(f"생성됨: {part_name} (페이지 {start_page+1}-{end_page})")
+            else:
+                predicted_mb = predicted_sizes[file_count - 1] / (1024 * 1024)
+                actual_mb = len(data) / (1024 * 1024)
+                print(f"생성됨: {part_name} (페이지 {start_page+1}-{end_page}, "
+                      f"예상 {predicted_mb:.2f}MB / 실제 {actual_mb:.2f}MB)")
+            yield part_name, data
 
-        print(f"파일 크기: {total_size_mb:.2f}MB")
-        print(f"예상 페이지 수/파일: {pages_per_file}")
+        overhead = total_bytes / self.input_size if self.input_size else 0.0
+        print(f"\n분할 파일 합계: {total_bytes / (1024 * 1024):.2f}MB (원본 대비 {overhead:.2f}배)")
+        if deduped_total:
+            print(f"분할 파일 안의 중복 스트림 {deduped_total}개를 하나로 합쳤습니다")
+        self.profiler.metric('split_overhead', round(overhead, 4))
+
+    def _write_parts(self, parts: Iterable[Tuple[str, bytes]],
+                     output_dir: Optional[str] = None) -> List[Path]:
+        """분할 파일들을 output_dir에 기록 (분할 파일을 만드는 시간은 _iter_parts가 'write' 단계에 한 번만 기록)"""
+        if output_dir is None:
+            output_dir = self._output_path('_split')
+        else:
+            output_dir = Path(output_dir)
+
+        output_dir.mkdir(exist_ok=True)
+
+        output_files = []
+        for part_name, data in parts:
+            output_file = output_dir / part_name
+            output_file.write_bytes(data)
+            output_files.append(output_file)
 
-        return self.split_by_pages(pages_per_file, output_dir)
+        print(f"\n총 {len(output_files)}개 파일 생성 완료")
+        print(f"저장 위치: {output_dir}")
+        return output_files
 
-    def compress_images(self, quality: int = 50, output_file: Optional[str] = None) -> Path:
+    def compress_images(self, quality: int = 50, output_file: Optional[str] = None,
+                        batch_size: int = 10, workers: int = 1, mode: str = 'raster',
+                        target_dpi: int = 150, codec: str = 'jpeg',
+                        target_mb: Optional[float] = None, color_mode: str = 'auto',
+                        near_duplicates: bool = False) -> Path:
         """
         PDF 내 이미지를 압축하여 파일 크기 줄이기
 
+        페이지를 batch_size 단위로 나누어 렌더링하고, 각 페이지를 메모리에서
+        JPEG로 인코딩한 뒤 바로 해제하므로 페이지 수와 관계없이 메모리 사용량이
+        거의 일정하게 유지됩니다. workers가 2 이상이면 구간들을 여러 프로세스에서
+        병렬로 렌더링/인코딩하며, 결과는 직렬 처리와 동일합니다.
+
+        mode가 'hybrid'이면 이미지 중심 페이지만 래스터화하고, 텍스트/벡터 페이지는
+        원본 그대로 복사하여 하나의 PDF로 합칩니다. mode가 'images'이면 페이지를
+        렌더링하지 않고(poppler 불필요) 내장 이미지만 target_dpi로 축소/재인코딩합니다.
+
+        target_mb를 주면 샘플 페이지 몇 장으로 품질/DPI별 크기 모델을 만들어, 결과가
+        target_mb 안에 드는 가장 좋은 품질/DPI를 고른 뒤 한 번만 압축합니다 (quality는 무시).
+
         Args:
             quality: 이미지 품질 (1-100, 낮을수록 작은 파일)
             output_file: 출력 파일 경로
+            batch_size: 한 번에 렌더링할 페이지 수
+            workers: 병렬 처리 프로세스 수 (1이면 직렬 처리)
+            mode: 'raster' (모든 페이지 래스터화), 'hybrid' (이미지 페이지만 래스터화)
+                  또는 'images' (내장 이미지만 재압축)
+            target_dpi: 'images' 모드에서 이미지를 축소할 목표 유효 DPI
+            codec: 'images' 모드의 재인코딩 방식 ('jpeg' 또는 'flate')
+            target_mb: 'raster'/'hybrid' 모드의 목표 파일 크기 (MB, 'images' 모드에 주면 ValueError)
+            color_mode: 래스터 페이지 인코딩 ('auto'는 페이지마다 흑백/회색조/컬러 판정,
+                        'gray'/'color'는 모든 페이지를 그 형식으로)
+            near_duplicates: 스캔 잡음 정도만 다른 페이지도 이미지를 공유 (기본값은 픽셀이
+                             완전히 같은 페이지만)
 
         Returns:
             생성된 파일 경로
         """
         if output_file is None:
-            output_file = self.input_file.parent / f"{self.input_file.stem}_compressed.pdf"
+            output_file = self._output_path('_compressed.pdf')
         else:
             output_file = Path(output_file)
 
+        # 페이지가 준비되는 대로 파일에 바로 씀 (실패하면 덜 쓴 파일은 지움)
+        try:
+            with open(output_file, 'wb') as f:
+                self._compress_images_to(f, quality, batch_size, workers, mode, target_dpi,
+                                         codec, target_mb, color_mode, near_duplicates)
+        except BaseException:
+            output_file.unlink(missing_ok=True)
+            raise
+        print(f"저장 위치: {output_file}")
+
+        return output_file
+
+    def compress_images_bytes(self, quality: int = 50, batch_size: int = 10, workers: int = 1,
+                              mode: str = 'raster', target_dpi: int = 150, codec: str = 'jpeg',
+                              target_mb: Optional[float] = None, color_mode: str = 'auto',
+                              near_duplicates: bool = False) -> bytes:
+        """compress_images와 같지만 압축한 PDF를 파일 대신 바이트로 돌려줌"""
+        buffer = io.BytesIO()
+        self._compress_images_to(buffer, quality, batch_size, workers, mode, target_dpi,
+                                 codec, target_mb, color_mode, near_duplicates)
+        return buffer.getvalue()
+
+    def _compress_images_to(self, output: BinaryIO, quality: int, batch_size: int, workers: int,
+                            mode: str, target_dpi: int, codec: str,
+                            target_mb: Optional[float], color_mode: str = 'auto',
+                            near_duplicates: bool = False) -> int:
+        """
+        압축한 PDF를 output에 씀 (write()만 있으면 되는 스트림도 가능). 쓴 바이트 수를 반환
+
+        'raster'/'hybrid' 모드는 페이지가 인코딩되는 대로 출력에 바로 쓰므로, 페이지 수와
+        관계없이 메모리에는 렌더링 구간 하나만 남습니다.
+        """
+        batch_size = max(1, batch_size)
+        workers = max(1, workers)
+
+        if mode == 'images':
+            if target_mb:
+                raise ValueError("target_mb는 'raster'/'hybrid' 모드에서만 쓸 수 있습니다 "
+                                 "('images' 모드는 target_dpi로 크기를 조절하세요)")
+            data = self._recompress_images(quality, workers, target_dpi, codec)
+            with self.profiler.stage('write') as record:
+                output.write(data)
+                record['bytes_out'] = len(data)
+            return len(data)
+
+        if mode == 'hybrid':
+            with self.profiler.stage('classify'):
+                raster_pages = [page_num for page_num, page in enumerate(self.reader.pages, 1)
+                                if _classify_page(_page_structure(page)) in ('image', 'mixed')]
+            print(f"이미지 중심 페이지: {len(raster_pages)}/{self.total_pages} "
+                  f"(나머지는 원본 그대로 유지)")
+        else:
+            raster_pages = list(range(1, self.total_pages + 1))
+
+        raster_set = set(raster_pages)
+        dpi = 150
+
+        if target_mb and raster_pages:
+            print(f"목표 크기 {target_mb}MB에 맞는 품질/DPI 예측 중...")
+            with self.profiler.stage('target'):
+                kept_pages = [page_num - 1 for page_num in range(1, self.total_pages + 1)
+                              if page_num not in raster_set]
+                kept_bytes = (_kept_pages_bytes(_page_cost_index(self.reader), kept_pages)
+                              if kept_pages else _PART_BASE_BYTES)
+                plan = _plan_target_compression(self.source, raster_pages, kept_bytes,
+                                                int(target_mb * 1024 * 1024), workers, color_mode)
+            quality, dpi = plan['quality'], plan['dpi']
+            print(f"선택: 품질 {quality}, {dpi}DPI (예상 {plan['predicted_bytes'] / (1024 * 1024):.2f}MB, "
+                  f"샘플 {len(plan['sampled_pages'])}페이지, {plan['elapsed_s']:.1f}초)")
+            if not plan['fits']:
+                print(f"경고: 어떤 설정으로도 {target_mb}MB 안에 들지 않을 것으로 예상되어 "
+                      f"가장 작은 설정을 사용합니다.")
+
         print(f"PDF를 이미지로 변환 중... (시간이 걸릴 수 있습니다)")
+        print(f"렌더링 단위: {batch_size}페이지, 워커: {workers}개")
+
+        writer = _StreamingPDFWriter(output)
+
+        encoded_pages = _iter_encoded_pages(self.source, raster_pages, quality,
+                                            batch_size, workers, dpi, self.profiler, color_mode,
+                                            near_duplicates)
+
+        for page_num in range(1, self.total_pages + 1):
+            if page_num in raster_set:
+                _, image_bytes = next(encoded_pages)
+                with self.profiler.stage('assemble', bytes_in=len(image_bytes)):
+                    page_mode = writer.add_raster(image_bytes, self.reader.pages[page_num - 1])
+                print(f"페이지 {page_num}/{self.total_pages} 압축 완료 "
+                      f"({COLOR_MODE_NAMES[page_mode]}, {len(image_bytes) / 1024:.0f}KB)")
+            else:
+                with self.profiler.stage('assemble'):
+                    writer.add_page(self.reader.pages[page_num - 1], prune=True)
+                print(f"페이지 {page_num}/{self.total_pages} 원본 유지")
+            if page_num % LAZY_RELEASE_PAGES == 0:
+                _release_parsed_objects(self.reader)
 
-        # PDF를 이미지로 변환
-        images = convert_from_path(str(self.input_file), dpi=150)
-
-        # 새 PDF 생성
-        temp_images = []
-        for i, image in enumerate(images):
-            temp_path = output_file.parent / f"temp_page_{i}.jpg"
-            image.save(str(temp_path), 'JPEG', quality=quality, optimize=True)
-            temp_images.append(temp_path)
-            print(f"페이지 {i+1}/{len(images)} 압축 완료")
-
-        # 이미지를 PDF로 결합
-        if temp_images:
-            first_image = PIL.Image.open(temp_images[0])
-            first_image.save(
-                str(output_file),
-                'PDF',
-                resolution=100.0,
-                save_all=True,
-                append_images=[PIL.Image.open(img) for img in temp_images[1:]]
-            )
-
-        # 임시 파일 삭제
-        for temp_file in temp_images:
-            temp_file.unlink()
-
-        original_size = self.input_file.stat().st_size / (1024 * 1024)
-        compressed_size = output_file.stat().st_size / (1024 * 1024)
+        with self.profiler.stage('write') as record:
+            total_bytes = record['bytes_out'] = writer.close()
+
+        original_size = self.input_size / (1024 * 1024)
+        compressed_size = total_bytes / (1024 * 1024)
         reduction = ((original_size - compressed_size) / original_size) * 100
 
         print(f"\n압축 완료!")
         print(f"원본: {original_size:.2f}MB")
         print(f"압축: {compressed_size:.2f}MB")
         print(f"감소율: {reduction:.1f}%")
-        print(f"저장 위치: {output_file}")
+        if writer.duplicate_pages:
+            print(f"중복 페이지: {writer.duplicate_pages}개 "
+                  f"(래스터 페이지 {writer.raster_pages}개에 이미지 {writer.unique_images}개 사용, "
+                  f"중복률 {writer.duplicate_pages / writer.raster_pages:.1%})")
+        self.profiler.metric('dedup_ratio', round(writer.duplicate_pages / writer.raster_pages, 4)
+                             if writer.raster_pages else 0.0)
+        if writer.raster_pages:
+            print("색상 모드: " + ", ".join(
+                f"{COLOR_MODE_NAMES[mode]} {stats['pages']}페이지 ({stats['bytes'] / 1024:.0f}KB)"
+                for mode, stats in writer.color_modes.items()))
+            if 'color_mode_savings' in self.profiler.metrics:
+                print(f"색상 모드 절감: 모두 컬러 JPEG로 인코딩했을 때보다 "
+                      f"{self.profiler.metrics['color_mode_savings']:.1%} 작음")
+            self.profiler.metric('color_modes', {mode: stats['pages']
+                                                 for mode, stats in writer.color_modes.items()})
 
-        return output_file
+        return total_bytes
+
+    def _recompress_images(self, quality: int, workers: int, target_dpi: int, codec: str) -> bytes:
+        """내장 이미지 스트림만 재압축하고 나머지 객체는 그대로 복사"""
+        print(f"내장 이미지 재압축 중... (목표 {target_dpi}DPI, {codec}, 워커: {workers}개)")
+
+        # self.reader의 객체를 바꾸지 않도록 별도의 리더에서 스트림을 교체
+        with self.profiler.stage('parse', bytes_in=self.input_size):
+            reader = _open_reader(self.source)
+        with self.profiler.stage('recompress') as record:
+            report = _recompress_embedded_images(reader, target_dpi, quality, codec, workers)
+            record['bytes_out'] = sum(item['after_bytes'] for item in report)
+
+        for item in report:
+            width, height = item['size']
+            new_width, new_height = item['new_size']
+            print(f"페이지 {item['page']} {item['name']}: {width}x{height} -> "
+                  f"{new_width}x{new_height}, {item['before_bytes'] / 1024:.1f}KB -> "
+                  f"{item['after_bytes'] / 1024:.1f}KB ({item['action']})")
+
+        # 재압축한 이미지 스트림은 리더에만 있으므로 쓸 때까지 메모리에 남음 (출력 크기 정도)
+        buffer = io.BytesIO()
+        writer = _StreamingPDFWriter(buffer)
+        with self.profiler.stage('assemble'):
+            for page in reader.pages:
+                writer.add_page(page)
+        with self.profiler.stage('write') as record:
+            record['bytes_out'] = writer.close()
+        reader.stream.close()
+
+        before_bytes = sum(item['before_bytes'] for item in report)
+        after_bytes = sum(item['after_bytes'] for item in report)
+        original_size = self.input_size / (1024 * 1024)
+        compressed_size = buffer.tell() / (1024 * 1024)
+        reduction = ((original_size - compressed_size) / original_size) * 100
+
+        print(f"\n압축 완료!")
+        print(f"이미지: {len(report)}개, {before_bytes / 1024:.1f}KB -> {after_bytes / 1024:.1f}KB")
+        print(f"원본: {original_size:.2f}MB")
+        print(f"압축: {compressed_size:.2f}MB")
+        print(f"감소율: {reduction:.1f}%")
 
-    def extract_text(self, output_file: Optional[str] = None) -> Path:
+        return buffer.getvalue()
+
+    def extract_text(self, output_file: Optional[str] = None, workers: int = 1) -> Path:
         """
         PDF에서 텍스트만 추출하여 텍스트 파일로 저장
 
+        추출된 페이지는 순서대로 바로 파일에 기록되며, 각 페이지의 시작 바이트
+        위치를 담은 인덱스 파일(_text.idx.json)을 함께 생성합니다.
+
         Args:
             output_file: 출력 파일 경로
+            workers: 병렬 추출 프로세스 수 (1이면 직렬 처리)
 
         Returns:
             생성된 파일 경로
         """
         if output_file is None:
-            output_file = self.input_file.parent / f"{self.input_file.stem}_text.txt"
+            output_file = self._output_path('_text.txt')
         else:
             output_file = Path(output_file)
 
-        text_content = []
-
-        for page_num, page in enumerate(self.reader.pages):
-            text = page.extract_text()
-            text_content.append(f"=== 페이지 {page_num + 1} ===\n\n{text}\n\n")
-            print(f"페이지 {page_num + 1}/{self.total_pages} 추출 완료")
+        with open(output_file, 'wb') as f:
+            index = self._extract_text_to(f, workers)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(text_content))
+        index_file = output_file.with_name(f"{output_file.stem}.idx.json")
+        _write_text_index(index_file, index)
 
-        file_size = output_file.stat().st_size / 1024
-        print(f"\n텍스트 추출 완료!")
-        print(f"파일 크기: {file_size:.2f}KB")
+        print(f"파일 크기: {index['total_bytes'] / 1024:.2f}KB")
         print(f"저장 위치: {output_file}")
+        print(f"페이지 인덱스: {index_file}")
 
         return output_file
 
+    def extract_text_bytes(self, workers: int = 1) -> Tuple[bytes, dict]:
+        """extract_text와 같지만 (UTF-8 텍스트 바이트, 페이지 인덱스)를 메모리로 돌려줌"""
+        buffer = io.BytesIO()
+        index = self._extract_text_to(buffer, workers)
+        print(f"파일 크기: {index['total_bytes'] / 1024:.2f}KB")
+        return buffer.getvalue(), index
+
+    def _extract_text_to(self, stream: BinaryIO, workers: int) -> dict:
+        """페이지 텍스트를 순서대로 stream에 기록하고 페이지 인덱스를 돌려줌"""
+        offsets = []
+        position = 0
+
+        with self.profiler.stage('extract') as record:
+            page_texts = _iter_page_texts(self.reader, self.source, max(1, workers))
+            page_started = time.perf_counter()
+            for page_num, text in enumerate(page_texts):
+                if page_num > 0:
+                    position += stream.write(b'\n')
+                offsets.append(position)
+                written = stream.write(f"=== 페이지 {page_num + 1} ===\n\n{text}\n\n".encode('utf-8'))
+                position += written
+                print(f"페이지 {page_num + 1}/{self.total_pages} 추출 완료")
+                if self.profiler.enabled:
+                    now = time.perf_counter()
+                    self.profiler.page(page_num + 1, 'extract', now - page_started, written)
+                    page_started = now
+            record['bytes_out'] = position
+
+        print(f"\n텍스트 추출 완료!")
+        return _text_index(self.name, offsets, position)
+
+
+# 벤치마크 코퍼스 설정
+BENCHMARK_SEED = 20240501
+BENCHMARK_KINDS = ('text', 'scan', 'mixed', 'many_pages', 'huge_image', 'shared_fonts')
+BENCHMARK_SCALES = {'small': 1, 'medium': 4, 'large': 16}  # 기본 페이지 수(이미지는 면적)에 곱하는 배수
+_BENCHMARK_BASE_PAGES = {'text': 10, 'scan': 4, 'mixed': 8, 'many_pages': 100,
+                         'huge_image': 1, 'shared_fonts': 20}
+_BENCHMARK_CORPUS_VERSION = 1  # 생성 방식이 바뀌면 올려서 기존 코퍼스를 다시 생성
+_BENCHMARK_MIN_WALL_DELTA_S = 0.05  # 비교 시 이보다 작은 실행 시간 차이는 무시
+_BENCHMARK_WORDS = ('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing',
+                    'elit', 'sed', 'do', 'eiusmod', 'tempor', 'incididunt', 'labore', 'magna',
+                    'aliqua', 'veniam', 'quis', 'nostrud', 'exercitation', 'ullamco', 'nisi')
+_BENCHMARK_FONTS = ('Vera', 'VeraBd', 'VeraIt', 'VeraBI')  # reportlab에 포함된 TrueType 글꼴
+BENCHMARK_OPERATIONS = ('split_by_pages', 'split_by_size', 'compress_raster', 'compress_hybrid',
+                        'compress_images', 'extract_text', 'auto', 'auto:extract_text',
+                        'auto:compress', 'auto:extract_text_and_split', 'auto:compress_and_split',
+                        'auto:split_aggressive')
+
+
+def _benchmark_text_lines(rng: 'random.Random', count: int) -> List[str]:
+    return [' '.join(rng.choice(_BENCHMARK_WORDS) for _ in range(rng.randint(8, 14)))
+            for _ in range(count)]
+
+
+def _benchmark_photo(rng: 'random.Random', width: int, height: int) -> 'PIL.Image.Image':
+    """저해상도 난수를 확대해 사진처럼 부드러운 RGB 이미지 생성"""
+    small = (max(2, width // 16), max(2, height // 16))
+    noise = PIL.Image.frombytes('RGB', small, rng.randbytes(small[0] * small[1] * 3))
+    return noise.resize((width, height), PIL.Image.BICUBIC)
+
+
+def _benchmark_scan(rng: 'random.Random', width: int, height: int) -> 'PIL.Image.Image':
+    """종이 질감 위에 글줄이 있는 흑백 스캔 페이지 이미지 생성"""
+    small = (max(2, width // 4), max(2, height // 4))
+    grain = PIL.Image.frombytes('L', small, bytes(235 + b % 20 for b in rng.randbytes(small[0] * small[1])))
+    image = grain.resize((width, height), PIL.Image.BILINEAR)
+    draw = PIL.ImageDraw.Draw(image)
+    line_height = height // 50
+    for y in range(height // 12, height - height // 12, line_height):
+        x = width // 10
+        while x < width * 0.85:
+            word = rng.randint(width // 40, width // 12)
+            draw.rectangle((x, y, x + word, y + line_height // 2), fill=rng.randint(20, 70))
+            x += word + width // 80
+    return image
+
+
+def _draw_benchmark_text(pdf: 'canvas.Canvas', rng: 'random.Random', top: float, bottom: float,
+                         fonts: Tuple[str, ...] = ('Helvetica',)) -> None:
+    y = top
+    for line in _benchmark_text_lines(rng, int((top - bottom) // 14)):
+        pdf.setFont(rng.choice(fonts), 10)
+        pdf.drawString(54, y, line)
+        y -= 14
+
+
+def _generate_benchmark_pdf(path: Path, kind: str, scale: int, seed: int) -> int:
+    """종류별 합성 PDF 생성 (같은 시드면 바이트 단위로 동일). 페이지 수를 반환"""
+    rng = random.Random(f"{seed}:{kind}:{scale}")
+    width, height = letter
+    pages = _BENCHMARK_BASE_PAGES[kind] * (1 if kind == 'huge_image' else scale)
+    # invariant: 생성 시각/문서 ID를 고정하여 실행마다 같은 파일을 만듦
+    pdf = canvas.Canvas(str(path), pagesize=letter, invariant=1)
+
+    if kind == 'shared_fonts':
+        for font in _BENCHMARK_FONTS:
+            pdfmetrics.registerFont(TTFont(font, f"{font}.ttf"))
+
+    for page_num in range(pages):
+        if kind in ('text', 'many_pages'):
+            _draw_benchmark_text(pdf, rng, height - 72, 72)
+        elif kind == 'shared_fonts':
+            _draw_benchmark_text(pdf, rng, height - 72, 72, _BENCHMARK_FONTS)
+        elif kind == 'scan':
+            # 스캐너처럼 150DPI JPEG 한 장으로 페이지 전체를 채움
+            buffer = io.BytesIO()
+            _benchmark_scan(rng, 1275, 1650).save(buffer, 'JPEG', quality=85)
+            pdf.drawImage(ImageReader(buffer), 0, 0, width, height)
+        elif kind == 'mixed':
+            if page_num % 2:
+                pdf.drawImage(ImageReader(_benchmark_photo(rng, 900, 1200)), 72, 144,
+                              width - 144, height - 216)
+                _draw_benchmark_text(pdf, rng, 120, 72)
+            else:
+                _draw_benchmark_text(pdf, rng, height - 72, 72)
+        elif kind == 'huge_image':
+            side = int(2000 * scale ** 0.5)
+            pdf.drawImage(ImageReader(_benchmark_photo(rng, side, side)), 0, 0, width, height)
+        pdf.showPage()
+
+    pdf.save()
+    return pages
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generate_benchmark_corpus(corpus_dir: Path, scales: Iterable[str] = ('small',),
+                              kinds: Iterable[str] = BENCHMARK_KINDS,
+                              seed: int = BENCHMARK_SEED) -> List[dict]:
+    """
+    벤치마크용 합성 PDF 코퍼스 생성
+
+    같은 시드와 설정이면 항상 같은 파일이 만들어지므로, 이미 생성된 파일은
+    corpus.json에 기록된 해시가 맞으면 다시 만들지 않습니다.
+
+    Returns:
+        파일별 정보 (이름, 종류, 크기 단계, 경로, 페이지 수, 바이트, sha256)
+    """
+    corpus_dir = Path(corpus_dir)
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = corpus_dir / "corpus.json"
+    try:
+        with open(manifest_file, encoding='utf-8') as f:
+            previous = {entry['name']: entry for entry in json.load(f)['files']}
+    except (OSError, ValueError, KeyError):
+        previous = {}
+
+    corpus = []
+    for scale_name in scales:
+        for kind in kinds:
+            name = f"{kind}_{scale_name}.pdf"
+            path = corpus_dir / name
+            entry = previous.get(name)
+            if (entry and entry.get('seed') == seed
+                    and entry.get('version') == _BENCHMARK_CORPUS_VERSION
+                    and path.exists() and _sha256_file(path) == entry['sha256']):
+                corpus.append(entry)
+                continue
+
+            print(f"코퍼스 생성: {name}")
+            pages = _generate_benchmark_pdf(path, kind, BENCHMARK_SCALES[scale_name], seed)
+            corpus.append({'name': name, 'kind': kind, 'scale': scale_name, 'path': str(path),
+                           'pages': pages, 'bytes': path.stat().st_size,
+                           'sha256': _sha256_file(path), 'seed': seed,
+                           'version': _BENCHMARK_CORPUS_VERSION})
+
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump({'files': corpus}, f, ensure_ascii=False, indent=2)
+    return corpus
+
+
+def _load_auto_pdf():
+    """같은 폴더의 auto-pdf.py를 모듈로 불러오기 (파일 이름에 '-'가 있어 import 불가)"""
+    module = sys.modules.get('auto_pdf')
+    if module is None:
+        spec = importlib.util.spec_from_file_location('auto_pdf', Path(__file__).with_name('auto-pdf.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['auto_pdf'] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _benchmark_case(operation: str, pdf_file: str, output_dir: str) -> dict:
+    """벤치마크 작업 하나를 실행 (매번 새 프로세스에서 실행되어 최대 RSS가 섞이지 않음)"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = Path(pdf_file).stem
+    error = None
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            if operation.startswith('auto'):
+                auto_pdf = _load_auto_pdf()
+                strategy = operation.partition(':')[2] or None
+                auto_pdf.AutoPDFProcessor(pdf_file, str(output_dir)).process(strategy)
+            else:
+                processor = PDFProcessor(pdf_file)
+                try:
+                    if operation == 'split_by_pages':
+                        processor.split_by_pages(10, str(output_dir))
+                    elif operation == 'split_by_size':
+                        processor.split_by_size(1, str(output_dir))
+                    elif operation.startswith('compress_'):
+                        processor.compress_images(50, str(output_dir / f"{stem}_compressed.pdf"),
+                                                  mode=operation.partition('_')[2])
+                    elif operation == 'extract_text':
+                        processor.extract_text(str(output_dir / f"{stem}_text.txt"))
+                    else:
+                        raise ValueError(f"알 수 없는 작업: {operation}")
+                finally:
+                    processor.close()
+        except Exception as e:
+            error = str(e)
+    wall_s = time.perf_counter() - started
+
+    outputs = [path for path in output_dir.rglob('*') if path.is_file()]
+    return {
+        'wall_s': round(wall_s, 4),
+        'peak_rss_mb': _peak_rss_mb(),
+        'output_files': len(outputs),
+        'output_bytes': sum(path.stat().st_size for path in outputs),
+        'error': error,
+    }
+
+
+def run_benchmark(work_dir: Path, scales: Iterable[str] = ('small',),
+                  operations: Iterable[str] = BENCHMARK_OPERATIONS, repeat: int = 1,
+                  seed: int = BENCHMARK_SEED) -> dict:
+    """
+    합성 코퍼스를 만들고 파일/작업 조합마다 실행 시간, 최대 RSS, 출력 크기를 측정
+
+    각 측정은 새로 시작한 프로세스에서 실행하며, repeat번 반복해 실행 시간의
+    중앙값을 기록합니다. 결과는 compare_benchmarks()로 이전 실행과 비교할 수 있습니다.
+    """
+    work_dir = Path(work_dir)
+    corpus = generate_benchmark_corpus(work_dir / "corpus", scales, seed=seed)
+    runs_dir = work_dir / "runs"
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    for entry in corpus:
+        for operation in operations:
+            samples = []
+            for _ in range(max(1, repeat)):
+                shutil.rmtree(runs_dir, ignore_errors=True)
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    samples.append(executor.submit(_benchmark_case, operation, entry['path'],
+                                                   str(runs_dir)).result())
+            shutil.rmtree(runs_dir, ignore_errors=True)
+
+            wall_times = sorted(sample['wall_s'] for sample in samples)
+            result = {
+                'file': entry['name'],
+                'kind': entry['kind'],
+                'scale': entry['scale'],
+                'operation': operation,
+                'wall_s': wall_times[len(wall_times) // 2],
+                'wall_s_samples': [sample['wall_s'] for sample in samples],
+                'peak_rss_mb': samples[-1]['peak_rss_mb'],
+                'output_files': samples[-1]['output_files'],
+                'output_bytes': samples[-1]['output_bytes'],
+                'error': samples[-1]['error'],
+            }
+            results.append(result)
+            status = f"오류: {result['error']}" if result['error'] else \
+                f"{result['wall_s']:.2f}초, {result['peak_rss_mb'] or 0:.0f}MB, " \
+                f"{result['output_bytes'] / 1024:.0f}KB"
+            print(f"  {entry['name']:<24} {operation:<28} {status}")
+
+    return {
+        'schema_version': 1,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'repeat': max(1, repeat),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'backend': _backend().name,
+            'PyPDF2': PyPDF2.__version__,
+            'Pillow': PIL.__version__,
+            'reportlab': reportlab.Version,
+        },
+        'corpus': corpus,
+        'results': results,
+    }
+
+
+def compare_benchmarks(baseline: dict, current: dict, tolerance: float = 0.2) -> List[dict]:
+    """
+    같은 파일/작업의 측정값을 비교하여 tolerance 비율 이상 나빠진 항목을 반환
+
+    실행 시간, 최대 RSS, 출력 크기를 비교하며 코퍼스가 다르면(해시 불일치) 비교하지 않습니다.
+    """
+    baseline_hashes = {entry['name']: entry['sha256'] for entry in baseline['corpus']}
+    current_hashes = {entry['name']: entry['sha256'] for entry in current['corpus']}
+    baseline_results = {(result['file'], result['operation']): result
+                        for result in baseline['results']}
+
+    regressions = []
+    for result in current['results']:
+        before = baseline_results.get((result['file'], result['operation']))
+        if before is None or baseline_hashes.get(result['file']) != current_hashes[result['file']]:
+            continue
+        for metric in ('wall_s', 'peak_rss_mb', 'output_bytes'):
+            if not (before[metric] and result[metric]):
+                continue
+            if metric == 'wall_s' and result[metric] - before[metric] < _BENCHMARK_MIN_WALL_DELTA_S:
+                continue  # 아주 짧은 작업의 측정 오차는 무시
+            if result[metric] > before[metric] * (1 + tolerance):
+                regressions.append({'file': result['file'], 'operation': result['operation'],
+                                    'metric': metric, 'baseline': before[metric],
+                                    'current': result[metric],
+                                    'change': round(result[metric] / before[metric] - 1, 3)})
+    return regressions
+
+
+# 엔진 측정 작업 (이름, 측정 페이지 수 상한)
+CALIBRATION_OPERATIONS = (('open', None), ('page_count', None), ('text', 50),
+                          ('render', 10), ('copy', None))
+
+
+def calibrate_backends(pdf_file: str, dpi: int = 150) -> dict:
+    """
+    설치된 PDF 엔진마다 작업별 처리 속도를 측정
+
+    같은 파일로 열기, 페이지 수, 텍스트 추출, 렌더링(dpi), 페이지 복사를 실행하며,
+    텍스트/렌더링은 앞쪽 일부 페이지만 측정합니다. 텍스트 추출, 렌더링, 복사의
+    페이지당 시간 합이 가장 작은 엔진을 권장합니다. 페이지 수를 얻지 못한 엔진은
+    나머지 작업도 실패로 기록합니다.
+    """
+    source = str(pdf_file)
+    results = []
+    for name in available_backends():
+        backend = BACKENDS[name]
+        _close_worker_document(name)
+        result = {'backend': name, 'operations': {}}
+        total_pages = None
+        for operation, page_limit in CALIBRATION_OPERATIONS:
+            started = time.perf_counter()
+            try:
+                if operation == 'open':
+                    backend.close(backend.open(source))
+                    pages = 1
+                elif operation == 'page_count':
+                    total_pages = pages = backend.page_count(source)
+                elif total_pages is None:
+                    raise RuntimeError("페이지 수를 읽지 못했습니다")
+                elif operation == 'text':
+                    pages = len(backend.extract_texts(source, 0, min(total_pages, page_limit)))
+                elif operation == 'render':
+                    pages = len(backend.render(source, dpi, 0, min(total_pages, page_limit)))
+                else:
+                    backend.copy_pages(source, 0, total_pages)
+                    pages = total_pages
+            except Exception as e:
+                result['operations'][operation] = {'error': str(e) or type(e).__name__}
+                continue
+            elapsed = time.perf_counter() - started
+            result['operations'][operation] = {
+                'seconds': round(elapsed, 4),
+                'pages': pages,
+                'pages_per_s': round(pages / elapsed, 1) if elapsed > 0 else None,
+            }
+        results.append(result)
+
+    def per_page_cost(result):
+        operations = [result['operations'][operation] for operation in ('text', 'render', 'copy')]
+        if any('error' in item for item in operations):
+            return None
+        return sum(item['seconds'] / max(1, item['pages']) for item in operations)
+
+    ranked = [(per_page_cost(result), result['backend']) for result in results]
+    ranked = sorted(item for item in ranked if item[0] is not None)
+    return {
+        'file': source,
+        'dpi': dpi,
+        'results': results,
+        'recommended': ranked[0][1] if ranked else None,
+    }
+
+
+def print_calibration(calibration: dict) -> None:
+    """엔진별 측정 결과를 표로 출력"""
+    print(f"\n엔진 측정 결과: {Path(calibration['file']).name} (렌더링 {calibration['dpi']}DPI)")
+    header = f"{'엔진':<10}" + ''.join(f"{operation:>14}" for operation, _ in CALIBRATION_OPERATIONS)
+    print(header)
+    print("-" * len(header))
+    for result in calibration['results']:
+        cells = []
+        for operation, _ in CALIBRATION_OPERATIONS:
+            item = result['operations'][operation]
+            if 'error' in item:
+                cells.append(f"{'오류':>14}")
+            elif operation in ('open', 'page_count'):
+                cells.append(f"{item['seconds'] * 1000:>11.1f}ms")
+            else:
+                cells.append(f"{item['pages_per_s'] or 0:>9.1f}쪽/초")
+        print(f"{result['backend']:<10}" + ''.join(cells))
+        for operation, item in result['operations'].items():
+            if 'error' in item:
+                print(f"  {operation} 실패: {item['error']}")
+    if calibration['recommended']:
+        print(f"\n권장 엔진: {calibration['recommended']} (--backend {calibration['recommended']})")
+    missing = [backend.package for backend in BACKENDS.values() if not backend.available()]
+    if missing:
+        print(f"설치하면 측정 가능한 엔진: pip install {' '.join(missing)}")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -204,49 +882,184 @@ def main():
   # 이미지 압축 (품질 50%)
   python pdf-processor.py input.pdf --compress --quality 50
 
+  # 8개 프로세스로 병렬 압축
+  python pdf-processor.py input.pdf --compress --workers 8
+
+  # 렌더링 없이 내장 이미지만 150DPI로 재압축
+  python pdf-processor.py input.pdf --compress --compress-mode images --target-dpi 150
+
   # 텍스트만 추출
   python pdf-processor.py input.pdf --extract-text
+
+  # 설치된 PDF 엔진별 처리 속도 측정 (파일을 생략하면 합성 PDF로 측정)
+  python pdf-processor.py --calibrate input.pdf
+
+  # 합성 코퍼스로 벤치마크 실행 후 이전 결과와 비교
+  python pdf-processor.py --benchmark bench --benchmark-baseline bench/baseline.json
         """
     )
 
-    parser.add_argument('input_file', help='처리할 PDF 파일 경로')
+    parser.add_argument('input_file', nargs='?', help='처리할 PDF 파일 경로')
     parser.add_argument('--split-pages', type=int, metavar='N',
                         help='N 페이지씩 분할')
     parser.add_argument('--split-size', type=float, metavar='MB',
-                        help='MB 크기로 분할 (근사치)')
+                        help='MB 크기 이하로 분할')
     parser.add_argument('--compress', action='store_true',
                         help='이미지 압축하여 파일 크기 줄이기')
     parser.add_argument('--quality', type=int, default=50, metavar='Q',
                         help='압축 품질 (1-100, 기본값: 50)')
+    parser.add_argument('--compress-mode', choices=['raster', 'hybrid', 'images'], default='raster',
+                        help='raster: 모든 페이지 래스터화, hybrid: 이미지 페이지만 래스터화, '
+                             'images: 내장 이미지만 재압축 (기본값: raster)')
+    parser.add_argument('--color-mode', choices=COLOR_MODE_CHOICES, default='auto',
+                        help='래스터화한 페이지의 인코딩 형식. auto: 페이지마다 흑백(1비트)/회색조/컬러 판정, '
+                             'gray: 모두 회색조 JPEG, color: 모두 컬러 JPEG (기본값: auto)')
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help='스캔 잡음 정도만 다른 페이지도 같은 렌더링 구간 안에 있으면 이미지를 공유 '
+                             '(원본 해상도로 확인, 기본값: 픽셀이 완전히 같은 페이지만 공유)')
+    parser.add_argument('--target-mb', type=float, metavar='MB',
+                        help='압축 결과가 MB 안에 들도록 품질/DPI를 자동 선택 (raster/hybrid 모드)')
+    parser.add_argument('--target-dpi', type=int, default=150, metavar='DPI',
+                        help='images 모드에서 이미지를 축소할 목표 DPI (기본값: 150)')
+    parser.add_argument('--codec', choices=['jpeg', 'flate'], default='jpeg',
+                        help='images 모드의 재인코딩 방식 (기본값: jpeg)')
+    parser.add_argument('--batch-size', type=int, default=10, metavar='N',
+                        help='압축 시 한 번에 렌더링할 페이지 수 (기본값: 10)')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help='분할/압축/텍스트 추출에 사용할 프로세스 수 (기본값: 1)')
     parser.add_argument('--extract-text', action='store_true',
                         help='텍스트만 추출하여 txt 파일로 저장')
     parser.add_argument('--output-dir', type=str,
                         help='출력 디렉토리 (기본값: 원본 파일 디렉토리)')
+    parser.add_argument('--profile', action='store_true',
+                        help='단계별 소요 시간/메모리를 측정하여 마지막에 표로 출력')
+    parser.add_argument('--report', type=str, metavar='FILE',
+                        help='단계별/페이지별 측정 결과를 JSON 리포트로 저장 (--profile 포함)')
+    parser.add_argument('--backend', choices=['auto'] + list(BACKENDS), default='auto',
+                        help='렌더링/텍스트 추출/페이지 분할에 사용할 PDF 엔진 '
+                             '(기본값: auto, --calibrate로 측정한 권장 엔진, 측정 전에는 pypdf2)')
+    parser.add_argument('--calibrate', nargs='?', const='', metavar='PDF',
+                        help='설치된 PDF 엔진마다 작업별 처리 속도를 측정하고 권장 엔진 출력')
+    parser.add_argument('--benchmark', type=str, metavar='DIR',
+                        help='DIR에 합성 코퍼스를 만들고 모든 작업의 성능을 측정 '
+                             '(결과: DIR/benchmark_results.json)')
+    parser.add_argument('--benchmark-scales', type=str, default='small', metavar='LIST',
+                        help=f'코퍼스 크기 단계, 쉼표로 구분 ({", ".join(BENCHMARK_SCALES)}, '
+                             f'기본값: small)')
+    parser.add_argument('--benchmark-ops', type=str, metavar='LIST',
+                        help='측정할 작업, 쉼표로 구분 (기본값: 전체)')
+    parser.add_argument('--benchmark-repeat', type=int, default=1, metavar='N',
+                        help='작업마다 반복 측정할 횟수, 중앙값을 기록 (기본값: 1)')
+    parser.add_argument('--benchmark-baseline', type=str, metavar='FILE',
+                        help='비교할 이전 벤치마크 결과 JSON (나빠진 항목이 있으면 종료 코드 2)')
+    parser.add_argument('--benchmark-tolerance', type=float, default=0.2, metavar='RATIO',
+                        help='기준 대비 허용하는 증가 비율 (기본값: 0.2)')
 
     args = parser.parse_args()
 
+    try:
+        backend = select_backend(args.backend)
+    except ValueError as e:
+        print(f"오류: {e}")
+        sys.exit(1)
+
+    if args.calibrate is not None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_file = args.calibrate
+            if not pdf_file:
+                pdf_file = str(Path(temp_dir) / "calibration.pdf")
+                print("측정용 합성 PDF 생성 중...")
+                _generate_benchmark_pdf(Path(pdf_file), 'mixed', BENCHMARK_SCALES['small'], BENCHMARK_SEED)
+            calibration = calibrate_backends(pdf_file)
+        print_calibration(calibration)
+        if calibration['recommended']:
+            saved = save_calibration(calibration)
+            if saved:
+                print(f"이후 --backend auto는 {calibration['recommended']} 엔진을 사용합니다 (기록: {saved})")
+        if args.report:
+            Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(calibration, f, ensure_ascii=False, indent=2)
+            print(f"\n리포트 저장 위치: {args.report}")
+        return
+
+    if args.benchmark:
+        scales = [scale.strip() for scale in args.benchmark_scales.split(',') if scale.strip()]
+        operations = ([operation.strip() for operation in args.benchmark_ops.split(',')]
+                      if args.benchmark_ops else BENCHMARK_OPERATIONS)
+        unknown = [name for name in scales if name not in BENCHMARK_SCALES] + \
+                  [name for name in operations if name not in BENCHMARK_OPERATIONS]
+        if unknown:
+            print(f"오류: 알 수 없는 크기 단계/작업: {', '.join(unknown)}")
+            sys.exit(1)
+
+        report = run_benchmark(Path(args.benchmark), scales, operations, args.benchmark_repeat)
+        result_file = Path(args.benchmark) / "benchmark_results.json"
+        with open(result_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n벤치마크 완료: {len(report['results'])}개 측정")
+        print(f"저장 위치: {result_file}")
+
+        if args.benchmark_baseline:
+            with open(args.benchmark_baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = compare_benchmarks(baseline, report, args.benchmark_tolerance)
+            if regressions:
+                print(f"\n성능 저하 {len(regressions)}건:")
+                for item in regressions:
+                    print(f"  {item['file']} {item['operation']} {item['metric']}: "
+                          f"{item['baseline']} -> {item['current']} (+{item['change']:.0%})")
+                sys.exit(2)
+            print(f"\n기준 대비 성능 저하 없음 (허용 범위 {args.benchmark_tolerance:.0%})")
+        return
+
+    if not args.input_file:
+        parser.print_help()
+        print("\n오류: 처리할 PDF 파일 경로가 필요합니다.")
+        sys.exit(1)
+
     if not any([args.split_pages, args.split_size, args.compress, args.extract_text]):
         parser.print_help()
         print("\n오류: 최소 한 가지 처리 방법을 선택해야 합니다.")
         sys.exit(1)
 
+    if args.target_mb and args.compress_mode == 'images':
+        print("오류: --target-mb는 raster/hybrid 모드에서만 쓸 수 있습니다 "
+              "(images 모드는 --target-dpi로 크기를 조절하세요).")
+        sys.exit(1)
+
     try:
-        processor = PDFProcessor(args.input_file)
+        profiler = RunProfiler(enabled=args.profile or bool(args.report))
+        print(f"PDF 엔진: {backend}")
+        processor = PDFProcessor(args.input_file, profiler)
+        outputs = []
 
         if args.split_pages:
-            processor.split_by_pages(args.split_pages, args.output_dir)
+            outputs += processor.split_by_pages(args.split_pages, args.output_dir, args.workers)
 
         if args.split_size:
-            processor.split_by_size(args.split_size, args.output_dir)
+            outputs += processor.split_by_size(args.split_size, args.output_dir, args.workers)
 
         if args.compress:
-            processor.compress_images(args.quality)
+            outputs.append(processor.compress_images(args.quality, batch_size=args.batch_size,
+                                                     workers=args.workers, mode=args.compress_mode,
+                                                     target_dpi=args.target_dpi, codec=args.codec,
+                                                     target_mb=args.target_mb,
+                                                     color_mode=args.color_mode,
+                                                     near_duplicates=args.near_duplicates))
 
         if args.extract_text:
-            processor.extract_text()
+            outputs.append(processor.extract_text(workers=args.workers))
 
         print("\n모든 작업이 완료되었습니다!")
 
+        if profiler.enabled:
+            run = profiler.run_record(processor.input_file, outputs, processor.total_pages)
+            print_run_profile(run)
+            if args.report:
+                write_run_report(Path(args.report), 'pdf-processor', [run])
+                print(f"\n리포트 저장 위치: {args.report}")
+
     except Exception as e:
         print(f"\n오류 발생: {e}")
         import traceback
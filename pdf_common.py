@@ -0,0 +1,1896 @@
+"""
+PDF 처리 도구 공통 모듈
+auto-pdf.py와 pdf-processor.py가 함께 쓰는 렌더링·인코딩, PDF 엔진(백엔드), 텍스트 추출,
+분할 계획, 목표 용량 압축 계획, 페이지 분류 코드를 모아 둔 모듈입니다.
+
+두 스크립트가 같은 폴더에서 `import pdf_common`으로 불러 씁니다.
+필수 패키지 확인과 안내 메시지는 각 스크립트가 이 모듈을 불러오기 전에 합니다.
+"""
+
+import abc
+import contextlib
+import gc
+import hashlib
+import io
+import json
+import mmap
+import os
+import platform
+import re
+import struct
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (ArrayObject, DictionaryObject, FloatObject, IndirectObject,
+                            NameObject, NullObject, NumberObject, StreamObject)
+import PIL.Image
+import PIL.ImageChops
+import PIL.ImageFilter
+from pdf2image import convert_from_bytes, convert_from_path
+
+# 선택 PDF 엔진 (설치되어 있으면 자동으로 사용, --backend 참고)
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # 이전 버전의 PyMuPDF
+    except ImportError:
+        pymupdf = None
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+try:
+    import resource  # 최대 RSS 측정용 (Windows에는 없음)
+except ImportError:
+    resource = None
+
+
+# 실행 리포트(--report) 스키마 버전 (필드의 의미가 바뀌면 올림)
+RUN_REPORT_SCHEMA_VERSION = 1
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 RSS (MB). 측정할 수 없는 환경(Windows)에서는 None"""
+    # Linux의 ru_maxrss는 fork/exec 전 부모 프로세스의 값을 물려받으므로 VmHWM을 우선 사용
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class RunProfiler:
+    """
+    파일 하나를 처리하는 동안 단계별/페이지별 소요 시간, 입출력 바이트, 최대 메모리를 기록
+
+    enabled가 False이면 모든 기록 메서드가 바로 반환하므로 항상 넘겨도 비용이 거의 없습니다.
+    워커 프로세스에서 측정한 시간은 add()로 합산하며, 최대 메모리는 메인 프로세스 기준입니다.
+    """
+
+    _DISABLED_STAGE = contextlib.nullcontext({})
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.pages = []
+        self.metrics = {}
+
+    def add(self, name: str, duration_s: float, bytes_in: int = 0, bytes_out: int = 0) -> None:
+        """name 단계에 측정값을 더함"""
+        if not self.enabled:
+            return
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {'name': name, 'calls': 0, 'duration_s': 0.0,
+                                         'bytes_in': 0, 'bytes_out': 0, 'peak_rss_mb': None}
+        stage['calls'] += 1
+        stage['duration_s'] += duration_s
+        stage['bytes_in'] += bytes_in
+        stage['bytes_out'] += bytes_out
+        stage['peak_rss_mb'] = _peak_rss_mb()
+
+    def stage(self, name: str, bytes_in: int = 0):
+        """with 블록의 소요 시간을 name 단계에 기록 (블록 안에서 record['bytes_out']을 채울 수 있음)"""
+        if not self.enabled:
+            return self._DISABLED_STAGE
+        return self._timed_stage(name, bytes_in)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name: str, bytes_in: int):
+        record = {'bytes_out': 0}
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self.add(name, time.perf_counter() - started, bytes_in, record['bytes_out'])
+
+    def metric(self, name: str, value) -> None:
+        """단계와 별개인 실행 지표 기록 (예: 중복 페이지 비율)"""
+        if self.enabled:
+            self.metrics[name] = value
+
+    def page(self, page_num: int, stage: str, duration_s: float, bytes_out: int = 0,
+             **details) -> None:
+        """페이지(1부터 시작) 하나의 단계별 소요 시간 기록 (details는 항목에 그대로 추가)"""
+        if self.enabled:
+            self.pages.append({'page': page_num, 'stage': stage,
+                               'duration_s': round(duration_s, 6), 'bytes_out': bytes_out,
+                               **details})
+
+    def run_record(self, input_file: Path, outputs: List[Path], total_pages: Optional[int] = None,
+                   strategy: Optional[str] = None) -> dict:
+        """리포트의 runs 항목 하나"""
+        return {
+            'input': {'path': str(input_file), 'bytes': input_file.stat().st_size,
+                      'pages': total_pages},
+            'strategy': strategy,
+            'duration_s': round(time.perf_counter() - self.started, 6),
+            'peak_rss_mb': _peak_rss_mb(),
+            'stages': [dict(stage, duration_s=round(stage['duration_s'], 6))
+                       for stage in self.stages.values()],
+            'pages': self.pages,
+            'metrics': self.metrics,
+            'outputs': [{'path': str(output), 'bytes': output.stat().st_size}
+                        for output in outputs if output.exists()],
+        }
+
+
+_NO_PROFILER = RunProfiler(enabled=False)
+
+
+def write_run_report(report_file: Path, tool: str, runs: List[dict]) -> None:
+    """
+    실행 리포트를 JSON으로 저장
+
+    최상위 필드(schema, schema_version, tool, created_at, environment, runs)와 runs 항목의
+    필드는 schema_version이 같으면 바뀌지 않습니다. 시간은 초, 크기는 바이트, 메모리는 MB입니다.
+    """
+    report = {
+        'schema': 'pdf-tools.run-report',
+        'schema_version': RUN_REPORT_SCHEMA_VERSION,
+        'tool': tool,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'backend': _backend().name,
+        },
+        'runs': runs,
+    }
+    Path(report_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def print_run_profile(run: dict) -> None:
+    """run_record() 결과를 단계별 표로 출력"""
+    print(f"\n단계별 소요 시간: {Path(run['input']['path']).name} "
+          f"(전체 {run['duration_s']:.2f}초, 최대 메모리 {run['peak_rss_mb'] or 0:.0f}MB)")
+    print(f"  {'단계':<12} {'호출':>6} {'시간(초)':>10} {'입력':>10} {'출력':>10}")
+    for stage in run['stages']:
+        print(f"  {stage['name']:<12} {stage['calls']:>6} {stage['duration_s']:>10.3f} "
+              f"{stage['bytes_in'] / 1024:>8.0f}KB {stage['bytes_out'] / 1024:>8.0f}KB")
+    for name, value in run.get('metrics', {}).items():
+        print(f"  {name}: {value}")
+
+
+# 페이지 색상 판정 기준 (렌더링된 페이지 기준)
+COLOR_CHROMA_THRESHOLD = 24        # 채널 간 차이가 이보다 크면 색이 있는 픽셀
+COLOR_PIXEL_RATIO = 0.001          # 색이 있는 픽셀이 이 비율을 넘으면 컬러 페이지
+BILEVEL_MIDTONE_RANGE = (64, 192)  # 이 밝기 구간의 픽셀을 중간 톤으로 봄
+BILEVEL_MIDTONE_RATIO = 0.08       # 중간 톤이 이 비율을 넘으면 회색조 페이지
+BILEVEL_THRESHOLD = 128            # 흑백(1비트)으로 바꿀 때 이보다 어두운 픽셀이 검정 (Pillow 기본값)
+BILEVEL_LIGHT_RANGE = (128, 224)   # 흑백으로 바꾸면 흰색이 되는 옅은 회색 구간
+BILEVEL_STRAY_RATIO = 0.0005       # 글자 가장자리가 아닌 회색 픽셀이 이 비율을 넘으면 회색조 페이지
+COLOR_MODE_NAMES = {'bilevel': '흑백', 'gray': '회색조', 'color': '컬러'}
+# --color-mode: auto는 페이지마다 판정, gray는 모든 페이지를 회색조, color는 모든 페이지를 컬러로 인코딩
+COLOR_MODE_CHOICES = ('auto', 'gray', 'color')
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _page_color_mode(image: 'PIL.Image.Image',
+                     color_mode: str = 'auto') -> Tuple[str, 'PIL.Image.Image']:
+    """
+    렌더링된 페이지에 흑백(bilevel), 회색조(gray), 컬러(color) 중 무엇이면 충분한지 판정
+
+    가로세로 한 픽셀씩 건너뛴 표본(평균을 내지 않으므로 픽셀 값 분포가 원본과 같음)에서
+    채널 간 최대 차이로 색을 찾고, 색이 없으면 회색조 히스토그램의 중간 톤 비율을 봅니다.
+    중간 톤이 적어도 흑백은 페이지가 정말 두 가지 톤일 때만 고릅니다 (_is_two_tone).
+    color_mode가 'gray'나 'color'이면 판정 없이 그 모드로 변환합니다.
+    판정과 그 모드로 변환한 이미지를 반환합니다.
+    """
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    if color_mode == 'color':
+        return 'color', image.convert('RGB')
+    if color_mode == 'gray':
+        return 'gray', image.convert('L')
+
+    sample = image.resize((max(1, image.width // 2), max(1, image.height // 2)), PIL.Image.NEAREST)
+    if image.mode == 'RGB':
+        red, green, blue = sample.split()
+        chroma = PIL.ImageChops.lighter(
+            PIL.ImageChops.lighter(PIL.ImageChops.difference(red, green),
+                                   PIL.ImageChops.difference(green, blue)),
+            PIL.ImageChops.difference(red, blue))
+        histogram = chroma.histogram()
+        if sum(histogram[COLOR_CHROMA_THRESHOLD + 1:]) > COLOR_PIXEL_RATIO * sum(histogram):
+            return 'color', image
+        sample = sample.convert('L')
+
+    histogram = sample.histogram()
+    low, high = BILEVEL_MIDTONE_RANGE
+    gray = image.convert('L')
+    if sum(histogram[low:high]) <= BILEVEL_MIDTONE_RATIO * sum(histogram) and _is_two_tone(gray):
+        return 'bilevel', gray.convert('1', dither=PIL.Image.NONE)
+    return 'gray', gray
+
+
+def _band_mask(gray: 'PIL.Image.Image', low: int, high: int) -> 'PIL.Image.Image':
+    """밝기가 [low, high) 구간인 픽셀만 255인 마스크"""
+    return gray.point(lambda value: 255 if low <= value < high else 0)
+
+
+def _is_two_tone(gray: 'PIL.Image.Image') -> bool:
+    """
+    원본 해상도 회색조 페이지를 흑백으로 바꿔도 보이는 내용이 사라지지 않는지 확인
+
+    검정 글자의 안티에일리어싱 가장자리는 검정 픽셀 바로 옆에만 있고 두께가 한두 픽셀입니다.
+    검정 픽셀에서 떨어진 옅은 회색 픽셀(#999 같은 회색 글자, 옅은 괘선)은 흑백으로 바꾸면
+    흰색이 되어 사라지고, 3x3 침식 뒤에도 남는 중간 톤 영역(그라데이션, 회색 채움, 사진)은
+    뭉개지므로, 둘 중 하나라도 BILEVEL_STRAY_RATIO를 넘으면 흑백이 아닙니다.
+    """
+    limit = BILEVEL_STRAY_RATIO * gray.width * gray.height
+    # 팽창/침식은 상자 흐림으로 계산 (창 안에 하나라도 있으면 0보다 크고, 전부 있어야 255)
+    near_ink = _band_mask(gray, 0, BILEVEL_THRESHOLD).filter(PIL.ImageFilter.BoxBlur(2))
+    near_ink = near_ink.point(lambda value: 255 if value else 0)
+    lost_ink = PIL.ImageChops.subtract(_band_mask(gray, *BILEVEL_LIGHT_RANGE), near_ink)
+    if lost_ink.histogram()[255] > limit:
+        return False
+    regions = _band_mask(gray, *BILEVEL_MIDTONE_RANGE).filter(PIL.ImageFilter.BoxBlur(1))
+    return regions.histogram()[255] <= limit
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def _encode_bilevel_png(image: 'PIL.Image.Image') -> bytes:
+    """
+    1비트 이미지를 PNG로 인코딩
+
+    Pillow의 PNG 저장은 줄마다 예측 필터를 골라 보느라 느린데, 1비트 페이지에서는 필터로
+    얻는 것이 거의 없으므로 모든 줄을 필터 없이(0) 압축합니다.
+    """
+    data = image.tobytes()
+    stride = (image.width + 7) // 8
+    rows = b''.join(b'\0' + data[start:start + stride] for start in range(0, len(data), stride))
+    return _bilevel_png(image.width, image.height, zlib.compress(rows))
+
+
+def _bilevel_png(width: int, height: int, idat: bytes) -> bytes:
+    """압축된 줄 데이터(IDAT)로 1비트 회색조 PNG 조립"""
+    header = struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0)
+    return (_PNG_SIGNATURE + _png_chunk(b'IHDR', header)
+            + _png_chunk(b'IDAT', idat) + _png_chunk(b'IEND', b''))
+
+
+def _encode_page(image: 'PIL.Image.Image', quality: int, color_mode: str = 'auto') -> bytes:
+    """
+    렌더링된 페이지 이미지를 색상에 맞는 형식의 메모리 내 바이트로 인코딩
+
+    흑백 페이지는 1비트 PNG, 회색조 페이지는 회색조 JPEG, 색이 있는 페이지만 RGB JPEG로
+    인코딩합니다. color_mode가 'gray'/'color'이면 판정 없이 그 형식으로 인코딩합니다.
+    """
+    color_mode, image = _page_color_mode(image, color_mode)
+    if color_mode == 'bilevel':
+        return _encode_bilevel_png(image)
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def _encoded_color_mode(image_bytes: bytes) -> str:
+    """_encode_page로 인코딩한 페이지의 색상 모드"""
+    if image_bytes.startswith(_PNG_SIGNATURE):
+        return 'bilevel'
+    with PIL.Image.open(io.BytesIO(image_bytes)) as image:
+        return 'gray' if image.mode == 'L' else 'color'
+
+
+# 인코딩 결과를 재사용할 중복 페이지 판정 기준
+ENCODE_MEMO_SIZE = 32             # 워커 프로세스마다 기억해 둘 최근 고유 페이지 수
+NEAR_DUPLICATE_DISTANCE = 4       # 거의 같은 페이지 후보로 볼 dHash 해밍 거리
+NEAR_DUPLICATE_TOLERANCE = 48     # 원본 해상도에서 이보다 크게 다른 픽셀은 실제로 바뀐 픽셀
+NEAR_DUPLICATE_PIXEL_RATIO = 0.00002  # 바뀐 픽셀이 이 비율 이하일 때만 같은 페이지 (잡음 몇 점 수준)
+
+# 워커 프로세스별로 최근에 인코딩한 페이지: (픽셀 해시, 크기, 품질, 색상 모드) -> 인코딩 결과
+_encoded_pages_memo = {}
+
+
+def _page_dhash(image: 'PIL.Image.Image') -> int:
+    """렌더링된 페이지의 64비트 dHash (거의 같은 페이지 후보를 찾는 데만 씀)"""
+    pixels = image.convert('L').resize((9, 8), PIL.Image.BILINEAR).tobytes()
+    dhash = 0
+    for row in range(8):
+        for col in range(8):
+            dhash = (dhash << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return dhash
+
+
+def _near_duplicate(image: 'PIL.Image.Image', other: 'PIL.Image.Image') -> bool:
+    """
+    두 페이지 이미지가 원본 해상도에서 같은 페이지로 볼 만큼 비슷한지 확인
+
+    NEAR_DUPLICATE_TOLERANCE보다 크게 다른 픽셀이 NEAR_DUPLICATE_PIXEL_RATIO 이하일 때만
+    같은 페이지로 봅니다. 글자 하나만 바뀌어도 그보다 많은 픽셀이 달라집니다.
+    """
+    if image.mode != other.mode or image.size != other.size:
+        return False
+    difference = PIL.ImageChops.difference(image, other)
+    if len(difference.getbands()) > 1:
+        difference = difference.convert('L')
+    changed = sum(difference.histogram()[NEAR_DUPLICATE_TOLERANCE + 1:])
+    return changed <= NEAR_DUPLICATE_PIXEL_RATIO * image.width * image.height
+
+
+def _encode_page_once(image: 'PIL.Image.Image', quality: int, window_pages: list,
+                      color_mode: str = 'auto', near_duplicates: bool = False) -> bytes:
+    """
+    _encode_page와 같지만 이미 인코딩한 같은 페이지면 그 결과를 재사용
+
+    픽셀이 완전히 같은 페이지(픽셀 데이터의 SHA-1이 같은 페이지)는 이 프로세스에서 최근에
+    인코딩한 페이지 중에서 찾습니다. near_duplicates면 스캔 잡음 정도만 다른 페이지도 같은
+    렌더링 구간(window_pages) 안에서 dHash로 후보를 찾은 뒤 원본 해상도 픽셀로 확인해
+    재사용합니다 (구간 안에서만 찾으므로 워커 수와 관계없이 결과가 같습니다).
+    재사용한 페이지는 같은 bytes 객체를 돌려주므로 워커에서 넘어올 때도 한 번만 전송됩니다.
+    """
+    key = (hashlib.sha1(image.tobytes()).digest(), image.size, quality, color_mode)
+    encoded = _encoded_pages_memo.get(key)
+    if encoded is not None:
+        return encoded
+
+    dhash = _page_dhash(image) if near_duplicates else None
+    if near_duplicates:
+        encoded = next((candidate_bytes for candidate_hash, candidate, candidate_bytes in window_pages
+                        if bin(candidate_hash ^ dhash).count('1') <= NEAR_DUPLICATE_DISTANCE
+                        and _near_duplicate(image, candidate)), None)
+        if encoded is not None:
+            return encoded
+
+    encoded = _encode_page(image, quality, color_mode)
+    if len(_encoded_pages_memo) >= ENCODE_MEMO_SIZE:
+        del _encoded_pages_memo[next(iter(_encoded_pages_memo))]
+    _encoded_pages_memo[key] = encoded
+    if near_duplicates:
+        window_pages.append((dhash, image, encoded))
+    return encoded
+
+
+# 증분 조립기가 중간 페이지 트리 노드 하나에 모았다가 쓰는 페이지 수
+PAGE_TREE_FANOUT = 64
+_JPEG_COLOR_SPACES = {'L': '/DeviceGray', 'RGB': '/DeviceRGB', 'CMYK': '/DeviceCMYK'}
+
+
+def _png_bilevel_data(png_bytes: bytes) -> Tuple[int, int, bytes]:
+    """1비트 회색조 PNG의 (너비, 높이, IDAT 데이터) - IDAT는 PNG 예측 필터가 붙은 Flate 스트림"""
+    position = len(_PNG_SIGNATURE)
+    width = height = None
+    chunks = []
+    while position + 8 <= len(png_bytes):
+        length, kind = struct.unpack('>I4s', png_bytes[position:position + 8])
+        data = png_bytes[position + 8:position + 8 + length]
+        position += length + 12
+        if kind == b'IHDR':
+            width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', data)
+            if (bit_depth, color_type, interlace) != (1, 0, 0):
+                raise ValueError("1비트 회색조 PNG만 그대로 넣을 수 있습니다")
+        elif kind == b'IDAT':
+            chunks.append(data)
+        elif kind == b'IEND':
+            break
+    if width is None:
+        raise ValueError("PNG 헤더가 없습니다")
+    return width, height, b''.join(chunks)
+
+
+def _page_point_size(page) -> Tuple[float, float]:
+    """
+    렌더링했을 때 보이는 페이지 크기 (pt, 너비/높이)
+
+    렌더링 엔진처럼 CropBox(없으면 MediaBox)를 쓰고, /Rotate가 90도/270도이면 너비와
+    높이를 바꿉니다.
+    """
+    box = page.cropbox
+    width, height = abs(float(box.width)), abs(float(box.height))
+    if int(page.get('/Rotate', 0) or 0) % 180:
+        width, height = height, width
+    return width, height
+
+
+class _StreamingPDFWriter:
+    """
+    페이지가 준비되는 대로 PDF 객체를 출력 스트림에 바로 쓰는 조립기
+
+    래스터 페이지는 인코딩된 이미지를 다시 인코딩하지 않고 그대로 넣으며 (JPEG는
+    DCTDecode, 흑백 페이지의 1비트 PNG는 FlateDecode), 이미지가 같은 페이지끼리는
+    이미지와 내용 스트림을 함께 씁니다.
+    원본에서 옮기는 페이지는 참조하는 객체를 처음 나올 때 한 번만 쓰고, 출력에 없는
+    페이지를 가리키는 참조(링크 대상 등)는 null이 됩니다. 페이지 트리는
+    PAGE_TREE_FANOUT 페이지마다 중간 노드를 써 두고 close()에서 루트, 카탈로그,
+    상호 참조 표와 트레일러를 씁니다. 출력에는 write()만 있으면 되므로 (seek 불필요)
+    파이프나 HTTP 응답으로도 바로 보낼 수 있습니다.
+    """
+
+    def __init__(self, output: BinaryIO):
+        self.output = output
+        self.position = 0
+        self.pages = 0
+        self._offsets = {}
+        self._next_id = 1
+        self._root_id = self._reserve()
+        self._node_ids = []
+        self._node_id = None
+        self._node_kids = []
+        self._raster_pages = 0
+        self._shared_images = {}
+        self._color_modes = {}
+        self._copied = {}
+        # 내용이 같은 스트림은 하나만 씀: (id(reader), 스트림 해시) -> 출력 객체 번호
+        self._stream_ids = {}
+        self.deduplicated_streams = 0
+        self._unwritten_pages = set()
+        self._queue = deque()
+        # 복사한 객체를 id(reader)로 기억하므로, 닫을 때까지 리더가 해제되어 id가 재사용되지 않게 유지
+        self._readers = {}
+        self._write(b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n')
+
+    @property
+    def unique_images(self) -> int:
+        return len(self._shared_images)
+
+    @property
+    def duplicate_pages(self) -> int:
+        return self._raster_pages - len(self._shared_images)
+
+    @property
+    def raster_pages(self) -> int:
+        return self._raster_pages
+
+    @property
+    def color_modes(self) -> Dict[str, dict]:
+        """색상 모드별 래스터 페이지 수와 출력에 쓴 이미지 바이트 ({'pages', 'bytes'})"""
+        return {mode: self._color_modes[mode] for mode in COLOR_MODE_NAMES
+                if mode in self._color_modes}
+
+    def _write(self, data: bytes) -> None:
+        self.output.write(data)
+        self.position += len(data)
+
+    def _reserve(self) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _write_object(self, object_id: int, obj) -> None:
+        buffer = io.BytesIO()
+        buffer.write(f"{object_id} 0 obj\n".encode('ascii'))
+        obj.write_to_stream(buffer, None)
+        buffer.write(b"\nendobj\n")
+        self._offsets[object_id] = self.position
+        self._write(buffer.getvalue())
+
+    def _add_kid(self, page_id: int) -> IndirectObject:
+        """페이지를 현재 중간 노드에 추가하고, 그 노드 참조(페이지의 /Parent)를 반환"""
+        if self._node_id is None:
+            self._node_id = self._reserve()
+        parent = IndirectObject(self._node_id, 0, None)
+        self._node_kids.append(page_id)
+        self.pages += 1
+        if len(self._node_kids) >= PAGE_TREE_FANOUT:
+            self._flush_node()
+        return parent
+
+    def _flush_node(self) -> None:
+        if self._node_id is None:
+            return
+        self._write_object(self._node_id, DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Parent'): IndirectObject(self._root_id, 0, None),
+            NameObject('/Kids'): ArrayObject(IndirectObject(kid, 0, None) for kid in self._node_kids),
+            NameObject('/Count'): NumberObject(len(self._node_kids)),
+        }))
+        self._node_ids.append((self._node_id, len(self._node_kids)))
+        self._node_id = None
+        self._node_kids = []
+
+    @staticmethod
+    def raster_contents(page_size: Tuple[float, float]) -> 'StreamObject':
+        """이미지 Im0을 page_size(pt) 페이지 전체에 그리는 내용 스트림"""
+        page_width, page_height = page_size
+        contents = StreamObject()
+        contents._data = f"q {page_width:.4f} 0 0 {page_height:.4f} 0 0 cm /Im0 Do Q".encode('ascii')
+        return contents
+
+    @classmethod
+    def raster_objects(cls, image_bytes: bytes,
+                       page_size: Tuple[float, float]) -> Tuple['StreamObject', 'StreamObject', str]:
+        """
+        인코딩된 페이지를 그대로 담은 (이미지 스트림, 내용 스트림, 색상 모드)
+
+        페이지 크기(pt)는 렌더링 해상도와 상관없이 원본 페이지 크기를 받으므로, 어떤 DPI로
+        인코딩해도 페이지 크기는 그대로입니다.
+        """
+        image_stream = StreamObject()
+        image_stream.update({
+            NameObject('/Type'): NameObject('/XObject'),
+            NameObject('/Subtype'): NameObject('/Image'),
+        })
+        if image_bytes.startswith(_PNG_SIGNATURE):
+            width, height, image_stream._data = _png_bilevel_data(image_bytes)
+            color_mode = 'bilevel'
+            image_stream.update({
+                NameObject('/ColorSpace'): NameObject('/DeviceGray'),
+                NameObject('/BitsPerComponent'): NumberObject(1),
+                NameObject('/Filter'): NameObject('/FlateDecode'),
+                NameObject('/DecodeParms'): DictionaryObject({
+                    NameObject('/Predictor'): NumberObject(15),
+                    NameObject('/Colors'): NumberObject(1),
+                    NameObject('/BitsPerComponent'): NumberObject(1),
+                    NameObject('/Columns'): NumberObject(width),
+                }),
+            })
+        else:
+            with PIL.Image.open(io.BytesIO(image_bytes)) as image:
+                width, height = image.size
+                mode = image.mode
+            if mode not in _JPEG_COLOR_SPACES:
+                raise ValueError(f"지원하지 않는 JPEG 색 공간입니다: {mode}")
+            color_mode = 'gray' if mode == 'L' else 'color'
+            image_stream.update({
+                NameObject('/ColorSpace'): NameObject(_JPEG_COLOR_SPACES[mode]),
+                NameObject('/BitsPerComponent'): NumberObject(8),
+                NameObject('/Filter'): NameObject('/DCTDecode'),
+            })
+            if mode == 'CMYK':
+                # Pillow/Adobe CMYK JPEG는 값이 반전되어 저장됨
+                image_stream[NameObject('/Decode')] = ArrayObject(NumberObject(value)
+                                                                  for value in (1, 0) * 4)
+            image_stream._data = image_bytes
+        image_stream[NameObject('/Width')] = NumberObject(width)
+        image_stream[NameObject('/Height')] = NumberObject(height)
+
+        return image_stream, cls.raster_contents(page_size), color_mode
+
+    def add_raster(self, image_bytes: bytes, replaces=None,
+                   page_size: Optional[Tuple[float, float]] = None) -> str:
+        """
+        인코딩된 페이지 이미지 한 장을 한 페이지로 추가하고 그 색상 모드를 반환
+        (같은 이미지는 이미지를 함께 쓰고, 페이지 크기까지 같으면 내용 스트림도 함께 씀)
+
+        replaces에 이 페이지로 바뀌는 원본 페이지를 주면, 그 페이지를 가리키던 링크가
+        래스터 페이지를 가리키고 페이지 크기도 그 페이지와 같아집니다. 원본 페이지가 없으면
+        page_size(pt)를 주어야 합니다.
+        """
+        if page_size is None:
+            if replaces is None:
+                raise ValueError("래스터 페이지 크기를 알 수 없습니다 (replaces 또는 page_size 필요)")
+            page_size = _page_point_size(replaces)
+        page_size = (round(page_size[0], 4), round(page_size[1], 4))
+        self._raster_pages += 1
+        key = hashlib.sha1(image_bytes).digest()
+        shared = self._shared_images.get(key)
+        if shared is None:
+            image_stream, contents, color_mode = self.raster_objects(image_bytes, page_size)
+            image_id, contents_id, resources_id = self._reserve(), self._reserve(), self._reserve()
+            self._write_object(image_id, image_stream)
+            self._write_object(contents_id, contents)
+            procset = '/ImageC' if color_mode == 'color' else '/ImageB'
+            self._write_object(resources_id, DictionaryObject({
+                NameObject('/ProcSet'): ArrayObject([NameObject('/PDF'), NameObject(procset)]),
+                NameObject('/XObject'): DictionaryObject({
+                    NameObject('/Im0'): IndirectObject(image_id, 0, None)}),
+            }))
+            # 이미지 하나를 크기가 다른 페이지들이 함께 쓸 수 있으므로 내용 스트림은 크기별로 기록
+            shared = self._shared_images[key] = (resources_id, color_mode, {page_size: contents_id})
+            stats = self._color_modes.setdefault(color_mode, {'pages': 0, 'bytes': 0})
+            stats['bytes'] += len(image_stream._data)
+
+        resources_id, color_mode, contents_ids = shared
+        contents_id = contents_ids.get(page_size)
+        if contents_id is None:
+            contents_id = contents_ids[page_size] = self._reserve()
+            self._write_object(contents_id, self.raster_contents(page_size))
+        page_width, page_height = page_size
+        self._color_modes[color_mode]['pages'] += 1
+        page_id = self._page_id(replaces)
+        parent = self._add_kid(page_id)
+        self._write_object(page_id, DictionaryObject({
+            NameObject('/Type'): NameObject('/Page'),
+            NameObject('/Parent'): parent,
+            NameObject('/MediaBox'): ArrayObject([NumberObject(0), NumberObject(0),
+                                                  FloatObject(page_width),
+                                                  FloatObject(page_height)]),
+            NameObject('/Resources'): IndirectObject(resources_id, 0, None),
+            NameObject('/Contents'): IndirectObject(contents_id, 0, None),
+        }))
+        return color_mode
+
+    def add_page(self, page, prune: bool = False) -> None:
+        """
+        원본 PDF의 페이지를 그대로 추가 (참조하는 객체는 처음 나올 때만 씀)
+
+        prune이면 내용에 쓰이지 않는 리소스를 뺀 /Resources(_pruned_page_resources)로 씁니다.
+        원본 페이지 객체는 바꾸지 않습니다.
+        """
+        page_id = self._page_id(page)
+        resources = _pruned_page_resources(page) if prune else None
+        copied = DictionaryObject((key, self._copy(resources if resources is not None
+                                                   and key == '/Resources' else value))
+                                  for key, value in page.items()
+                                  if key not in ('/Parent', '/StructParents'))
+        copied[NameObject('/Parent')] = self._add_kid(page_id)
+        self._write_object(page_id, copied)
+
+        while self._queue:
+            object_id, reference = self._queue.popleft()
+            self._write_object(object_id, self._copy(reference.get_object(), top=True))
+
+    def _page_id(self, page) -> int:
+        """원본 페이지가 출력에서 쓸 객체 번호 (그 페이지를 가리키는 참조와 같은 번호)"""
+        reference = getattr(page, 'indirect_reference', None)
+        if reference is None:
+            return self._reserve()
+        self._readers[id(reference.pdf)] = reference.pdf
+        key = (id(reference.pdf), reference.idnum, reference.generation)
+        page_id = self._copied.get(key)
+        if page_id is None:
+            page_id = self._copied[key] = self._reserve()
+        elif page_id in self._offsets:
+            # 같은 페이지를 두 번 추가하면 두 번째는 새 번호로 씀 (다른 객체의 참조는 첫 번째를 가리킴)
+            return self._reserve()
+        self._unwritten_pages.discard(page_id)
+        return page_id
+
+    def _copy(self, obj, top: bool = False):
+        """객체를 출력 번호로 바꾼 사본 (간접 객체는 번호만 정하고 나중에 씀)"""
+        if isinstance(obj, IndirectObject):
+            key = (id(obj.pdf), obj.idnum, obj.generation)
+            object_id = self._copied.get(key)
+            if object_id is None:
+                target = obj.get_object()
+                if isinstance(target, StreamObject):
+                    # 이미지/글꼴 파일처럼 같은 내용이 다른 번호로 여러 번 들어간 스트림은 한 번만 씀
+                    digest = (id(obj.pdf), _stream_digest(target))
+                    object_id = self._stream_ids.get(digest)
+                    if object_id is not None:
+                        self._copied[key] = object_id
+                        self.deduplicated_streams += 1
+                        return IndirectObject(object_id, 0, None)
+                    object_id = self._stream_ids[digest] = self._reserve()
+                else:
+                    object_id = self._reserve()
+                self._copied[key] = object_id
+                if isinstance(target, DictionaryObject) and target.get('/Type') in ('/Page', '/Pages'):
+                    # 페이지는 add_page로 추가될 때 쓰고, 끝까지 추가되지 않으면 null로 씀
+                    self._unwritten_pages.add(object_id)
+                else:
+                    self._queue.append((object_id, obj))
+            return IndirectObject(object_id, 0, None)
+        if isinstance(obj, StreamObject) and top:
+            copied = StreamObject()
+            copied.update((key, self._copy(value)) for key, value in obj.items() if key != '/Length')
+            copied._data = obj._data
+            return copied
+        if isinstance(obj, DictionaryObject):
+            return DictionaryObject((key, self._copy(value)) for key, value in obj.items())
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._copy(value) for value in obj)
+        return obj
+
+    def close(self) -> int:
+        """페이지 트리 루트, 카탈로그, 상호 참조 표, 트레일러를 쓰고 전체 크기(바이트)를 반환"""
+        self._flush_node()
+        for object_id in sorted(self._unwritten_pages):
+            self._write_object(object_id, NullObject())
+        self._unwritten_pages.clear()
+
+        self._write_object(self._root_id, DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): ArrayObject(IndirectObject(node_id, 0, None)
+                                             for node_id, _ in self._node_ids),
+            NameObject('/Count'): NumberObject(sum(count for _, count in self._node_ids)),
+        }))
+        catalog_id = self._reserve()
+        self._write_object(catalog_id, DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): IndirectObject(self._root_id, 0, None),
+        }))
+
+        xref_position = self.position
+        lines = [f"xref\n0 {self._next_id}\n", "0000000000 65535 f \n"]
+        lines.extend(f"{self._offsets[object_id]:010d} 00000 n \n"
+                     for object_id in range(1, self._next_id))
+        lines.append(f"trailer\n<< /Size {self._next_id} /Root {catalog_id} 0 R >>\n"
+                     f"startxref\n{xref_position}\n%%EOF\n")
+        self._write(''.join(lines).encode('ascii'))
+        self._readers = {}
+        return self.position
+
+
+# 입력 PDF: 파일 경로(str) 또는 메모리에 있는 PDF 바이트
+PDFSource = Union[str, bytes]
+
+
+def _as_source(pdf) -> PDFSource:
+    """경로(str/Path)는 문자열 경로로, bytes류와 바이너리 파일 객체는 bytes로 정규화"""
+    if isinstance(pdf, (str, Path)):
+        return str(pdf)
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        return bytes(pdf)
+    if hasattr(pdf, 'read'):
+        return pdf.read()
+    raise TypeError(f"지원하지 않는 입력 형식입니다: {type(pdf).__name__}")
+
+
+# 이 크기 이상인 경로 입력은 파일을 통째로 읽지 않고 메모리 매핑해서 엶
+LAZY_INPUT_MIN_MB = 64
+# 메모리 매핑한 입력에서 이만큼의 페이지를 처리할 때마다 파싱해 둔 객체를 비움
+LAZY_RELEASE_PAGES = 32
+
+
+def _open_reader(source: PDFSource) -> 'PdfReader':
+    """
+    PdfReader 열기
+
+    LAZY_INPUT_MIN_MB 이상인 파일은 메모리 매핑합니다. PyPDF2는 객체를 참조할 때
+    스트림에서 읽어 오므로, 페이지 트리와 실제로 사용한 객체만 메모리에 올라옵니다.
+    """
+    if not isinstance(source, str):
+        return PdfReader(io.BytesIO(source))
+    if os.path.getsize(source) < LAZY_INPUT_MIN_MB * 1024 * 1024:
+        return PdfReader(source)
+    with open(source, 'rb') as f:
+        return PdfReader(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _release_parsed_objects(reader: 'PdfReader') -> None:
+    """
+    메모리 매핑한 입력에서 지금까지 파싱한 객체와 읽어 들인 파일 페이지를 놓아 줌
+
+    페이지 객체(리소스 정리 결과 포함)는 그대로 남고, 나머지 객체는 다시 참조할 때
+    파일에서 새로 읽습니다. PdfWriter와 복사된 객체는 서로를 참조하므로 순환 참조
+    수거까지 함께 실행합니다. 매핑하지 않은 입력에는 아무 일도 하지 않습니다.
+    """
+    stream = getattr(reader, 'stream', None)
+    if not isinstance(stream, mmap.mmap):
+        return
+    reader.resolved_objects.clear()
+    gc.collect()
+    if hasattr(mmap, 'MADV_DONTNEED'):
+        stream.madvise(mmap.MADV_DONTNEED)
+
+
+def _render_pages(source: PDFSource, dpi: int, first_page: int, last_page: int) -> list:
+    """
+    페이지 구간(1부터 시작)을 현재 PDF 엔진으로 렌더링
+
+    엔진은 한 번 읽어 들인 객체(이미지 스트림 등)를 문서를 닫을 때까지 들고 있으므로,
+    구간마다 문서를 닫아 메모리 사용량이 입력 크기에 따라 늘지 않게 합니다.
+    """
+    backend = _backend()
+    try:
+        return backend.render(source, dpi, first_page - 1, last_page)
+    finally:
+        _close_worker_document(backend.name)
+
+
+def _render_and_encode(source: PDFSource, first_page: int, last_page: int, quality: int,
+                       dpi: int = 150, measure_color: bool = False, color_mode: str = 'auto',
+                       near_duplicates: bool = False
+                       ) -> Tuple[List[bytes], float, List[float], List[int]]:
+    """
+    페이지 구간을 렌더링하고 페이지별 인코딩 결과(_encode_page) 리스트로 반환 (워커 프로세스에서도 실행)
+
+    프로파일링용으로 구간 렌더링 시간과 페이지별 인코딩 시간을 함께 반환합니다.
+    measure_color면 페이지마다 RGB JPEG로 인코딩했을 때의 크기도 재서 반환합니다
+    (흑백/회색조 판정으로 줄어든 크기 측정용, 그만큼 인코딩 시간이 늘어남).
+    """
+    started = time.perf_counter()
+    images = _render_pages(source, dpi, first_page, last_page)
+    render_s = time.perf_counter() - started
+
+    encoded_pages = []
+    encode_times = []
+    color_bytes = []
+    window_pages = []
+    for image in images:
+        started = time.perf_counter()
+        encoded_pages.append(_encode_page_once(image, quality, window_pages, color_mode,
+                                               near_duplicates))
+        encode_times.append(time.perf_counter() - started)
+        if measure_color:
+            color_bytes.append(len(encoded_pages[-1])
+                               if _encoded_color_mode(encoded_pages[-1]) == 'color'
+                               else len(_encode_page(image, quality, 'color')))
+    # 거의 같은 페이지를 원본 해상도로 비교하려고 구간이 끝날 때까지 이미지를 닫지 않음
+    for image in images:
+        image.close()
+    return encoded_pages, render_s, encode_times, color_bytes
+
+
+# 프로세스 풀의 워커가 시작할 때 한 번 받아 두는 메모리 입력 PDF (작업마다 보내지 않도록)
+_pool_source = None
+
+
+def _init_pool_source(source: bytes) -> None:
+    """프로세스 풀 워커 초기화: 메모리 입력 PDF를 받아 둠"""
+    global _pool_source
+    _pool_source = source
+
+
+def _call_with_pool_source(func, *args):
+    """워커가 받아 둔 메모리 입력을 첫 인자로 넣어 func 호출 (워커 프로세스에서 실행)"""
+    return func(_pool_source, *args)
+
+
+def _iter_in_order(func, tasks: Iterable[tuple], workers: int = 1,
+                   source: Optional[PDFSource] = None) -> Iterator:
+    """
+    tasks의 각 인자 튜플로 func를 호출하고 결과를 작업 순서대로 반환
+
+    workers가 2 이상이면 프로세스 풀에서 병렬로 실행합니다. 동시에 처리 중인
+    작업은 워커 수의 2배로 제한되어, 결과를 소비하는 속도가 느려도 메모리에
+    쌓이는 결과가 일정 수준을 넘지 않습니다.
+    source에 메모리 입력(PDF 바이트)을 주면 워커마다 시작할 때 한 번만 보내고, 첫 인자가
+    그 입력인 작업은 나머지 인자만 보냅니다.
+    """
+    if workers <= 1:
+        for args in tasks:
+            yield func(*args)
+        return
+
+    shared = source if isinstance(source, bytes) else None
+    pool_options = {'initializer': _init_pool_source, 'initargs': (shared,)} if shared else {}
+
+    def submit(args):
+        if shared is not None and args and args[0] is shared:
+            return executor.submit(_call_with_pool_source, func, *args[1:])
+        return executor.submit(func, *args)
+
+    with ProcessPoolExecutor(max_workers=workers, **pool_options) as executor:
+        remaining = iter(tasks)
+        pending = deque(submit(args) for args in islice(remaining, workers * 2))
+
+        while pending:
+            future = pending.popleft()
+            next_args = next(remaining, None)
+            if next_args is not None:
+                pending.append(submit(next_args))
+            yield future.result()
+
+
+def _iter_encoded_pages(source: PDFSource, pages: List[int], quality: int, batch_size: int,
+                        workers: int = 1, dpi: int = 150,
+                        profiler: RunProfiler = _NO_PROFILER, color_mode: str = 'auto',
+                        near_duplicates: bool = False) -> Iterator[Tuple[int, bytes]]:
+    """
+    지정한 페이지(1부터 시작, 오름차순)를 렌더링/인코딩하여 (페이지 번호, 인코딩 결과)로 순서대로 반환
+
+    연속된 페이지를 최대 batch_size개씩 한 구간으로 묶어 렌더링합니다. workers가 2 이상이면
+    구간을 프로세스 풀에 나누어 처리하고, 결과는 원래 페이지 순서대로 돌려줍니다.
+    프로파일링 중이면 페이지별 색상 모드와, 모든 페이지를 RGB JPEG로 인코딩했을 때보다
+    줄어든 비율(color_mode_savings)도 기록합니다.
+    """
+    windows = []
+    for page_num in pages:
+        if windows and windows[-1][2] == page_num - 1 and page_num - windows[-1][1] < batch_size:
+            windows[-1][2] = page_num
+        else:
+            windows.append([source, page_num, page_num, quality, dpi, profiler.enabled, color_mode,
+                            near_duplicates])
+    windows = [tuple(window) for window in windows]
+
+    encoded_total = color_total = 0
+    results = _iter_in_order(_render_and_encode, windows, workers, source)
+    for window, (encoded_pages, render_s, encode_times, color_bytes) in zip(windows, results):
+        if profiler.enabled:
+            profiler.add('render', render_s)
+            page_results = zip(encoded_pages, encode_times, color_bytes)
+            for page_num, (image_bytes, encode_s, rgb_bytes) in enumerate(page_results, window[1]):
+                profiler.add('encode', encode_s, bytes_out=len(image_bytes))
+                profiler.page(page_num, 'render', render_s / len(encoded_pages))
+                profiler.page(page_num, 'encode', encode_s, len(image_bytes),
+                              color_mode=_encoded_color_mode(image_bytes), color_bytes=rgb_bytes)
+                encoded_total += len(image_bytes)
+                color_total += rgb_bytes
+            profiler.metric('color_mode_savings', round(1 - encoded_total / color_total, 4)
+                            if color_total else 0.0)
+        yield from enumerate(encoded_pages, window[1])
+
+
+# 내장 이미지 재압축 설정
+DOWNSAMPLE_THRESHOLD = 1.2   # 유효 DPI가 목표의 이 배수를 넘을 때만 축소
+_RECOMPRESSIBLE_FILTERS = {'/FlateDecode', '/LZWDecode', '/ASCII85Decode',
+                           '/ASCIIHexDecode', '/RunLengthDecode'}
+_COLOR_SPACE_MODES = {'/DeviceRGB': 'RGB', '/DeviceGray': 'L'}
+_ICC_COMPONENT_MODES = {1: 'L', 3: 'RGB'}
+
+
+def _image_format(xobject) -> Optional[Tuple[str, bool]]:
+    """
+    재압축할 수 있는 이미지 XObject면 (PIL 모드, JPEG 여부)를 반환
+
+    마스크/Decode 배열이 있거나, 8비트 RGB/Gray가 아니거나, 지원하지 않는 필터(JPX, JBIG2,
+    CCITT 등)를 쓰는 이미지는 None을 반환해 원본 그대로 둡니다.
+    """
+    if xobject.get('/ImageMask') or '/Mask' in xobject or '/Decode' in xobject:
+        return None
+    if xobject.get('/BitsPerComponent') != 8:
+        return None
+
+    color_space = xobject.get('/ColorSpace')
+    color_space = color_space.get_object() if color_space is not None else None
+    if isinstance(color_space, ArrayObject) and color_space and color_space[0] == '/ICCBased':
+        mode = _ICC_COMPONENT_MODES.get(color_space[1].get_object().get('/N'))
+    else:
+        mode = _COLOR_SPACE_MODES.get(color_space)
+    if mode is None:
+        return None
+
+    filters = xobject.get('/Filter')
+    filters = list(filters) if isinstance(filters, ArrayObject) else [filters] if filters else []
+    if filters == ['/DCTDecode']:
+        return mode, True
+    if set(filters) <= _RECOMPRESSIBLE_FILTERS:
+        return mode, False
+    return None
+
+
+def _recompress_image(data: bytes, is_jpeg: bool, mode: str, size: Tuple[int, int],
+                      new_size: Tuple[int, int], quality: int, codec: str) -> Optional[bytes]:
+    """
+    이미지를 new_size로 축소하고 codec(jpeg/flate)으로 다시 인코딩 (워커 프로세스에서도 실행)
+
+    데이터 길이가 크기/형식과 맞지 않거나(행 끝 여백 등) 읽을 수 없는 이미지면 None을
+    돌려주어 원본을 그대로 둡니다.
+    """
+    try:
+        if is_jpeg:
+            image = PIL.Image.open(io.BytesIO(data))
+            image.draft(mode, new_size)  # JPEG는 디코딩 단계에서 바로 축소
+        else:
+            image = PIL.Image.frombytes(mode, size, data)
+        if image.mode != mode:
+            image = image.convert(mode)
+        if image.size != new_size:
+            image = image.resize(new_size, PIL.Image.LANCZOS)
+    except (ValueError, OSError):
+        # JPEG는 실제 디코딩이 convert/resize에서 일어나므로 여기까지 함께 확인
+        return None
+
+    if codec == 'jpeg':
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=quality, optimize=True)
+        return buffer.getvalue()
+    return zlib.compress(image.tobytes(), 9)
+
+
+def _recompress_embedded_images(reader: 'PdfReader', target_dpi: int, quality: int,
+                                codec: str = 'jpeg', workers: int = 1) -> List[dict]:
+    """
+    페이지의 이미지 XObject를 목표 유효 DPI로 축소/재인코딩하여 해당 스트림만 교체
+
+    유효 DPI는 이미지가 페이지 전체를 덮는다고 가정한 하한값(픽셀 수 / 페이지 인치)이므로
+    필요 이상으로 축소하지 않습니다. 결과가 원본보다 작을 때만 교체하며,
+    텍스트/벡터/폰트는 건드리지 않습니다.
+
+    Returns:
+        이미지별 처리 결과 (페이지, 이름, 크기, 교체 전/후 바이트, 처리 내용)
+    """
+    report = []
+    candidates = []
+    seen = set()
+
+    for page_num, page in enumerate(reader.pages, 1):
+        resources = page.get('/Resources')
+        resources = resources.get_object() if resources is not None else {}
+        xobjects = resources.get('/XObject')
+        xobjects = xobjects.get_object() if xobjects is not None else {}
+
+        page_width_in = float(page.mediabox.width) / 72
+        page_height_in = float(page.mediabox.height) / 72
+
+        for name, reference in xobjects.items():
+            xobject = reference.get_object()
+            if id(xobject) in seen or xobject.get('/Subtype') != '/Image':
+                continue
+            seen.add(id(xobject))
+
+            size = (int(xobject['/Width']), int(xobject['/Height']))
+            image_format = _image_format(xobject)
+            if image_format is None:
+                report.append({'page': page_num, 'name': name, 'size': size, 'new_size': size,
+                               'before_bytes': len(xobject._data),
+                               'after_bytes': len(xobject._data), 'action': 'skipped'})
+                continue
+
+            dpi = max(size[0] / page_width_in, size[1] / page_height_in)
+            scale = target_dpi / dpi if dpi > target_dpi * DOWNSAMPLE_THRESHOLD else 1.0
+            new_size = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+            candidates.append((page_num, name, xobject, size, new_size, image_format))
+
+    def tasks():
+        # 이미지 데이터는 작업을 넘길 때 하나씩 디코딩
+        for _, _, xobject, size, new_size, (mode, is_jpeg) in candidates:
+            if is_jpeg:
+                data = xobject._data
+            else:
+                data = xobject.get_data()
+                xobject.decoded_self = None  # 디코딩된 데이터를 캐시에 남기지 않음
+            yield data, is_jpeg, mode, size, new_size, quality, codec
+
+    results = _iter_in_order(_recompress_image, tasks(), workers)
+    for (page_num, name, xobject, size, new_size, _), new_data in zip(candidates, results):
+        before_bytes = len(xobject._data)
+        replaced = new_data is not None and len(new_data) < before_bytes
+        if replaced:
+            xobject._data = new_data
+            xobject[NameObject('/Filter')] = NameObject('/DCTDecode' if codec == 'jpeg' else '/FlateDecode')
+            xobject[NameObject('/Width')] = NumberObject(new_size[0])
+            xobject[NameObject('/Height')] = NumberObject(new_size[1])
+            xobject.pop('/DecodeParms', None)
+        report.append({'page': page_num, 'name': name, 'size': size,
+                       'new_size': new_size if replaced else size, 'before_bytes': before_bytes,
+                       'after_bytes': len(xobject._data),
+                       'action': 'recompressed' if replaced else 'kept'})
+
+    return report
+
+
+# 워커 프로세스별로 열어 둔 문서 (같은 파일을 작업마다 다시 파싱하지 않도록, 엔진마다 하나씩)
+_worker_documents = {}
+
+
+def _worker_document(backend: 'PDFBackend', source: PDFSource):
+    """
+    이 프로세스에서 해당 엔진으로 마지막으로 연 입력이면 그 문서를 재사용
+    (같은 경로라도 크기나 수정 시각이 바뀌었으면 다시 엶)
+
+    메모리 입력은 내용을 해시하지 않고 같은 바이트 객체인지로 확인합니다. 항목이 그 객체를
+    잡고 있으므로 다른 입력이 같은 id를 받는 일은 없습니다. 다른 입력을 열면 이전 문서는
+    닫습니다 (메모리 매핑한 입력의 매핑 포함).
+    """
+    document = _worker_documents.get(backend.name)
+    if isinstance(source, str):
+        stat = os.stat(source)
+        key = (source, stat.st_size, stat.st_mtime_ns)
+        reusable = document is not None and document[0] == key
+    else:
+        key = source
+        reusable = document is not None and document[0] is source
+    if not reusable:
+        if document is not None:
+            _close_worker_document(backend.name)
+        document = _worker_documents[backend.name] = (key, backend.open(source))
+    return document[1]
+
+
+def _close_worker_document(name: str) -> None:
+    """엔진 name으로 열어 둔 문서를 닫음 (다음에 필요하면 다시 엶)"""
+    document = _worker_documents.pop(name, None)
+    if document is not None:
+        BACKENDS[name].close(document[1])
+
+
+def _worker_reader(source: PDFSource) -> 'PdfReader':
+    """이 프로세스에서 마지막으로 연 입력이면 그 PdfReader를 재사용"""
+    return _worker_document(BACKENDS['pypdf2'], source)
+
+
+# 사용할 PDF 엔진 이름을 담는 환경 변수 (워커 프로세스도 같은 엔진을 쓰도록 상속)
+BACKEND_ENV = 'PDF_TOOLS_BACKEND'
+# 'auto'의 기본 엔진 (엔진 측정을 하지 않았으면 기존 동작 그대로 PyPDF2 + poppler)
+DEFAULT_BACKEND = 'pypdf2'
+# 사용자별 설정/측정 결과를 두는 폴더
+USER_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'pdf-tools'
+# 엔진 측정(pdf-processor.py --calibrate)의 권장 엔진을 기록하는 파일
+CALIBRATION_FILE = USER_CACHE_DIR / 'calibration.json'
+
+
+class PDFBackend(abc.ABC):
+    """
+    PDF 엔진 공통 인터페이스 (열기, 페이지 수, 텍스트 추출, 렌더링, 페이지 복사)
+
+    source는 파일 경로(str) 또는 PDF 바이트이며, 페이지 번호는 0부터 시작하는
+    [start, end) 구간입니다. 렌더링 결과는 RGB PIL 이미지입니다.
+    """
+    name = ''
+    package = ''
+
+    @abc.abstractmethod
+    def available(self) -> bool:
+        """이 엔진의 패키지가 설치되어 있는지"""
+
+    @abc.abstractmethod
+    def open(self, source: PDFSource):
+        """문서 열기 (close()로 닫음)"""
+
+    @abc.abstractmethod
+    def close(self, document) -> None:
+        """open()으로 연 문서 닫기"""
+
+    @abc.abstractmethod
+    def page_count(self, source: PDFSource) -> int:
+        """전체 페이지 수"""
+
+    @abc.abstractmethod
+    def extract_texts(self, source: PDFSource, start: int, end: int) -> List[str]:
+        """[start, end) 페이지의 텍스트"""
+
+    @abc.abstractmethod
+    def render(self, source: PDFSource, dpi: int, start: int, end: int) -> list:
+        """[start, end) 페이지를 dpi로 렌더링한 RGB 이미지"""
+
+    @abc.abstractmethod
+    def copy_pages(self, source: PDFSource, start: int, end: int) -> bytes:
+        """[start, end) 페이지만 담은 PDF 바이트"""
+
+
+class PyMuPDFBackend(PDFBackend):
+    """PyMuPDF(MuPDF) 엔진: 렌더링과 텍스트 추출이 가장 빠름"""
+    name = 'pymupdf'
+    package = 'pymupdf'
+
+    def available(self) -> bool:
+        return pymupdf is not None
+
+    def open(self, source: PDFSource):
+        if isinstance(source, str):
+            return pymupdf.open(source)
+        return pymupdf.open(stream=source, filetype='pdf')
+
+    def close(self, document) -> None:
+        document.close()
+
+    def page_count(self, source: PDFSource) -> int:
+        return _worker_document(self, source).page_count
+
+    def extract_texts(self, source: PDFSource, start: int, end: int) -> List[str]:
+        document = _worker_document(self, source)
+        return [document[page_num].get_text() for page_num in range(start, end)]
+
+    def render(self, source: PDFSource, dpi: int, start: int, end: int) -> list:
+        document = _worker_document(self, source)
+        images = []
+        for page_num in range(start, end):
+            pixmap = document[page_num].get_pixmap(dpi=dpi, alpha=False)
+            images.append(PIL.Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples))
+        return images
+
+    def copy_pages(self, source: PDFSource, start: int, end: int) -> bytes:
+        part = pymupdf.open()
+        part.insert_pdf(_worker_document(self, source), from_page=start, to_page=end - 1)
+        data = part.tobytes(garbage=3)
+        part.close()
+        return data
+
+
+class PdfiumBackend(PDFBackend):
+    """pypdfium2(PDFium) 엔진: poppler 없이 빠르게 렌더링"""
+    name = 'pdfium'
+    package = 'pypdfium2'
+
+    def available(self) -> bool:
+        return pypdfium2 is not None
+
+    def open(self, source: PDFSource):
+        return pypdfium2.PdfDocument(source)
+
+    def close(self, document) -> None:
+        document.close()
+
+    def page_count(self, source: PDFSource) -> int:
+        return len(_worker_document(self, source))
+
+    def extract_texts(self, source: PDFSource, start: int, end: int) -> List[str]:
+        document = _worker_document(self, source)
+        texts = []
+        for page_num in range(start, end):
+            page = document[page_num]
+            text_page = page.get_textpage()
+            texts.append(text_page.get_text_range().replace('\r\n', '\n'))
+            text_page.close()
+            page.close()
+        return texts
+
+    def render(self, source: PDFSource, dpi: int, start: int, end: int) -> list:
+        document = _worker_document(self, source)
+        images = []
+        for page_num in range(start, end):
+            page = document[page_num]
+            image = page.render(scale=dpi / 72).to_pil()
+            images.append(image if image.mode == 'RGB' else image.convert('RGB'))
+            page.close()
+        return images
+
+    def copy_pages(self, source: PDFSource, start: int, end: int) -> bytes:
+        part = pypdfium2.PdfDocument.new()
+        part.import_pages(_worker_document(self, source), list(range(start, end)))
+        buffer = io.BytesIO()
+        part.save(buffer)
+        part.close()
+        return buffer.getvalue()
+
+
+class PyPDF2Backend(PDFBackend):
+    """기본 엔진: 파싱/텍스트/페이지 복사는 PyPDF2, 렌더링은 pdf2image(poppler)"""
+    name = 'pypdf2'
+    package = 'PyPDF2'
+
+    def available(self) -> bool:
+        return True
+
+    def open(self, source: PDFSource):
+        return _open_reader(source)
+
+    def close(self, document) -> None:
+        document.stream.close()
+
+    def page_count(self, source: PDFSource) -> int:
+        return len(_worker_reader(source).pages)
+
+    def extract_texts(self, source: PDFSource, start: int, end: int) -> List[str]:
+        reader = _worker_reader(source)
+        texts = [reader.pages[page_num].extract_text() for page_num in range(start, end)]
+        _release_parsed_objects(reader)
+        return texts
+
+    def render(self, source: PDFSource, dpi: int, start: int, end: int) -> list:
+        """
+        메모리 입력은 pdf2image가 poppler에 넘기려고 임시 파일로 쓰므로, 문서 전체 대신
+        해당 구간만 담은 작은 PDF를 만들어 넘깁니다.
+        """
+        if isinstance(source, str):
+            return convert_from_path(source, dpi=dpi, first_page=start + 1, last_page=end)
+        return convert_from_bytes(self.copy_pages(source, start, end), dpi=dpi)
+
+    def copy_pages(self, source: PDFSource, start: int, end: int) -> bytes:
+        reader = _worker_reader(source)
+        writer = PdfWriter()
+        for page_num in range(start, end):
+            writer.add_page(reader.pages[page_num])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        _release_parsed_objects(reader)
+        return buffer.getvalue()
+
+
+# 엔진 목록 (엔진 측정과 도움말에 이 순서로 표시)
+BACKENDS = {backend.name: backend for backend in (PyMuPDFBackend(), PdfiumBackend(), PyPDF2Backend())}
+
+
+def available_backends() -> List[str]:
+    """설치되어 있는 엔진 이름"""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def _calibrated_backend() -> Optional[str]:
+    """엔진 측정에서 권장된 엔진 (측정한 적이 없거나 그 엔진이 지금 없으면 None)"""
+    try:
+        with open(CALIBRATION_FILE, encoding='utf-8') as f:
+            name = json.load(f).get('recommended')
+    except (OSError, ValueError, AttributeError):
+        return None
+    return name if name in BACKENDS and BACKENDS[name].available() else None
+
+
+def save_calibration(calibration: dict) -> Optional[Path]:
+    """엔진 측정 결과를 사용자 폴더에 기록 (이후 'auto'가 권장 엔진을 사용), 실패하면 None"""
+    try:
+        CALIBRATION_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CALIBRATION_FILE, 'w', encoding='utf-8') as f:
+            json.dump(calibration, f, ensure_ascii=False, indent=2)
+    except OSError:
+        return None
+    return CALIBRATION_FILE
+
+
+def select_backend(name: str = 'auto') -> str:
+    """
+    사용할 PDF 엔진을 선택
+
+    'auto'이면 엔진 측정(pdf-processor.py --calibrate)에서 권장된 엔진을, 측정한 적이
+    없으면 DEFAULT_BACKEND를 사용합니다. 더 빠른 엔진이 설치되어 있어도 측정하거나
+    직접 고르기 전에는 출력이 바뀌지 않습니다.
+    선택은 환경 변수로 기록되어 이후 시작하는 워커 프로세스에도 적용됩니다.
+    """
+    if name == 'auto':
+        name = _calibrated_backend() or DEFAULT_BACKEND
+    elif name not in BACKENDS:
+        raise ValueError(f"알 수 없는 PDF 엔진: {name} (가능: {', '.join(BACKENDS)})")
+    elif not BACKENDS[name].available():
+        raise ValueError(f"PDF 엔진 '{name}'을(를) 사용하려면 설치가 필요합니다: "
+                         f"pip install {BACKENDS[name].package}")
+    os.environ[BACKEND_ENV] = name
+    return name
+
+
+def _backend() -> PDFBackend:
+    """현재 선택된 PDF 엔진 (선택하지 않았으면 'auto'와 같은 규칙)"""
+    backend = BACKENDS.get(os.environ.get(BACKEND_ENV, ''))
+    if backend is None or not backend.available():
+        backend = BACKENDS[_calibrated_backend() or DEFAULT_BACKEND]
+    return backend
+
+
+def _extract_page_range(source: PDFSource, start: int, end: int) -> List[str]:
+    """[start, end) 페이지의 텍스트를 추출 (워커 프로세스에서 실행, 구간마다 문서를 닫음)"""
+    backend = _backend()
+    try:
+        return backend.extract_texts(source, start, end)
+    finally:
+        _close_worker_document(backend.name)
+
+
+def _iter_page_texts(reader: 'PdfReader', source: PDFSource, workers: int = 1,
+                     pages_per_task: int = 20, start_page: int = 0,
+                     pages: Optional[List[int]] = None) -> Iterator[str]:
+    """
+    start_page(0부터 시작)부터 페이지 텍스트를 순서대로 반환
+    (pages를 주면 그 페이지들만, workers가 2 이상이면 페이지 구간을 병렬 추출)
+    """
+    if pages is None:
+        pages = range(start_page, len(reader.pages))
+    # 이어지는 페이지를 pages_per_task개까지 한 구간으로 묶음
+    tasks = []
+    for page_num in pages:
+        if tasks and tasks[-1][2] == page_num and page_num - tasks[-1][1] < pages_per_task:
+            tasks[-1] = (source, tasks[-1][1], page_num + 1)
+        else:
+            tasks.append((source, page_num, page_num + 1))
+    if workers > 1:
+        for texts in _iter_in_order(_extract_page_range, tasks, workers, source):
+            yield from texts
+    elif _backend().name == 'pypdf2':
+        # 이미 열어 둔 reader를 그대로 사용
+        for page_num in pages:
+            yield reader.pages[page_num].extract_text()
+            if (page_num + 1) % LAZY_RELEASE_PAGES == 0:
+                _release_parsed_objects(reader)
+    else:
+        for task in tasks:
+            yield from _extract_page_range(*task)
+
+
+def _text_index(source_name: str, offsets: List[int], total_bytes: int) -> dict:
+    """
+    텍스트의 페이지별 바이트 오프셋 인덱스
+
+    offsets[n]은 (n+1)페이지 구간이 시작하는 바이트 위치이며, 다음 페이지의
+    오프셋(마지막 페이지는 total_bytes)까지가 해당 페이지의 내용입니다.
+    """
+    return {
+        'source': source_name,
+        'encoding': 'utf-8',
+        'total_pages': len(offsets),
+        'total_bytes': total_bytes,
+        'offsets': offsets,
+    }
+
+
+def _write_text_index(index_file: Path, index: dict) -> None:
+    """페이지 인덱스를 JSON으로 저장"""
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+
+# 분할 파일마다 공통으로 들어가는 헤더/카탈로그/페이지 트리/xref/trailer 크기 (근사치, 바이트)
+_PART_BASE_BYTES = 1024
+# 간접 객체 하나당 "N 0 obj ... endobj" 래퍼와 xref 항목 크기 (근사치, 바이트)
+_OBJECT_OVERHEAD_BYTES = 40
+# 페이지 비용을 계산할 때 따라가지 않는 키 (페이지 트리/구조 트리로 거슬러 올라가는 참조)
+_COST_SKIPPED_KEYS = {'/Parent', '/P', '/StructParents', '/StructParent'}
+
+
+def _serialized_size(obj) -> int:
+    """PDF 객체를 PdfWriter와 같은 방식으로 직렬화했을 때의 크기 (바이트)"""
+    buffer = io.BytesIO()
+    obj.write_to_stream(buffer, None)
+    return buffer.tell() + _OBJECT_OVERHEAD_BYTES
+
+
+# 내용 스트림에서 이름으로 참조하는 페이지 리소스 종류
+_NAMED_RESOURCE_KEYS = ('/Font', '/XObject', '/ExtGState', '/ColorSpace', '/Pattern',
+                        '/Shading', '/Properties')
+_CONTENT_NAME = re.compile(rb'/([^\s/\[\]()<>{}%]*)')
+
+
+def _used_name(name: str, used: set) -> bool:
+    """리소스 이름이 내용 스트림에 나오는지 (ASCII가 아닌 이름은 확인할 수 없으므로 쓰는 것으로 봄)"""
+    return not name.isascii() or name[1:].encode() in used
+
+
+def _content_objects(resources, seen: set, used: Optional[set] = None) -> Iterator:
+    """
+    리소스 사전에서 자체 내용 스트림이 있는 객체(Form XObject, 타일 패턴, Type3 글꼴)를 차례로 반환
+
+    used를 주면 내용에 이름이 나오는 항목만 봅니다. 이미 본 간접 객체는 seen으로 건너뜁니다.
+    """
+    for category in ('/XObject', '/Pattern', '/Font'):
+        entries = resources.get(category)
+        entries = entries.get_object() if entries is not None else None
+        if not isinstance(entries, DictionaryObject):
+            continue
+        for name, value in entries.items():
+            if used is not None and not _used_name(name, used):
+                continue
+            if isinstance(value, IndirectObject):
+                if (value.idnum, value.generation) in seen:
+                    continue
+                seen.add((value.idnum, value.generation))
+            obj = value.get_object()
+            if isinstance(obj, DictionaryObject) and (obj.get('/Subtype') in ('/Form', '/Type3')
+                                                      or obj.get('/PatternType') == 1):
+                yield obj
+
+
+def _borrows_page_resources(obj, seen: set) -> bool:
+    """
+    내용 스트림이 있는 객체가 자체 /Resources 없이 페이지 리소스를 빌려 쓰는지 (안쪽 객체까지 확인)
+
+    PDF 1.1 방식의 Form XObject 등은 /Resources가 없으면 페이지의 리소스 이름을 그대로 쓰므로,
+    페이지 내용에 나오지 않는 이름도 필요할 수 있습니다.
+    """
+    resources = obj.get('/Resources')
+    resources = resources.get_object() if resources is not None else None
+    if not isinstance(resources, DictionaryObject):
+        return True
+    return any(_borrows_page_resources(inner, seen) for inner in _content_objects(resources, seen))
+
+
+def _appearance_streams(page) -> Iterator:
+    """페이지 주석의 모양 스트림(/AP의 /N, /R, /D와 그 상태별 스트림)을 차례로 반환"""
+    annots = page.get('/Annots')
+    annots = annots.get_object() if annots is not None else None
+    for annot in annots if isinstance(annots, ArrayObject) else []:
+        appearances = annot.get_object().get('/AP')
+        appearances = appearances.get_object() if appearances is not None else None
+        if not isinstance(appearances, DictionaryObject):
+            continue
+        for appearance in appearances.values():
+            appearance = appearance.get_object()
+            if isinstance(appearance, StreamObject):
+                yield appearance
+            elif isinstance(appearance, DictionaryObject):
+                yield from (state.get_object() for state in appearance.values())
+
+
+def _pruned_page_resources(page) -> Optional[DictionaryObject]:
+    """
+    페이지 내용 스트림에 이름이 한 번도 나오지 않는 리소스를 뺀 /Resources 사전 (원본 페이지는 그대로)
+
+    여러 페이지가 문서 전체의 글꼴/이미지를 담은 리소스 사전 하나를 함께 쓰는 PDF는
+    그대로 분할하면 파트마다 쓰지 않는 리소스까지 모두 들어갑니다. 공유 사전은 그대로
+    두고 쓰는 항목만 담은 새 사전을 반환하므로, 출력에 쓰는 페이지 사본에만 붙입니다.
+    뺄 항목이 없거나, 내용을 읽을 수 없거나, 이름에 이스케이프(#xx)가 있거나, 페이지가
+    쓰는 Form XObject/타일 패턴/Type3 글꼴 또는 주석 모양 스트림 중 (안쪽까지 포함해)
+    자체 /Resources가 없는 것이 있으면 None을 반환합니다.
+    """
+    resources = page.get('/Resources')
+    resources = resources.get_object() if resources is not None else None
+    if not isinstance(resources, DictionaryObject):
+        return None
+    try:
+        contents = page.get('/Contents')
+        contents = contents.get_object() if contents is not None else None
+        streams = [] if contents is None else (list(contents) if isinstance(contents, ArrayObject)
+                                               else [contents])
+        used = set()
+        for stream in streams:
+            used.update(_CONTENT_NAME.findall(stream.get_object().get_data()))
+        if any(b'#' in name for name in used):
+            return None
+        seen = set()
+        if any(_borrows_page_resources(obj, seen)
+               for obj in (*_content_objects(resources, seen, used), *_appearance_streams(page))):
+            return None
+    except Exception:
+        return None
+
+    pruned = DictionaryObject(resources)
+    removed = 0
+    for category in _NAMED_RESOURCE_KEYS:
+        entries = resources.get(category)
+        entries = entries.get_object() if entries is not None else None
+        if not isinstance(entries, DictionaryObject):
+            continue
+        kept = DictionaryObject((name, value) for name, value in entries.items()
+                                if _used_name(name, used))
+        if len(kept) < len(entries):
+            removed += len(entries) - len(kept)
+            pruned[NameObject(category)] = kept
+    return pruned if removed else None
+
+
+def _pruned_page_view(page) -> DictionaryObject:
+    """쓰지 않는 리소스를 뺀 페이지 사전의 얕은 사본 (뺄 것이 없으면 페이지 그대로, 크기/지문 계산용)"""
+    resources = _pruned_page_resources(page)
+    if resources is None:
+        return page
+    view = DictionaryObject(page)
+    view[NameObject('/Resources')] = resources
+    return view
+
+
+def _page_cost_index(reader: 'PdfReader') -> List[Tuple[int, Dict[Tuple[int, int], int]]]:
+    """
+    페이지별 실제 직렬화 비용 인덱스 생성
+
+    각 페이지마다 (페이지 객체 크기, {참조하는 간접 객체 번호: 직렬화 크기})를 반환합니다.
+    콘텐츠 스트림, XObject, 폰트 등 여러 페이지가 공유하는 객체는 같은 번호로 나타나므로
+    한 분할 파일 안에서는 한 번만 계산할 수 있습니다. 분할 파일에 쓰는 것과 같게
+    페이지마다 쓰지 않는 리소스를 먼저 제외하고, 내용이 같은 스트림은 처음 나온
+    스트림의 번호로 기록합니다 (분할 파일 안에서 하나로 합쳐지므로). 다른 페이지를
+    가리키는 참조(/Annots의 링크 대상 등)는 그 페이지의 내용까지 따라가지 않습니다.
+    """
+    page_refs = {(page.indirect_reference.idnum, page.indirect_reference.generation)
+                 for page in reader.pages if page.indirect_reference is not None}
+    object_sizes = {}
+    canonical_keys = {}
+    first_by_digest = {}
+    cost_index = []
+
+    for page_num, page in enumerate(reader.pages):
+        if page_num and page_num % LAZY_RELEASE_PAGES == 0:
+            _release_parsed_objects(reader)
+        page = _pruned_page_view(page)
+        referenced = {}
+        visited = set()
+        stack = list(value for key, value in page.items() if key not in _COST_SKIPPED_KEYS)
+
+        while stack:
+            current = stack.pop()
+            if isinstance(current, IndirectObject):
+                key = (current.idnum, current.generation)
+                if key in visited or key in page_refs:
+                    continue
+                visited.add(key)
+                resolved = current.get_object()
+                if key not in object_sizes:
+                    object_sizes[key] = _serialized_size(resolved)
+                    canonical_keys[key] = (first_by_digest.setdefault(_stream_digest(resolved), key)
+                                           if isinstance(resolved, StreamObject) else key)
+                referenced[canonical_keys[key]] = object_sizes[key]
+                stack.append(resolved)
+            elif isinstance(current, DictionaryObject):
+                stack.extend(value for key, value in current.items()
+                             if key not in _COST_SKIPPED_KEYS)
+            elif isinstance(current, ArrayObject):
+                stack.extend(current)
+
+        cost_index.append((_serialized_size(page), referenced))
+
+    _release_parsed_objects(reader)
+    return cost_index
+
+
+def _plan_size_split(cost_index: List[Tuple[int, Dict[Tuple[int, int], int]]],
+                     max_bytes: int) -> List[Tuple[int, int, int]]:
+    """
+    연속된 페이지를 max_bytes 이하가 되도록 묶는 분할 계획 생성
+
+    Returns:
+        (시작 페이지, 끝 페이지(미포함), 예상 크기) 리스트.
+        한 페이지만으로 max_bytes를 넘으면 그 페이지 단독으로 한 파일이 됩니다.
+    """
+    plan = []
+    start = 0
+    part_objects = {}
+    part_bytes = _PART_BASE_BYTES
+
+    for page_num, (page_bytes, referenced) in enumerate(cost_index):
+        added = page_bytes + sum(size for key, size in referenced.items() if key not in part_objects)
+
+        if page_num > start and part_bytes + added > max_bytes:
+            plan.append((start, page_num, part_bytes))
+            start = page_num
+            part_objects = {}
+            part_bytes = _PART_BASE_BYTES
+            added = page_bytes + sum(referenced.values())
+
+        part_objects.update(referenced)
+        part_bytes += added
+
+    if cost_index:
+        plan.append((start, len(cost_index), part_bytes))
+
+    return plan
+
+
+def _stream_digest(stream) -> bytes:
+    """스트림 사전(/Length 제외)과 데이터가 같으면 같은 값이 되는 해시"""
+    header = io.BytesIO()
+    for key in sorted(key for key in stream if key != '/Length'):
+        header.write(key.encode() + b' ')
+        dict.__getitem__(stream, key).write_to_stream(header, None)
+        header.write(b'\n')
+    return hashlib.sha1(header.getvalue() + stream._data).digest()
+
+
+def _write_part(source: PDFSource, start: int, end: int, backend_name: str = 'pypdf2',
+                reader: Optional['PdfReader'] = None) -> Tuple[bytes, float, float, int]:
+    """
+    [start, end) 페이지로 분할 파일 하나를 만듦 (워커 프로세스에서도 실행)
+
+    PyPDF2로 만들 때는 _StreamingPDFWriter로 페이지마다 쓰지 않는 리소스를 빼고, 파일 안의
+    중복 스트림은 한 번만 씁니다. (PDF 바이트, 조립 시간, 쓰기 시간, 합친 중복 객체 수)를 반환합니다.
+    """
+    started = time.perf_counter()
+    if backend_name != 'pypdf2':
+        data = BACKENDS[backend_name].copy_pages(source, start, end)
+        return data, 0.0, time.perf_counter() - started, 0
+
+    reader = reader or _worker_reader(source)
+    buffer = io.BytesIO()
+    writer = _StreamingPDFWriter(buffer)
+    for page_num in range(start, end):
+        writer.add_page(reader.pages[page_num], prune=True)
+    assemble_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    writer.close()
+    _release_parsed_objects(reader)
+    return buffer.getvalue(), assemble_s, time.perf_counter() - started, writer.deduplicated_streams
+
+
+def _iter_part_bytes(reader: 'PdfReader', source: PDFSource, page_ranges: List[Tuple[int, int]],
+                     workers: int = 1, backend_name: str = 'pypdf2') -> Iterator[Tuple[bytes, float, float, int]]:
+    """
+    페이지 구간마다 _write_part 결과를 순서대로 반환
+
+    workers가 2 이상이면 분할 파일들을 프로세스 풀에서 동시에 직렬화합니다 (동시에
+    메모리에 있는 결과는 워커 수의 2배 이하). 1이면 이미 열어 둔 reader를 그대로 씁니다.
+    """
+    if workers <= 1:
+        for start, end in page_ranges:
+            yield _write_part(source, start, end, backend_name, reader)
+        return
+
+    tasks = [(source, start, end, backend_name) for start, end in page_ranges]
+    yield from _iter_in_order(_write_part, tasks, workers, source)
+
+
+def _shared_resource_bytes(cost_index: List[Tuple[int, Dict[Tuple[int, int], int]]],
+                           page_ranges: List[Tuple[int, int]]) -> int:
+    """여러 분할 파일에 함께 들어가는 공유 객체(글꼴, 이미지 등)가 중복으로 차지하는 크기 (바이트)"""
+    total = 0
+    unique = {}
+    for start, end in page_ranges:
+        part_objects = {}
+        for _, referenced in cost_index[start:end]:
+            part_objects.update(referenced)
+        total += sum(part_objects.values())
+        unique.update(part_objects)
+    return total - sum(unique.values())
+
+
+# 목표 크기 압축(--target-mb) 설정
+TARGET_QUALITIES = (25, 35, 45, 55, 65, 75, 85)
+TARGET_DPIS = (72, 100, 120, 150, 200)
+TARGET_SAMPLE_PAGES = 4   # 크기 모델을 만들 때 실제로 인코딩해 볼 페이지 수
+TARGET_SAFETY = 0.95      # 예측 오차를 감안해 목표 크기의 이 비율 안으로 맞춤
+
+
+def _raster_page_bytes(image_bytes: bytes) -> int:
+    """인코딩된 페이지를 담았을 때 출력 PDF에서 차지하는 크기 (이미지/내용 스트림, 리소스, 페이지 객체, xref 항목)"""
+    writer = _StreamingPDFWriter(io.BytesIO())
+    header_bytes = writer.position
+    # 페이지 크기는 숫자 몇 자리라 크기 추정에 영향이 없으므로 A4로 둠
+    writer.add_raster(image_bytes, page_size=(595.0, 842.0))
+    return writer.position - header_bytes + 4 * 20
+
+
+def _sample_size_profile(source: PDFSource, page_num: int, qualities: Tuple[int, ...],
+                         dpis: Tuple[int, ...],
+                         color_mode: str = 'auto') -> Tuple[List[int], List[int]]:
+    """
+    샘플 페이지 하나를 가장 높은 DPI로 렌더링한 뒤 품질별/DPI별 출력 크기 측정 (워커 프로세스에서도 실행)
+
+    품질은 가장 높은 DPI에서, DPI는 중간 품질에서만 바꿔 보므로 조합 수 대신
+    품질 수 + DPI 수 번만 인코딩합니다.
+    """
+    top_dpi = max(dpis)
+    reference_quality = qualities[len(qualities) // 2]
+    image = _render_pages(source, top_dpi, page_num, page_num)[0]
+
+    by_quality = [_raster_page_bytes(_encode_page(image, quality, color_mode))
+                  for quality in qualities]
+    by_dpi = []
+    for dpi in dpis:
+        scaled = image
+        if dpi != top_dpi:
+            scaled = image.resize((max(1, round(image.width * dpi / top_dpi)),
+                                   max(1, round(image.height * dpi / top_dpi))), PIL.Image.LANCZOS)
+        by_dpi.append(_raster_page_bytes(_encode_page(scaled, reference_quality, color_mode)))
+    image.close()
+    return by_quality, by_dpi
+
+
+def _kept_pages_bytes(cost_index: List[Tuple[int, Dict[Tuple[int, int], int]]],
+                      pages: List[int]) -> int:
+    """래스터화하지 않고 그대로 복사할 페이지(0부터 시작)의 예상 출력 크기 (공유 객체는 한 번만)"""
+    objects = {}
+    total = _PART_BASE_BYTES
+    for page_num in pages:
+        page_bytes, referenced = cost_index[page_num]
+        total += page_bytes
+        objects.update(referenced)
+    return total + sum(objects.values())
+
+
+def _plan_target_compression(source: PDFSource, raster_pages: List[int], kept_bytes: int,
+                             target_bytes: int, workers: int = 1,
+                             color_mode: str = 'auto') -> dict:
+    """
+    목표 크기에 맞는 JPEG 품질/DPI를 샘플 페이지로 예측
+
+    래스터화할 페이지(1부터 시작) 중 고르게 뽑은 몇 페이지만 인코딩해 보고,
+    크기(품질, DPI) = 크기(품질, 최대 DPI) x 크기(기준 품질, DPI) / 크기(기준 품질, 최대 DPI)
+    모델로 모든 조합의 페이지당 크기를 추정합니다. 목표 안에 드는 조합 중 예상 크기가
+    가장 큰(화질이 가장 좋은) 조합을 고르며, 맞는 조합이 없으면 가장 작은 조합을 고릅니다.
+
+    Returns:
+        quality, dpi, predicted_bytes, fits(목표 안에 드는지), sampled_pages
+    """
+    started = time.perf_counter()
+    count = min(TARGET_SAMPLE_PAGES, len(raster_pages))
+    if count <= 1:
+        sampled = raster_pages[:count]
+    else:
+        sampled = sorted({raster_pages[round(i * (len(raster_pages) - 1) / (count - 1))]
+                          for i in range(count)})
+
+    tasks = [(source, page_num, TARGET_QUALITIES, TARGET_DPIS, color_mode) for page_num in sampled]
+    profiles = list(_iter_in_order(_sample_size_profile, tasks, workers, source))
+
+    top_index = TARGET_DPIS.index(max(TARGET_DPIS))
+    candidates = []
+    for quality_index, quality in enumerate(TARGET_QUALITIES):
+        for dpi_index, dpi in enumerate(TARGET_DPIS):
+            per_page = [by_quality[quality_index] * by_dpi[dpi_index] / by_dpi[top_index]
+                        for by_quality, by_dpi in profiles]
+            raster_bytes = sum(per_page) / len(per_page) * len(raster_pages) if per_page else 0
+            candidates.append((int(raster_bytes + kept_bytes), quality, dpi))
+    candidates.sort()
+
+    budget = target_bytes * TARGET_SAFETY
+    fitting = [candidate for candidate in candidates if candidate[0] <= budget]
+    predicted_bytes, quality, dpi = fitting[-1] if fitting else candidates[0]
+
+    return {
+        'quality': quality,
+        'dpi': dpi,
+        'predicted_bytes': predicted_bytes,
+        'fits': bool(fitting),
+        'sampled_pages': sampled,
+        'elapsed_s': round(time.perf_counter() - started, 3),
+    }
+
+
+# 페이지 분류 기준 (바이트)
+TEXT_CONTENT_BYTES = 200        # 폰트가 있고 콘텐츠가 이보다 크면 텍스트 페이지
+IMAGE_PAGE_BYTES = 32 * 1024    # 이미지 데이터가 이보다 크면 이미지 페이지
+BLANK_CONTENT_BYTES = 100       # 이미지 없이 콘텐츠가 이보다 작으면 빈 페이지
+
+
+# 내용 스트림 안에 직접 들어 있는 인라인 이미지 (BI 사전 ID 데이터 EI)
+_INLINE_IMAGE = re.compile(rb'(?<![^\s])BI\s.*?\sID\s(.*?)\sEI(?![^\s])', re.DOTALL)
+
+
+def _add_content_info(info: dict, stream) -> None:
+    """
+    내용 스트림 크기를 info에 더함 (인라인 이미지는 내용 대신 이미지로 셈)
+
+    인라인 이미지 데이터는 풀어 놓은 내용에서 찾으므로, 내용 크기에서는 그 비율만큼
+    원래(압축된) 크기를 뺍니다. 풀 수 없는 스트림은 전부 내용으로 봅니다.
+    """
+    raw_bytes = len(stream._data or b'')
+    try:
+        data = stream.get_data()
+    except Exception:
+        data = b''
+    inline_bytes = 0
+    if b'ID' in data:
+        for match in _INLINE_IMAGE.finditer(data):
+            info['image_count'] += 1
+            inline_bytes += len(match.group(1))
+    info['image_bytes'] += inline_bytes
+    info['content_bytes'] += raw_bytes - raw_bytes * inline_bytes // max(1, len(data))
+
+
+def _add_resource_info(info: dict, resources, depth: int = 0) -> None:
+    """리소스 사전의 폰트/이미지 정보를 info에 더함 (Form XObject는 내부까지 확인)"""
+    resources = resources.get_object() if resources is not None else None
+    if not resources:
+        return
+
+    fonts = resources.get('/Font')
+    info['font_count'] += len(fonts.get_object()) if fonts is not None else 0
+
+    xobjects = resources.get('/XObject')
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    for xobject in xobjects.values():
+        xobject = xobject.get_object()
+        subtype = xobject.get('/Subtype')
+        if subtype == '/Image':
+            info['image_count'] += 1
+            info['image_bytes'] += len(xobject._data or b'')
+        elif subtype == '/Form' and depth < 3:
+            _add_content_info(info, xobject)
+            _add_resource_info(info, xobject.get('/Resources'), depth + 1)
+
+
+def _page_structure(page) -> dict:
+    """텍스트 레이아웃 없이 페이지 사전만 읽어 콘텐츠/폰트/이미지(인라인 이미지 포함) 크기 정보 수집"""
+    contents = page.get('/Contents')
+    contents = contents.get_object() if contents is not None else None
+    if contents is None:
+        streams = []
+    elif isinstance(contents, ArrayObject):
+        streams = [stream.get_object() for stream in contents]
+    else:
+        streams = [contents]
+
+    info = {
+        'content_bytes': 0,
+        'font_count': 0,
+        'image_count': 0,
+        'image_bytes': 0,
+    }
+    for stream in streams:
+        _add_content_info(info, stream)
+    _add_resource_info(info, page.get('/Resources'))
+    return info
+
+
+def _classify_page(info: dict, text_bytes: int = TEXT_CONTENT_BYTES,
+                   image_bytes: int = IMAGE_PAGE_BYTES,
+                   blank_bytes: int = BLANK_CONTENT_BYTES) -> str:
+    """페이지 구조 정보로 text / image / mixed / blank 분류 (기준값은 바꿔서 넘길 수 있음)"""
+    has_text = info['font_count'] > 0 and info['content_bytes'] >= text_bytes
+    has_image = info['image_bytes'] >= image_bytes
+
+    if has_image and has_text:
+        return 'mixed'
+    if has_image:
+        return 'image'
+    if has_text:
+        return 'text'
+    if info['image_count'] == 0 and info['content_bytes'] < blank_bytes:
+        return 'blank'
+    return 'image' if info['image_count'] > 0 else 'text'
+
+
+# 메모리 입력에 name을 주지 않았을 때 출력 파일 이름에 쓰는 기본 이름
+IN_MEMORY_NAME = 'document.pdf'
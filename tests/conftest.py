@@ -0,0 +1,91 @@
+"""
+auto-pdf.py / pdf-processor.py 테스트 공통 설정
+
+스크립트 이름에 '-'가 있어 import할 수 없으므로 파일에서 직접 모듈로 불러옵니다.
+렌더링은 poppler 없이 되는 pypdfium2 엔진을 사용합니다 (없으면 해당 테스트 건너뜀).
+"""
+
+import importlib.util
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pdf_common  # noqa: E402
+
+
+def _load_script(module_name: str, file_name: str):
+    spec = importlib.util.spec_from_file_location(module_name, ROOT / file_name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def auto_pdf():
+    return _load_script('auto_pdf', 'auto-pdf.py')
+
+
+@pytest.fixture(scope='session')
+def pdf_processor():
+    return _load_script('pdf_processor', 'pdf-processor.py')
+
+
+@pytest.fixture(autouse=True)
+def user_cache(tmp_path, monkeypatch, auto_pdf):
+    """엔진 측정 기록과 처리 속도 기록을 사용자 폴더 대신 테스트 폴더에 둠"""
+    monkeypatch.setattr(pdf_common, 'CALIBRATION_FILE', tmp_path / 'cache' / 'calibration.json')
+    monkeypatch.setattr(auto_pdf, 'THROUGHPUT_FILE', tmp_path / 'cache' / 'throughput.json')
+    return tmp_path / 'cache'
+
+
+@pytest.fixture
+def render_backend(monkeypatch):
+    """렌더링이 필요한 테스트에서 pdfium 엔진 사용 (사용자 엔진 측정 기록은 무시)"""
+    if not pdf_common.BACKENDS['pdfium'].available():
+        pytest.skip("pypdfium2가 설치되어 있지 않습니다")
+    monkeypatch.setenv(pdf_common.BACKEND_ENV, 'pdfium')
+    yield 'pdfium'
+    for name in list(pdf_common._worker_documents):
+        pdf_common._close_worker_document(name)
+
+
+def make_pdf(path: Path, pages: int = 6, edited_page: int = None, image_every: int = 3) -> Path:
+    """
+    텍스트 페이지와 사진 페이지가 섞인 테스트용 PDF 생성
+
+    image_every 페이지마다 노이즈 이미지가 들어가고, edited_page(0부터 시작)를 주면 그 페이지의
+    문구만 바꿉니다. 같은 인자로 만들면 페이지 내용이 같습니다.
+    """
+    import random
+
+    import PIL.Image
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    generator = random.Random(7)
+    document = canvas.Canvas(str(path), pagesize=(595, 842), invariant=1)
+    for page_num in range(pages):
+        label = 'edited' if page_num == edited_page else 'original'
+        for line in range(30):
+            document.drawString(40, 800 - line * 20, f"page {page_num + 1} line {line} {label} text")
+        if image_every and page_num % image_every == image_every - 1:
+            pixels = bytes(generator.randrange(256) for _ in range(120 * 90 * 3))
+            image = PIL.Image.frombytes('RGB', (120, 90), pixels)
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG')
+            document.drawImage(ImageReader(io.BytesIO(buffer.getvalue())), 100, 200,
+                               width=360, height=270)
+        document.showPage()
+    document.save()
+    return path
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    return make_pdf(tmp_path / 'sample.pdf')
@@ -0,0 +1,186 @@
+"""처리 결과 캐시 키/정리와 체크포인트 저널 이어서 처리"""
+
+import threading
+import time
+import zlib
+
+import pytest
+
+
+@pytest.fixture
+def cache(auto_pdf, tmp_path):
+    return auto_pdf.ResultCache(tmp_path / 'out')
+
+
+def _params(**changes):
+    params = {'quality': 40, 'dpi': 150, 'color_mode': 'auto', 'backend': 'pypdf2'}
+    params.update(changes)
+    return params
+
+
+def test_cache_key_depends_on_settings_and_version(auto_pdf, monkeypatch):
+    key = auto_pdf.ResultCache.make_key('abc', 'compress', _params())
+
+    assert key == auto_pdf.ResultCache.make_key('abc', 'compress', _params())
+    assert key != auto_pdf.ResultCache.make_key('abc', 'compress', _params(backend='pdfium'))
+    assert key != auto_pdf.ResultCache.make_key('abc', 'compress', _params(color_mode='gray'))
+    assert key != auto_pdf.ResultCache.make_key('abc', 'split_aggressive', _params())
+    monkeypatch.setattr(auto_pdf, 'CACHE_VERSION', auto_pdf.CACHE_VERSION + 1)
+    assert key != auto_pdf.ResultCache.make_key('abc', 'compress', _params())
+
+
+def test_processor_cache_params_include_backend_and_color_mode(auto_pdf, sample_pdf, tmp_path):
+    processor = auto_pdf.AutoPDFProcessor(str(sample_pdf), str(tmp_path / 'out'), color_mode='gray')
+
+    params = processor.cache_params()
+    assert params['color_mode'] == 'gray'
+    assert params['backend'] == auto_pdf._backend().name
+
+
+def test_cache_lookup_rejects_changed_output(cache, sample_pdf):
+    output = cache.output_dir / 'sample_text.txt'
+    output.write_bytes(b'text')
+    cache.store('key', sample_pdf, 'extract_text', _params(), [output])
+
+    assert cache.lookup('key')['strategy'] == 'extract_text'
+    output.write_bytes(b'TEXT')
+    assert cache.lookup('key') is None
+
+
+@pytest.mark.parametrize('delete_outputs', [False, True])
+def test_cache_eviction_deletes_outputs_only_when_asked(auto_pdf, sample_pdf, tmp_path,
+                                                        delete_outputs):
+    cache = auto_pdf.ResultCache(tmp_path / 'out', max_size_mb=0.00001,
+                                 delete_outputs=delete_outputs)
+    old_output = cache.output_dir / 'old.pdf'
+    new_output = cache.output_dir / 'new.pdf'
+    old_output.write_bytes(b'x' * 100)
+    new_output.write_bytes(b'y' * 100)
+    cache.store('old', sample_pdf, 'compress', _params(), [old_output])
+    time.sleep(0.01)
+    cache.store('new', sample_pdf, 'compress', _params(), [new_output])
+
+    assert list(cache._load()['entries']) == ['new']
+    assert old_output.exists() is not delete_outputs
+    assert new_output.exists()
+
+
+def test_cache_lock_waits_for_holder_instead_of_breaking_it(cache, auto_pdf, sample_pdf):
+    other = auto_pdf.ResultCache(cache.output_dir)
+    hashed = threading.Event()
+
+    def hash_file():
+        other.file_hash(sample_pdf)
+        hashed.set()
+
+    with cache._locked():
+        thread = threading.Thread(target=hash_file)
+        thread.start()
+        assert not hashed.wait(0.3)
+    thread.join(5)
+    assert hashed.is_set()
+    assert str(sample_pdf.resolve()) in cache._load()['files']
+
+
+def test_cache_lock_file_left_by_crashed_process_does_not_block(cache, sample_pdf):
+    cache.lock_path.write_bytes(b'')
+    started = time.monotonic()
+
+    cache.file_hash(sample_pdf)
+
+    assert time.monotonic() - started < 5
+
+
+@pytest.fixture
+def identity():
+    return {'source': '/data/doc.pdf', 'size': 100, 'mtime_ns': 1, 'strategy': 'compress',
+            'params': {'quality': 40}}
+
+
+def test_journal_resumes_recorded_pages(auto_pdf, tmp_path, identity):
+    journal = auto_pdf.CheckpointJournal(tmp_path, 'doc', identity)
+    journal.record_page(3, b'jpeg page 3', 40, 150)
+    journal.save()
+
+    resumed = auto_pdf.CheckpointJournal(tmp_path, 'doc', identity)
+    assert resumed.has_progress
+    assert resumed.has_page(3, 40, 150)
+    assert not resumed.has_page(3, 50, 150)
+    assert resumed.load_page(3) == b'jpeg page 3'
+
+
+def test_journal_drops_corrupted_page(auto_pdf, tmp_path, identity):
+    journal = auto_pdf.CheckpointJournal(tmp_path, 'doc', identity)
+    journal.record_page(1, b'jpeg page 1', 40, 150)
+    journal.save()
+    journal._page_path(1).write_bytes(b'jpeg page X')
+
+    assert auto_pdf.CheckpointJournal(tmp_path, 'doc', identity).load_page(1) is None
+
+
+def test_journal_restarts_when_input_changes(auto_pdf, tmp_path, identity):
+    journal = auto_pdf.CheckpointJournal(tmp_path, 'doc', identity)
+    journal.record_page(1, b'jpeg page 1', 40, 150)
+    journal.save()
+
+    changed = auto_pdf.CheckpointJournal(tmp_path, 'doc', dict(identity, size=200))
+    assert not changed.has_progress
+    assert not journal.pages_dir.exists()
+
+
+def test_journal_text_progress_checks_partial_file(auto_pdf, tmp_path, identity):
+    partial = tmp_path / 'doc_text.txt.partial'
+    partial.write_bytes(b'page one\npage two')
+    journal = auto_pdf.CheckpointJournal(tmp_path, 'doc', identity)
+    journal.record_text(1, 8, zlib.crc32(b'page one'), [0])
+
+    resumed = auto_pdf.CheckpointJournal(tmp_path, 'doc', identity)
+    assert resumed.text_progress(partial) == {'pages': 1, 'bytes': 8,
+                                              'crc32': zlib.crc32(b'page one'), 'offsets': [0]}
+    partial.write_bytes(b'page 0ne\npage two')
+    assert resumed.text_progress(partial) is None
+
+
+def test_process_saves_journal_when_processing_fails(auto_pdf, sample_pdf, tmp_path, monkeypatch):
+    processor = auto_pdf.AutoPDFProcessor(str(sample_pdf), str(tmp_path / 'out'))
+    monkeypatch.setattr(processor, 'CHECKPOINT_MIN_SECONDS', 0)
+
+    def fail():
+        processor.journal.record_page(1, b'jpeg page 1', 40, 150)
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(processor, '_extract_text', fail)
+
+    assert processor.process('extract_text') == []
+    assert processor.journal.path.exists()
+    resumed = auto_pdf.CheckpointJournal(tmp_path / 'out', 'sample', processor.journal.identity)
+    assert resumed.has_page(1, 40, 150)
+
+
+def test_throughput_is_measured_once_per_file(auto_pdf, sample_pdf, tmp_path, render_backend,
+                                              monkeypatch):
+    processor = auto_pdf.AutoPDFProcessor(str(sample_pdf), str(tmp_path / 'out'))
+    profile = processor.prescan()
+    first = processor.throughput(profile)
+
+    monkeypatch.setattr(processor, 'measure_throughput', lambda profile: pytest.fail("measured again"))
+    second = processor.throughput(profile)
+
+    assert not first['cached'] and second['cached']
+    assert second['raster_s_per_page'] == first['raster_s_per_page']
+
+
+def test_watcher_rejects_output_in_watched_folder(auto_pdf, tmp_path):
+    with pytest.raises(ValueError):
+        auto_pdf.FolderWatcher(tmp_path, str(tmp_path / '.'))
+    assert auto_pdf.FolderWatcher(tmp_path).status_file.parent == tmp_path / 'processed'
+
+
+def test_batch_pool_size_divides_budget_by_workers(auto_pdf, sample_pdf, monkeypatch):
+    monkeypatch.setattr(auto_pdf.os, 'cpu_count', lambda: 16)
+    files = [sample_pdf] * 16
+    budget = auto_pdf.BATCH_JOB_BASE_MB * 8 + 100
+
+    assert auto_pdf._batch_pool_size(files, budget) == 8
+    assert auto_pdf._batch_pool_size(files, budget, workers=4) == 2
+    assert auto_pdf._batch_pool_size(files, budget * 100, workers=4) == 4
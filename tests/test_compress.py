@@ -0,0 +1,172 @@
+"""래스터 압축: 구간별 렌더링, 인코딩 결과 그대로 넣기, 증분 재사용"""
+
+import io
+
+import PIL.Image
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+
+import pdf_common
+from conftest import make_pdf
+
+
+@pytest.fixture
+def rendered_windows(monkeypatch):
+    """렌더링한 페이지 구간 (1부터 시작, 끝 포함) 기록"""
+    windows = []
+    render_pages = pdf_common._render_pages
+
+    def recording_render(source, dpi, first_page, last_page):
+        windows.append((first_page, last_page))
+        return render_pages(source, dpi, first_page, last_page)
+
+    monkeypatch.setattr(pdf_common, '_render_pages', recording_render)
+    return windows
+
+
+def test_iter_encoded_pages_renders_fixed_windows(sample_pdf, render_backend, rendered_windows):
+    pages = [1, 2, 3, 4, 5, 6]
+    encoded = list(pdf_common._iter_encoded_pages(str(sample_pdf), pages, 40, 4, dpi=50))
+
+    assert rendered_windows == [(1, 4), (5, 6)]
+    assert [page_num for page_num, _ in encoded] == pages
+    assert all(image_bytes for _, image_bytes in encoded)
+
+
+def test_iter_encoded_pages_does_not_join_separate_pages(sample_pdf, render_backend,
+                                                         rendered_windows):
+    encoded = list(pdf_common._iter_encoded_pages(str(sample_pdf), [1, 2, 5], 40, 10, dpi=50))
+
+    assert rendered_windows == [(1, 2), (5, 5)]
+    assert [page_num for page_num, _ in encoded] == [1, 2, 5]
+
+
+def test_streaming_writer_embeds_jpeg_without_reencoding():
+    image = PIL.Image.new('RGB', (200, 100), (200, 40, 90))
+    jpeg = pdf_common._encode_page(image, 33, 'color')
+    buffer = io.BytesIO()
+    writer = pdf_common._StreamingPDFWriter(buffer)
+    writer.add_raster(jpeg, page_size=(200, 100))
+    writer.add_raster(jpeg, page_size=(200, 100))
+    writer.close()
+
+    reader = PdfReader(io.BytesIO(buffer.getvalue()))
+    assert len(reader.pages) == 2
+    images = [page['/Resources']['/XObject'] for page in reader.pages]
+    streams = [xobject[name].get_object() for xobject in images for name in xobject]
+    assert all(stream['/Filter'] == '/DCTDecode' for stream in streams)
+    assert all(stream._data == jpeg for stream in streams)
+    assert writer.unique_images == 1
+
+
+def test_streaming_writer_sets_page_size_per_page():
+    image = PIL.Image.new('RGB', (300, 150), (200, 40, 90))
+    jpeg = pdf_common._encode_page(image, 33, 'color')
+    buffer = io.BytesIO()
+    writer = pdf_common._StreamingPDFWriter(buffer)
+    writer.add_raster(jpeg, page_size=(595, 842))
+    writer.add_raster(jpeg, page_size=(842, 595))
+    writer.add_raster(jpeg, page_size=(595, 842))
+    with pytest.raises(ValueError):
+        writer.add_raster(jpeg)
+    writer.close()
+
+    reader = PdfReader(io.BytesIO(buffer.getvalue()))
+    sizes = [(float(page.mediabox.width), float(page.mediabox.height)) for page in reader.pages]
+    assert sizes == [(595, 842), (842, 595), (595, 842)]
+    assert [page.get_contents().get_data() for page in reader.pages] == [
+        b'q 595.0000 0 0 842.0000 0 0 cm /Im0 Do Q', b'q 842.0000 0 0 595.0000 0 0 cm /Im0 Do Q',
+        b'q 595.0000 0 0 842.0000 0 0 cm /Im0 Do Q']
+    assert writer.unique_images == 1
+
+
+def test_compressed_output_has_every_page(sample_pdf, render_backend, pdf_processor):
+    processor = pdf_processor.PDFProcessor(str(sample_pdf))
+    data = processor.compress_images_bytes(quality=40, batch_size=4, mode='raster')
+
+    assert len(PdfReader(io.BytesIO(data)).pages) == 6
+
+
+def test_incremental_compress_reuses_unchanged_pages(tmp_path, render_backend, auto_pdf, capsys):
+    source = make_pdf(tmp_path / 'doc.pdf', pages=6)
+    output_dir = tmp_path / 'out'
+    processor = auto_pdf.AutoPDFProcessor(str(source), str(output_dir), compress_mode='raster',
+                                          incremental=True)
+    processor.process('compress')
+
+    make_pdf(source, pages=6, edited_page=2)
+    processor = auto_pdf.AutoPDFProcessor(str(source), str(output_dir), compress_mode='raster',
+                                          incremental=True)
+    capsys.readouterr()
+    [output] = processor.process('compress')
+    assert '바뀌지 않은 5페이지는 이전 압축 결과를 재사용합니다' in capsys.readouterr().out
+
+    fresh = auto_pdf.AutoPDFProcessor(str(source), str(tmp_path / 'fresh'), compress_mode='raster')
+    [expected] = fresh.process('compress')
+    assert output.read_bytes() == expected.read_bytes()
+
+
+@pytest.mark.parametrize('data, is_jpeg', [(b'\x00' * 10, False), (b'\xff\xd8 broken', True)])
+def test_recompress_image_keeps_unreadable_data(data, is_jpeg):
+    assert pdf_common._recompress_image(data, is_jpeg, 'RGB', (20, 20), (10, 10), 40, 'jpeg') is None
+
+
+def test_target_mb_is_rejected_in_images_mode(sample_pdf, auto_pdf, pdf_processor, tmp_path):
+    with pytest.raises(ValueError):
+        auto_pdf.AutoPDFProcessor(str(sample_pdf), str(tmp_path), compress_mode='images',
+                                  target_mb=1)
+    with pytest.raises(ValueError):
+        pdf_processor.PDFProcessor(str(sample_pdf)).compress_images_bytes(mode='images', target_mb=1)
+
+
+def _page_sizes(pdf) -> list:
+    reader = PdfReader(pdf if isinstance(pdf, io.BytesIO) else str(pdf))
+    return [(round(float(page.mediabox.width)), round(float(page.mediabox.height)))
+            for page in reader.pages]
+
+
+def test_hybrid_output_keeps_page_sizes(sample_pdf, render_backend, auto_pdf, tmp_path):
+    processor = auto_pdf.AutoPDFProcessor(str(sample_pdf), str(tmp_path / 'out'),
+                                          compress_mode='hybrid')
+    [output] = processor.process('compress')
+
+    assert _page_sizes(output) == _page_sizes(sample_pdf) == [(595, 842)] * 6
+
+
+def test_raster_page_of_rotated_page_is_shown_the_same_way(sample_pdf, render_backend,
+                                                           pdf_processor, tmp_path):
+    writer = PdfWriter()
+    for page in PdfReader(str(sample_pdf)).pages:
+        writer.add_page(page)
+    writer.pages[2].rotate(90)
+    rotated = tmp_path / 'rotated.pdf'
+    with open(rotated, 'wb') as f:
+        writer.write(f)
+
+    data = pdf_processor.PDFProcessor(str(rotated)).compress_images_bytes(mode='raster')
+
+    assert _page_sizes(io.BytesIO(data))[2] == (842, 595)
+    assert PdfReader(io.BytesIO(data)).pages[2].get('/Rotate') is None
+
+
+
+def test_target_size_changes_encoding_not_page_size(sample_pdf, render_backend, pdf_processor,
+                                                    monkeypatch):
+    monkeypatch.setattr(pdf_common, 'TARGET_DPIS', (72, 200))
+    monkeypatch.setattr(pdf_common, 'TARGET_QUALITIES', (25, 85))
+    monkeypatch.setattr(pdf_common, 'TARGET_SAMPLE_PAGES', 1)
+    plan_target = pdf_common._plan_target_compression
+    chosen_dpis = []
+
+    def recording_plan(*args, **kwargs):
+        plan = plan_target(*args, **kwargs)
+        chosen_dpis.append(plan['dpi'])
+        return plan
+
+    monkeypatch.setattr(pdf_processor, '_plan_target_compression', recording_plan)
+    for target_mb in (0.01, 5):
+        data = pdf_processor.PDFProcessor(str(sample_pdf)).compress_images_bytes(
+            mode='raster', target_mb=target_mb)
+        assert _page_sizes(io.BytesIO(data)) == [(595, 842)] * 6
+
+    assert chosen_dpis == [72, 200]
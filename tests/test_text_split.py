@@ -0,0 +1,152 @@
+"""텍스트 추출의 페이지 오프셋 인덱스와 크기 기준 분할 계획"""
+
+import json
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (ArrayObject, DecodedStreamObject, DictionaryObject, NameObject,
+                            NumberObject)
+
+import pdf_common
+from conftest import make_pdf
+
+
+def _page_blocks(text: bytes, index: dict) -> list:
+    ends = index['offsets'][1:] + [index['total_bytes']]
+    return [text[start:end] for start, end in zip(index['offsets'], ends)]
+
+
+def test_text_index_offsets_point_at_page_blocks(sample_pdf, pdf_processor):
+    processor = pdf_processor.PDFProcessor(str(sample_pdf))
+    text, index = processor.extract_text_bytes()
+
+    assert index['total_pages'] == 6
+    assert index['total_bytes'] == len(text)
+    for page_num, block in enumerate(_page_blocks(text, index), 1):
+        assert block.startswith(f"=== 페이지 {page_num} ===".encode('utf-8'))
+        assert f"page {page_num} line 0".encode('utf-8') in block
+
+
+def test_incremental_text_matches_full_extraction(tmp_path, auto_pdf, capsys):
+    source = make_pdf(tmp_path / 'doc.pdf', pages=5, image_every=0)
+    output_dir = tmp_path / 'out'
+    auto_pdf.AutoPDFProcessor(str(source), str(output_dir), incremental=True).process('extract_text')
+
+    make_pdf(source, pages=5, edited_page=1, image_every=0)
+    capsys.readouterr()
+    [output] = auto_pdf.AutoPDFProcessor(str(source), str(output_dir),
+                                         incremental=True).process('extract_text')
+    assert '바뀌지 않은 4페이지는 이전 텍스트를 재사용합니다' in capsys.readouterr().out
+
+    [expected] = auto_pdf.AutoPDFProcessor(str(source), str(tmp_path / 'fresh')).process('extract_text')
+    assert output.read_bytes() == expected.read_bytes()
+
+    text = output.read_bytes()
+    index = json.loads((output_dir / 'doc_text.idx.json').read_text(encoding='utf-8'))
+    blocks = _page_blocks(text, index)
+    assert b'page 2 line 0 edited' in blocks[1]
+    assert all(b'original' in block for page_num, block in enumerate(blocks) if page_num != 1)
+
+
+def test_plan_size_split_counts_shared_objects_once_per_part():
+    shared = {(10, 0): 4000}
+    cost_index = [(1000, dict(shared)), (1000, dict(shared)), (1000, dict(shared)), (1000, {})]
+    base = pdf_common._PART_BASE_BYTES
+
+    plan = pdf_common._plan_size_split(cost_index, base + 4000 + 2000)
+
+    assert [(start, end) for start, end, _ in plan] == [(0, 2), (2, 4)]
+    assert plan[0][2] == base + 4000 + 2000
+    assert plan[1][2] == base + 4000 + 2000
+
+
+def test_plan_size_split_keeps_oversized_page_alone():
+    cost_index = [(100, {}), (10000, {}), (100, {})]
+
+    plan = pdf_common._plan_size_split(cost_index, 5000)
+
+    assert [(start, end) for start, end, _ in plan] == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_split_by_size_covers_every_page_in_order(sample_pdf, pdf_processor, tmp_path):
+    processor = pdf_processor.PDFProcessor(str(sample_pdf))
+    max_mb = 0.05
+    parts = processor.split_by_size(max_mb, output_dir=str(tmp_path / 'parts'))
+
+    assert len(parts) > 1
+    texts = []
+    for part in parts:
+        reader = PdfReader(str(part))
+        if len(reader.pages) > 1:
+            assert part.stat().st_size <= max_mb * 1024 * 1024
+        texts += [page.extract_text() for page in reader.pages]
+    assert [f"page {page_num} line 0" in text for page_num, text in enumerate(texts, 1)] == [True] * 6
+
+
+def test_process_unmaps_large_input(sample_pdf, auto_pdf, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_common, 'LAZY_INPUT_MIN_MB', 0)
+    processor = auto_pdf.AutoPDFProcessor(str(sample_pdf), str(tmp_path / 'out'))
+    stream = processor.session.reader.stream
+
+    processor.process('extract_text')
+
+    assert stream.closed
+    assert processor.session._reader is None
+    assert processor.session.total_pages == 6
+
+
+def test_worker_document_closes_replaced_input(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_common, 'LAZY_INPUT_MIN_MB', 0)
+    backend = pdf_common.BACKENDS['pypdf2']
+    first = pdf_common._worker_document(backend, str(make_pdf(tmp_path / 'a.pdf', pages=1)))
+
+    pdf_common._worker_document(backend, str(make_pdf(tmp_path / 'b.pdf', pages=1)))
+
+    assert first.stream.closed
+    pdf_common._close_worker_document(backend.name)
+
+
+def test_analyze_only_leaves_output_dir_alone(sample_pdf, auto_pdf, tmp_path):
+    processor = auto_pdf.AutoPDFProcessor(str(sample_pdf), str(tmp_path / 'out'))
+    processor.prescan()
+
+    assert not (tmp_path / 'out').exists()
+
+
+def test_inline_images_count_as_images():
+    pixels = bytes(range(256)) * 200
+    stream = DecodedStreamObject()
+    stream.set_data(b'q 100 0 0 100 0 0 cm\nBI /W 160 /H 320 /CS /G /BPC 8 ID ' + pixels
+                    + b' EI\nQ\n')
+    page = DictionaryObject({NameObject('/Contents'): stream})
+
+    info = pdf_common._page_structure(page)
+
+    assert info['image_count'] == 1
+    assert info['image_bytes'] == len(pixels)
+    assert info['content_bytes'] < 100
+    assert pdf_common._classify_page(info) == 'image'
+
+
+def test_page_cost_index_stops_at_links_to_other_pages(sample_pdf, tmp_path):
+    writer = PdfWriter()
+    for page in PdfReader(str(sample_pdf)).pages:
+        writer.add_page(page)
+    target = writer.pages[5].indirect_reference
+    link = DictionaryObject({
+        NameObject('/Type'): NameObject('/Annot'), NameObject('/Subtype'): NameObject('/Link'),
+        NameObject('/Rect'): ArrayObject([NumberObject(0)] * 4),
+        NameObject('/Dest'): ArrayObject([target, NameObject('/Fit')]),
+    })
+    writer.pages[0][NameObject('/Annots')] = ArrayObject([writer._add_object(link)])
+    linked = tmp_path / 'linked.pdf'
+    with open(linked, 'wb') as f:
+        writer.write(f)
+
+    reader = PdfReader(str(linked))
+    cost_index = pdf_common._page_cost_index(reader)
+    page_keys = {(page.indirect_reference.idnum, page.indirect_reference.generation)
+                 for page in reader.pages}
+    target_contents = reader.pages[5].raw_get('/Contents')
+
+    assert not set(cost_index[0][1]) & page_keys
+    assert (target_contents.idnum, target_contents.generation) not in cost_index[0][1]